@@ -1,12 +1,27 @@
 import sys
+import time
+
+_T0 = time.perf_counter()
+
+from PySide6.QtCore import QTimer
 from PySide6.QtWidgets import QApplication
 from CalculadoraAlgebraQt import MainWindow
 
+def _report_startup(t_import, t_window):
+    total = time.perf_counter() - _T0
+    print(f"[inicio] Pantalla principal visible en {total * 1000:.0f} ms "
+          f"(importación {t_import * 1000:.0f} ms, ventana {t_window * 1000:.0f} ms)")
+
 def main():
+    t_import = time.perf_counter() - _T0
     app = QApplication(sys.argv)
+    t1 = time.perf_counter()
     window = MainWindow()
     window.show()
+    t_window = time.perf_counter() - t1
+    # se informa tras el primer ciclo de eventos, cuando la ventana ya se pintó
+    QTimer.singleShot(0, lambda: _report_startup(t_import, t_window))
     sys.exit(app.exec())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,17 +1,24 @@
 import sys
+import time
+import threading
 from PySide6 import QtGui
-from PySide6.QtWidgets import QApplication, QMainWindow, QWidget, QTabWidget, QLabel, QGridLayout, QVBoxLayout, QHBoxLayout, QPushButton, QComboBox, QSpinBox, QDoubleSpinBox, QLineEdit, QPlainTextEdit, QTableWidget, QTableWidgetItem, QFrame, QHeaderView, QAbstractScrollArea, QScrollArea, QSlider, QSizePolicy, QButtonGroup, QMessageBox, QAbstractSpinBox, QDialog, QDialogButtonBox, QMenu, QRadioButton
-from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QApplication, QMainWindow, QWidget, QTabWidget, QLabel, QGridLayout, QVBoxLayout, QHBoxLayout, QPushButton, QComboBox, QSpinBox, QDoubleSpinBox, QLineEdit, QPlainTextEdit, QTableWidget, QTableWidgetItem, QFrame, QHeaderView, QAbstractScrollArea, QScrollArea, QSlider, QSizePolicy, QButtonGroup, QMessageBox, QAbstractSpinBox, QDialog, QDialogButtonBox, QMenu, QRadioButton, QListView, QStyledItemDelegate, QTreeWidget, QTreeWidgetItem
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QSize, QTimer, QObject, Signal, QRunnable, QThreadPool
 from fractions import Fraction
 from decimal import Decimal
 import math
 import numpy as np
 import re
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg, NavigationToolbar2QT
-import sympy as sp
-from matrix_core import Matrix, fraction_to_str
-import operations_sum, operations_subtract, operations_multiply, operations_determinant, operations_cofactor, operations_gauss, root_bisection, root_falsepos, math_utils
+from matrix_core import Matrix, fraction_to_str, _determinant_bareiss
+from step_trace import StepTrace
+from log_sink import PlainTextSink
+import step_log
+import operations_sum, operations_subtract, operations_multiply, operations_determinant, operations_cofactor, operations_gauss, math_utils, matrix_expression, matrix_jobs, matrix_modular, matrix_multiply, plot_sampling, polynomial, root_bracketing, root_scan
+# sympy y matplotlib se importan en el primer uso (ver _to_sympy y RootFindingPage)
+
+# Dimensión máxima de las matrices editables; desde matrix_jobs.PARALLEL_MIN_SIZE
+# las operaciones largas se calculan en el pool de procesos.
+MAX_MATRIX_SIZE = 100
 
 DEFAULT_COLORS = {
     "accent": "#FF9500",
@@ -46,6 +53,258 @@ def parse_fraction(text: str) -> Fraction:
         except Exception:
             return Fraction.from_float(float(s))
 
+class MatrixJobRunner(QObject):
+    """Lanza un matrix_jobs.Job y reenvía su progreso y resultado como señales.
+
+    Las devoluciones del Job llegan en un hilo del ejecutor; al emitir desde
+    ahí, Qt entrega las señales en el hilo de la interfaz.
+    """
+
+    progress = Signal(int, int)
+    finished = Signal(object)
+    failed = Signal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._job = None
+        self._token = None
+
+    def start(self, submit, *args):
+        self.cancel()
+        token = self._token = object()
+        self._job = submit(*args,
+                           on_progress=lambda done, total: self._progress(token, done, total),
+                           on_done=lambda result, error: self._done(token, result, error))
+
+    def _progress(self, token, done, total):
+        if token is self._token:
+            self.progress.emit(done, total)
+
+    def _done(self, token, result, error):
+        if token is not self._token or isinstance(error, matrix_jobs.JobCancelled):
+            return
+        if error is not None:
+            self.failed.emit(str(error))
+        else:
+            self.finished.emit(result)
+
+    def is_running(self):
+        return self._job is not None and not self._job.done()
+
+    def cancel(self):
+        if self._job is not None:
+            self._token = None
+            self._job.cancel()
+            self._job = None
+
+
+class MatrixCache:
+    """Última Matrix construida a partir de unas filas: mientras las filas no
+    cambien se devuelve la misma, y con ella su factorización `lu()` ya hecha."""
+
+    def __init__(self):
+        self._rows = None
+        self._matrix = None
+
+    def get(self, rows):
+        rows = tuple(tuple(row) for row in rows)
+        if rows != self._rows:
+            self._rows = rows
+            self._matrix = Matrix([list(row) for row in rows])
+        return self._matrix
+
+    def clear(self):
+        self._rows = self._matrix = None
+
+
+class NumericItem(QTableWidgetItem):
+    """Celda que se ordena por el número guardado en UserRole, no por el texto."""
+
+    def __lt__(self, other):
+        mine, theirs = self.data(Qt.UserRole), other.data(Qt.UserRole)
+        if mine is None or theirs is None:
+            return super().__lt__(other)
+        return mine < theirs
+
+
+class SolveCancelled(Exception):
+    pass
+
+
+class RowStream(list):
+    """Filas de iteración de un método numérico que se reenvían por lotes
+    mientras se calculan; cada `append` atiende también la cancelación."""
+
+    BATCH_SECONDS = 0.05
+
+    def __init__(self, cancel_event, on_rows):
+        super().__init__()
+        self._cancel = cancel_event
+        self._on_rows = on_rows
+        self._pending = []
+        self._last = time.monotonic()
+
+    def append(self, row):
+        if self._cancel.is_set():
+            raise SolveCancelled()
+        super().append(row)
+        self._pending.append(row)
+        if time.monotonic() - self._last >= self.BATCH_SECONDS:
+            self.flush()
+
+    def flush(self):
+        if self._pending:
+            self._on_rows(self._pending)
+            self._pending = []
+        self._last = time.monotonic()
+
+
+class SolveSignals(QObject):
+    rows = Signal(list)
+    finished = Signal(object)
+    failed = Signal(str)
+
+
+class SolveWorker(QRunnable):
+    """Ejecuta `solve(filas, cancelado)` en el QThreadPool y avisa con señales."""
+
+    def __init__(self, solve):
+        super().__init__()
+        self.signals = SolveSignals()
+        self.cancel_event = threading.Event()
+        self._solve = solve
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        rows = RowStream(self.cancel_event, self.signals.rows.emit)
+        try:
+            result = self._solve(rows, self.cancel_event)
+            rows.flush()
+        except SolveCancelled:
+            return
+        except Exception as err:
+            if not self.cancel_event.is_set():
+                self.signals.failed.emit(str(err))
+            return
+        if not self.cancel_event.is_set():
+            self.signals.finished.emit(result)
+
+
+class StepListModel(QAbstractListModel):
+    """Modelo de solo lectura sobre un StepTrace; no guarda widgets ni copias."""
+
+    def __init__(self, trace: StepTrace, parent=None):
+        super().__init__(parent)
+        self.trace = trace
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.trace)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            return self.trace.title(index.row())
+        if role == Qt.ToolTipRole:
+            return self.trace.explanation(index.row())
+        return None
+
+    def refresh(self):
+        # los pasos se registran sin señales; la vista se actualiza una sola vez
+        self.beginResetModel()
+        self.endResetModel()
+
+
+class StepDelegate(QStyledItemDelegate):
+    """Dibuja título, explicación y la matriz de un paso solo cuando la fila es visible."""
+
+    CELL_W = 96
+    CELL_H = 30
+    PAD = 10
+
+    def __init__(self, colors, fmt, parent=None):
+        super().__init__(parent)
+        self.colors = colors
+        self.fmt = fmt
+
+    def _text_width(self, total_w):
+        return max(120, int((total_w - 3 * self.PAD) * 0.4))
+
+    def sizeHint(self, option, index):
+        trace = index.model().trace
+        row = index.row()
+        rows, cols = trace.shape(row)
+        view = self.parent()
+        total_w = view.viewport().width() if view is not None else option.rect.width()
+        title_fm = QtGui.QFontMetrics(self._title_font(option.font))
+        text = option.fontMetrics.boundingRect(QRect(0, 0, self._text_width(total_w), 100000), Qt.TextWordWrap, trace.explanation(row))
+        text_h = title_fm.height() + 6 + text.height()
+        grid_h = title_fm.height() + 6 + rows * self.CELL_H
+        return QSize(total_w, max(text_h, grid_h) + 2 * self.PAD + 8)
+
+    def _title_font(self, base):
+        font = QtGui.QFont(base)
+        font.setBold(True)
+        return font
+
+    def paint(self, painter, option, index):
+        trace = index.model().trace
+        row = index.row()
+        final = trace.is_final(row)
+        painter.save()
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        card = option.rect.adjusted(2, 4, -2, -4)
+        painter.setPen(QtGui.QPen(QtGui.QColor(255, 255, 255, 31 if final else 26), 1))
+        painter.setBrush(Qt.NoBrush)
+        painter.drawRoundedRect(card, 14 if final else 12, 14 if final else 12)
+
+        inner = card.adjusted(self.PAD, self.PAD, -self.PAD, -self.PAD)
+        title_font = self._title_font(option.font)
+        title_h = QtGui.QFontMetrics(title_font).height()
+        painter.setFont(title_font)
+        painter.setPen(QtGui.QColor(self.colors['accent']))
+        painter.drawText(QRect(inner.left(), inner.top(), inner.width(), title_h), Qt.AlignLeft | Qt.AlignVCenter, trace.title(row))
+
+        body_top = inner.top() + title_h + 6
+        grid_left = inner.left()
+        if not final:
+            text_w = self._text_width(option.rect.width())
+            painter.setFont(option.font)
+            painter.setPen(QtGui.QColor(self.colors['text']))
+            painter.drawText(QRect(inner.left(), body_top, text_w, inner.bottom() - body_top), Qt.TextWordWrap | Qt.AlignLeft | Qt.AlignTop, trace.explanation(row))
+            grid_left = inner.left() + text_w + self.PAD
+
+        # la instantánea se reconstruye aquí, solo para filas en pantalla
+        rows, cols = trace.shape(row)
+        cells = trace.cells(row)
+        changed = trace.changed_spans(row)
+        visible_cols = min(cols, max(0, (inner.right() - grid_left) // self.CELL_W + 1))
+        grid = QRect(grid_left, body_top, visible_cols * self.CELL_W, rows * self.CELL_H)
+        painter.fillRect(grid, QtGui.QColor(self.colors['matrix_bg']))
+        if changed is not None:
+            hl = QtGui.QColor(self.colors['accent']); hl.setAlpha(70)
+            for start, count in changed:
+                for pos in range(start, start + count):
+                    ci, cj = divmod(pos, cols)
+                    if cj < visible_cols:
+                        painter.fillRect(QRect(grid_left + cj * self.CELL_W, body_top + ci * self.CELL_H, self.CELL_W, self.CELL_H), hl)
+        painter.setPen(QtGui.QPen(QtGui.QColor(255, 255, 255, 31), 1))
+        for r in range(rows + 1):
+            y = body_top + r * self.CELL_H
+            painter.drawLine(grid.left(), y, grid.right(), y)
+        for c in range(visible_cols + 1):
+            x = grid_left + c * self.CELL_W
+            painter.drawLine(x, grid.top(), x, grid.bottom())
+        painter.setPen(QtGui.QColor(self.colors['text']))
+        for r in range(rows):
+            for c in range(visible_cols):
+                cell = QRect(grid_left + c * self.CELL_W + 4, body_top + r * self.CELL_H, self.CELL_W - 8, self.CELL_H)
+                painter.drawText(cell, Qt.AlignRight | Qt.AlignVCenter, self.fmt(cells[r * cols + c]))
+        painter.restore()
+
+
 class MatricesPage(QWidget):
     def __init__(self, colors, parent=None):
         super().__init__(parent)
@@ -140,10 +399,10 @@ class MatricesPage(QWidget):
                 padding: 4px 8
             }}
         """
-        self.spin_rows = QSpinBox(); self.spin_rows.setRange(1, 10); self.spin_rows.setValue(self.rows); self.spin_rows.setStyleSheet(spin_style); self.spin_rows.setButtonSymbols(QAbstractSpinBox.NoButtons)
-        self.spin_colsA = QSpinBox(); self.spin_colsA.setRange(1, 10); self.spin_colsA.setValue(self.colsA); self.spin_colsA.setStyleSheet(spin_style); self.spin_colsA.setButtonSymbols(QAbstractSpinBox.NoButtons)
-        self.spin_rowsB = QSpinBox(); self.spin_rowsB.setRange(1, 10); self.spin_rowsB.setValue(self.rowsB); self.spin_rowsB.setStyleSheet(spin_style); self.spin_rowsB.setButtonSymbols(QAbstractSpinBox.NoButtons)
-        self.spin_colsB = QSpinBox(); self.spin_colsB.setRange(1, 10); self.spin_colsB.setValue(self.colsB); self.spin_colsB.setStyleSheet(spin_style); self.spin_colsB.setButtonSymbols(QAbstractSpinBox.NoButtons)
+        self.spin_rows = QSpinBox(); self.spin_rows.setRange(1, MAX_MATRIX_SIZE); self.spin_rows.setValue(self.rows); self.spin_rows.setStyleSheet(spin_style); self.spin_rows.setButtonSymbols(QAbstractSpinBox.NoButtons)
+        self.spin_colsA = QSpinBox(); self.spin_colsA.setRange(1, MAX_MATRIX_SIZE); self.spin_colsA.setValue(self.colsA); self.spin_colsA.setStyleSheet(spin_style); self.spin_colsA.setButtonSymbols(QAbstractSpinBox.NoButtons)
+        self.spin_rowsB = QSpinBox(); self.spin_rowsB.setRange(1, MAX_MATRIX_SIZE); self.spin_rowsB.setValue(self.rowsB); self.spin_rowsB.setStyleSheet(spin_style); self.spin_rowsB.setButtonSymbols(QAbstractSpinBox.NoButtons)
+        self.spin_colsB = QSpinBox(); self.spin_colsB.setRange(1, MAX_MATRIX_SIZE); self.spin_colsB.setValue(self.colsB); self.spin_colsB.setStyleSheet(spin_style); self.spin_colsB.setButtonSymbols(QAbstractSpinBox.NoButtons)
         for spin in (self.spin_rows, self.spin_colsA, self.spin_rowsB, self.spin_colsB):
             spin.hide()
 
@@ -191,10 +450,12 @@ class MatricesPage(QWidget):
         self.btn_generate = QPushButton("Generar Tablas")
         self.btn_solve = QPushButton("Resolver")
         self.btn_clear = QPushButton("Limpiar")
-        for b in (self.btn_generate, self.btn_solve, self.btn_clear):
+        self.btn_cancel = QPushButton("Cancelar")
+        for b in (self.btn_generate, self.btn_solve, self.btn_clear, self.btn_cancel):
             b.setCursor(Qt.PointingHandCursor)
             b.setFixedSize(110, 36)
-        btns.addWidget(self.btn_generate); btns.addWidget(self.btn_solve); btns.addWidget(self.btn_clear)
+        self.btn_cancel.hide()
+        btns.addWidget(self.btn_generate); btns.addWidget(self.btn_solve); btns.addWidget(self.btn_cancel); btns.addWidget(self.btn_clear)
         layout.addLayout(btns)
         self.body = QVBoxLayout(); self.body.setSpacing(16); layout.addLayout(self.body)
         self.view_mode.currentTextChanged.connect(self._on_view_mode)
@@ -202,6 +463,14 @@ class MatricesPage(QWidget):
         self.btn_generate.clicked.connect(self.generate_tables)
         self.btn_clear.clicked.connect(self.clear_all)
         self.btn_solve.clicked.connect(self.solve_expression)
+        # operaciones grandes sin procedimiento: pool de procesos
+        # la misma matriz de la tabla no se vuelve a factorizar
+        self.factored = MatrixCache()
+        self.jobs = MatrixJobRunner(self)
+        self.jobs.progress.connect(lambda done, total: self.btn_cancel.setText(f"Cancelar {done}/{total}" if total > 1 else "Cancelar"))
+        self.jobs.finished.connect(self._on_job_finished)
+        self.jobs.failed.connect(self._on_job_failed)
+        self.btn_cancel.clicked.connect(self._cancel_job)
         self.adv_op.currentTextChanged.connect(lambda _: self._update_adv_target_enabled())
         self._update_adv_target_enabled()
         self.btn_ax.clicked.connect(self.open_ax_dialog)
@@ -351,12 +620,20 @@ class MatricesPage(QWidget):
 
         # Tab 2: Procedimiento
         self.tab_steps = QWidget(); steps_container_layout = QVBoxLayout(self.tab_steps); steps_container_layout.setContentsMargins(8,8,8,8); steps_container_layout.setAlignment(Qt.AlignTop)
-        self.scroll_area = QScrollArea(); self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        scroll_container = QWidget(); self.steps_layout = QVBoxLayout(scroll_container)
-        self.steps_layout.setContentsMargins(8, 8, 8, 8); self.steps_layout.setSpacing(10); self.steps_layout.setAlignment(Qt.AlignTop)
-        self.scroll_area.setWidget(scroll_container)
-        steps_container_layout.addWidget(self.scroll_area)
+        # vista virtualizada: solo se pintan (y reconstruyen) los pasos visibles
+        self.step_trace = StepTrace()
+        self.steps_model = StepListModel(self.step_trace, self)
+        self.steps_view = QListView()
+        self.steps_view.setModel(self.steps_model)
+        self.steps_view.setItemDelegate(StepDelegate(self.colors, self._fmt, self.steps_view))
+        self.steps_view.setSelectionMode(QListView.NoSelection)
+        self.steps_view.setVerticalScrollMode(QListView.ScrollPerPixel)
+        self.steps_view.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.steps_view.setResizeMode(QListView.Adjust)
+        self.steps_view.setLayoutMode(QListView.Batched); self.steps_view.setBatchSize(200)
+        self.steps_view.setSpacing(4)
+        self.steps_view.setStyleSheet("QListView { background: transparent; border: none; }")
+        steps_container_layout.addWidget(self.steps_view)
         self.inner_tabs.addTab(self.tab_steps, "Procedimiento")
 
         # Resultado Final se muestra dentro de Procedimiento; se elimina pestaña dedicada
@@ -373,7 +650,6 @@ class MatricesPage(QWidget):
         self._auto_resize_table(self.tableA)
         self._auto_resize_table(self.tableB)
 
-        self.steps_layout.addStretch(1)
         self.adv_op.currentTextChanged.connect(self._update_matrix_visibility)
         self._update_matrix_visibility()
 
@@ -405,10 +681,10 @@ class MatricesPage(QWidget):
         lay = QVBoxLayout(dlg)
         from PySide6.QtWidgets import QFormLayout
         form = QFormLayout()
-        s_rowsA = QSpinBox(); s_rowsA.setRange(1, 10); s_rowsA.setValue(self.spin_rows.value())
-        s_colsA = QSpinBox(); s_colsA.setRange(1, 10); s_colsA.setValue(self.spin_colsA.value())
-        s_rowsB = QSpinBox(); s_rowsB.setRange(1, 10); s_rowsB.setValue(self.spin_rowsB.value())
-        s_colsB = QSpinBox(); s_colsB.setRange(1, 10); s_colsB.setValue(self.spin_colsB.value())
+        s_rowsA = QSpinBox(); s_rowsA.setRange(1, MAX_MATRIX_SIZE); s_rowsA.setValue(self.spin_rows.value())
+        s_colsA = QSpinBox(); s_colsA.setRange(1, MAX_MATRIX_SIZE); s_colsA.setValue(self.spin_colsA.value())
+        s_rowsB = QSpinBox(); s_rowsB.setRange(1, MAX_MATRIX_SIZE); s_rowsB.setValue(self.spin_rowsB.value())
+        s_colsB = QSpinBox(); s_colsB.setRange(1, MAX_MATRIX_SIZE); s_colsB.setValue(self.spin_colsB.value())
         form.addRow("Filas A", s_rowsA); form.addRow("Columnas A", s_colsA)
         form.addRow("Filas B", s_rowsB); form.addRow("Columnas B", s_colsB)
         lay.addLayout(form)
@@ -494,7 +770,8 @@ class MatricesPage(QWidget):
         out = [[A[i, j] + B[i, j] for j in range(cols)] for i in range(rows)]
         return Matrix(out)
 
-    def _to_sympy(self, mat: Matrix) -> sp.Matrix:
+    def _to_sympy(self, mat: Matrix) -> "sp.Matrix":
+        import sympy as sp
         def to_rat(x):
             if isinstance(x, Fraction):
                 return sp.Rational(x.numerator, x.denominator)
@@ -516,40 +793,11 @@ class MatricesPage(QWidget):
         s = s.rstrip('0').rstrip('.')
         return s
 
-    def _matrix_widget(self, mat: Matrix, compact=True) -> QTableWidget:
-        tbl = QTableWidget(mat.rows, mat.cols)
-        tbl.setEditTriggers(QTableWidget.NoEditTriggers)
-        tbl.verticalHeader().setVisible(False)
-        tbl.horizontalHeader().setVisible(False)
-        tbl.horizontalHeader().setSectionResizeMode(QHeaderView.Fixed)
-        cell_w = 72 if compact else 96
-        cell_h = 24 if compact else 30
-        tbl.verticalHeader().setDefaultSectionSize(cell_h)
-        for c in range(mat.cols):
-            tbl.setColumnWidth(c, cell_w)
-        for r in range(mat.rows):
-            for c in range(mat.cols):
-                tbl.setItem(r, c, QTableWidgetItem(self._fmt(mat[r, c])))
-        tbl.setFixedHeight(cell_h * mat.rows + 8)
-        tbl.setFixedWidth(cell_w * mat.cols + 8)
-        tbl.setStyleSheet(f"QTableWidget {{ background-color: {self.colors['matrix_bg']}; color: {self.colors['text']}; gridline-color: rgba(255,255,255,0.12); }}")
-        return tbl
-
-    def _add_step_panel(self, title: str, explanation: str, mat: Matrix):
-        from PySide6.QtWidgets import QGroupBox
-        gb = QGroupBox(title)
-        gb.setStyleSheet(
-            f"""
-            QGroupBox {{ border: 1px solid rgba(255,255,255,0.10); border-radius: 12px; margin-top: 12px; color:{self.colors['accent']}; font-weight:700; }}
-            QGroupBox::title {{ subcontrol-origin: margin; subcontrol-position: top left; padding: 0 6px; }}
-            """
-        )
-        row = QHBoxLayout(gb); row.setContentsMargins(10,10,10,10); row.setSpacing(12)
-        expl = QLabel(explanation); expl.setWordWrap(True); expl.setStyleSheet(f"color:{self.colors['text']};")
-        row.addWidget(expl, 2)
-        tbl = self._matrix_widget(mat, compact=False)
-        row.addWidget(tbl, 3)
-        self.steps_layout.insertWidget(self.steps_layout.count()-1, gb)
+    def _add_step_panel(self, title: str, explanation: str, mat: Matrix, cell=None, row=None):
+        # solo se registra el paso; con `cell`/`row` se guarda lo que cambió, no la matriz
+        if step_log.get_verbosity() == step_log.RESULT:
+            return
+        self.step_trace.add(title, explanation, mat, cell, row)
 
     def _parse_expression(self, s: str):
         t = s.replace(" ", "")
@@ -571,19 +819,9 @@ class MatricesPage(QWidget):
         return terms
 
     def _mul(self, A: Matrix, B: Matrix) -> Matrix:
-        rowsA, colsA = A.shape; rowsB, colsB = B.shape
-        if colsA != rowsB:
+        if A.cols != B.rows:
             raise ValueError("Dimensiones no compatibles para multiplicación")
-        out = []
-        for i in range(rowsA):
-            row = []
-            for j in range(colsB):
-                s = Fraction(0)
-                for k in range(colsA):
-                    s += A[i, k] * B[k, j]
-                row.append(s)
-            out.append(row)
-        return Matrix(out)
+        return matrix_multiply.multiply(A, B)
 
     def _transpose(self, M: Matrix) -> Matrix:
         return Matrix([[M[j, i] for j in range(M.rows)] for i in range(M.cols)])
@@ -591,19 +829,10 @@ class MatricesPage(QWidget):
     def _inverse(self, M: Matrix) -> Matrix:
         if M.rows != M.cols:
             raise ValueError("La matriz debe ser cuadrada para inversa")
-        sm = self._to_sympy(M)
-        inv = sm.inv()
-        data = []
-        for i in range(inv.rows):
-            row = []
-            for j in range(inv.cols):
-                val = inv[i, j]
-                if val.is_Rational:
-                    row.append(Fraction(int(val.p), int(val.q)))
-                else:
-                    row.append(Fraction.from_float(float(val)))
-            data.append(row)
-        return Matrix(data)
+        lu = self.factored.get(M.iter_rows()).lu()
+        if not lu.is_invertible():
+            raise ValueError("La matriz no es invertible (determinante 0)")
+        return Matrix(lu.inverse())
 
         def _upper(self, M: Matrix) -> Matrix:
             return Matrix([[M[i, j] if i <= j else Fraction(0) for j in range(M.cols)] for i in range(M.rows)])
@@ -612,8 +841,11 @@ class MatricesPage(QWidget):
             return Matrix([[M[i, j] if i >= j else Fraction(0) for j in range(M.cols)] for i in range(M.rows)])
 
     def _linear_independence(self, M: Matrix) -> tuple:
-        sm = self._to_sympy(M)
-        rank = int(sm.rank())
+        if matrix_modular.prefer_modular(M):
+            rank = matrix_modular.rank_modular(M)
+        else:
+            sm = self._to_sympy(M)
+            rank = int(sm.rank())
         cols = M.cols
         indep = rank == cols
         return indep, rank, cols
@@ -639,19 +871,9 @@ class MatricesPage(QWidget):
         return rref, sol
 
     def _set_final(self, mat: Matrix):
-        from PySide6.QtWidgets import QGroupBox
-        gb = QGroupBox("Resultado Final")
-        gb.setStyleSheet(
-            f"""
-            QGroupBox {{ border: 1px solid rgba(255,255,255,0.12); border-radius: 14px; margin-top: 12px; color:{self.colors['accent']}; font-weight:800; }}
-            QGroupBox::title {{ subcontrol-origin: margin; subcontrol-position: top left; padding: 0 8px; }}
-            """
-        )
-        lay = QHBoxLayout(gb); lay.setContentsMargins(14,14,14,14)
-        tbl = self._matrix_widget(mat, compact=False)
-        lay.addWidget(tbl)
-        # insertar al final del scroll de Procedimiento, antes del stretch
-        self.steps_layout.insertWidget(self.steps_layout.count()-1, gb)
+        self.step_trace.add("Resultado Final", "", mat, final=True)
+        self.steps_model.refresh()
+        self.steps_view.scrollToTop()
 
     def _tokenize(self, s: str):
         t = s.replace(" ", "")
@@ -677,100 +899,81 @@ class MatricesPage(QWidget):
 
     def _eval_expression(self, tokens, A: Matrix, B: Matrix):
         self._clear_steps()
+        # nivel de detalle compartido: las explicaciones por celda solo se arman en FULL
+        level = step_log.get_verbosity()
+        full = level == step_log.FULL
+        summary = level == step_log.SUMMARY
+        # árbol con transpuestas en las hojas y productos en el orden más barato
+        tree = matrix_expression.optimize(matrix_expression.parse(tokens, parse_fraction),
+                                          {'A': A.shape, 'B': B.shape})
+        def add_step(explanation, mat, label=None, **changed):
+            title = f"Paso {self._next_step}" + (f" — {label}" if label else "")
+            self._add_step_panel(title, explanation, mat, **changed)
+            self._next_step += 1
         def clone_zero(rows, cols):
             return Matrix([[Fraction(0) for _ in range(cols)] for _ in range(rows)])
-        def apply_transpose(mat):
-            res = self._transpose(mat)
-            self._add_step_panel(f"Paso {self._next_step}", "Transponer", res); 
-            self._next_step += 1
-            return res
-        def read_factor(idx):
-            coef = Fraction(1)
-            var = None
-            if idx < len(tokens) and (tokens[idx] and tokens[idx][0].isdigit()):
-                coef = parse_fraction(tokens[idx]); idx += 1
-            if idx >= len(tokens):
-                raise ValueError("Expresión incompleta")
-            if tokens[idx] == '(':
-                idx += 1
-                mat, idx = read_sum(idx)
-                if idx >= len(tokens) or tokens[idx] != ')':
-                    raise ValueError("Paréntesis no balanceados")
-                idx += 1
-                # aplicar coeficiente si corresponde
-                if coef != 1:
-                    rows, cols = mat.shape
-                    partial = Matrix([[mat[i, j] for j in range(cols)] for i in range(rows)])
-                    for i in range(rows):
-                        for j in range(cols):
-                            old = partial[i, j]
-                            new = mat[i, j] * coef
-                            partial[i, j] = new
-                            self._add_step_panel(
-                                f"Paso {self._next_step}",
-                                f"c[{i+1},{j+1}] = ({self._fmt(mat[i,j])}) · {self._fmt(coef)} = {self._fmt(new)}",
-                                partial
-                            ); self._next_step += 1
-                    mat = partial
-                while idx < len(tokens) and tokens[idx] == '^T':
-                    mat = apply_transpose(mat); idx += 1
-                return mat, idx
-            if tokens[idx] not in ('A','B'):
-                raise ValueError("Se esperaba A, B o ( ... )")
-            var = tokens[idx]; idx += 1
+        def eval_leaf(node):
+            var = node.name
             base = A if var == 'A' else B
-            rows, cols = base.shape
-            partial = Matrix([[base[i, j] for j in range(cols)] for i in range(rows)])
+            coef = node.coef
+            # una hoja transpuesta se copia ya traspuesta: no hay paso "Transponer" aparte
+            if node.transposed:
+                partial = Matrix.from_rows(base.iter_cols(), base.rows)
+                var += "ᵀ"
+            else:
+                partial = base.copy()
+            rows, cols = partial.shape
             for i in range(rows):
                 for j in range(cols):
-                    old = partial[i, j]
-                    new = base[i, j] * coef
+                    new = partial[i, j] * coef
                     partial[i, j] = new
-                    self._add_step_panel(
-                        f"Paso {self._next_step}",
-                        f"c[{i+1},{j+1}] = ({var})[{i+1},{j+1}] · {self._fmt(coef)} = {self._fmt(new)}",
-                        partial
-                    ); self._next_step += 1
-            while idx < len(tokens) and tokens[idx] == '^T':
-                partial = apply_transpose(partial); idx += 1
-            return partial, idx
-        def read_term(idx):
-            mat, idx = read_factor(idx)
-            def starts_factor(tk):
-                return tk in ('A','B','(') or (tk and tk[0].isdigit())
-            while idx < len(tokens) and (tokens[idx] == '*' or starts_factor(tokens[idx])):
-                if tokens[idx] == '*':
-                    idx += 1
-                right, idx = read_factor(idx)
-                rowsA, colsA = mat.shape; rowsB, colsB = right.shape
-                if colsA != rowsB:
-                    raise ValueError("Dimensiones no compatibles para multiplicación")
-                res = clone_zero(rowsA, colsB)
-                for i in range(rowsA):
-                    for j in range(colsB):
-                        terms = []
-                        s = Fraction(0)
-                        for k in range(colsA):
-                            prod = mat[i, k] * right[k, j]
-                            s += prod
-                            terms.append(f"{self._fmt(mat[i,k])}×{self._fmt(right[k,j])}")
-                        res[i, j] = s
-                        self._add_step_panel(
-                            f"Paso {self._next_step}",
-                            f"c[{i+1},{j+1}] = " + " + ".join(terms) + f" = {self._fmt(s)}",
-                            res
-                        ); self._next_step += 1
-                mat = res
-            return mat, idx
-        def read_sum(idx):
+                    if full:
+                        add_step(f"c[{i+1},{j+1}] = ({var})[{i+1},{j+1}] · {self._fmt(coef)} = {self._fmt(new)}", partial, cell=(i, j))
+                if summary:
+                    add_step(f"fila {i+1} = {self._fmt(coef)} · ({var}) fila {i+1}", partial, row=i)
+            return partial
+        def eval_scale(node):
+            mat = evaluate(node.child)
+            coef = node.coef
+            rows, cols = mat.shape
+            partial = mat.copy()
+            for i in range(rows):
+                for j in range(cols):
+                    new = mat[i, j] * coef
+                    partial[i, j] = new
+                    if full:
+                        add_step(f"c[{i+1},{j+1}] = ({self._fmt(mat[i,j])}) · {self._fmt(coef)} = {self._fmt(new)}", partial, cell=(i, j))
+                if summary:
+                    add_step(f"fila {i+1} = {self._fmt(coef)} · fila {i+1} del paréntesis", partial, row=i)
+            return partial
+        def eval_product(node):
+            # productos binarios en el orden elegido; el título de cada paso lo indica
+            label = matrix_expression.describe(node, self._fmt)
+            mat = evaluate(node.factors[0])
+            right = evaluate(node.factors[1])
+            rowsA, colsA = mat.shape; rowsB, colsB = right.shape
+            if colsA != rowsB:
+                raise ValueError("Dimensiones no compatibles para multiplicación")
+            product = matrix_multiply.multiply(mat, right)
+            if not full:
+                if summary:
+                    for i in range(rowsA):
+                        add_step(f"fila {i+1} = fila {i+1} de la izquierda × matriz derecha", product, label, row=i)
+                return product
+            # paso a paso: las celdas se van copiando del producto ya calculado
+            res = clone_zero(rowsA, colsB)
+            cols_right = list(right.iter_cols())
+            for i, row_left in enumerate(mat.iter_rows()):
+                for j, col_right in enumerate(cols_right):
+                    s = product[i, j]
+                    res[i, j] = s
+                    terms = [f"{self._fmt(a)}×{self._fmt(b)}" for a, b in zip(row_left, col_right)]
+                    add_step(f"c[{i+1},{j+1}] = " + " + ".join(terms) + f" = {self._fmt(s)}", res, label, cell=(i, j))
+            return res
+        def eval_sum(node):
             result = None
-            sign = 1
-            while idx < len(tokens) and tokens[idx] != ')':
-                if tokens[idx] == '+':
-                    sign = 1; idx += 1; continue
-                if tokens[idx] == '-':
-                    sign = -1; idx += 1; continue
-                term, idx = read_term(idx)
+            for sign, term_node in node.terms:
+                term = evaluate(term_node)
                 if sign == -1:
                     rows, cols = term.shape
                     for r in range(rows):
@@ -778,11 +981,10 @@ class MatricesPage(QWidget):
                             old = term[r, c]
                             new = old * Fraction(-1)
                             term[r, c] = new
-                            self._add_step_panel(
-                                f"Paso {self._next_step}",
-                                f"c[{r+1},{c+1}] = (−1)×{self._fmt(old)} = {self._fmt(new)}",
-                                term
-                            ); self._next_step += 1
+                            if full:
+                                add_step(f"c[{r+1},{c+1}] = (−1)×{self._fmt(old)} = {self._fmt(new)}", term, cell=(r, c))
+                        if summary:
+                            add_step(f"fila {r+1} = (−1) × fila {r+1}", term, row=r)
                 prev = result
                 result = term if result is None else self._matrix_add(result, term)
                 if prev is not None:
@@ -793,18 +995,17 @@ class MatricesPage(QWidget):
                             add = term[r, c]
                             val = old + add
                             prev[r, c] = val
-                            self._add_step_panel(
-                                f"Paso {self._next_step}",
-                                f"acum[{r+1},{c+1}] = {self._fmt(old)} + {self._fmt(add)} = {self._fmt(val)}",
-                                prev
-                            ); self._next_step += 1
+                            if full:
+                                add_step(f"acum[{r+1},{c+1}] = {self._fmt(old)} + {self._fmt(add)} = {self._fmt(val)}", prev, cell=(r, c))
+                        if summary:
+                            add_step(f"acum fila {r+1} = acum fila {r+1} + término fila {r+1}", prev, row=r)
                     result = prev
-            return result, idx
-        # suma/resta con prioridad
-        res, pos = read_sum(0)
-        if pos != len(tokens):
-            raise ValueError("Expresión inválida")
-        return res
+            return result
+        evaluators = {matrix_expression.Leaf: eval_leaf, matrix_expression.Scale: eval_scale,
+                      matrix_expression.Product: eval_product, matrix_expression.Sum: eval_sum}
+        def evaluate(node):
+            return evaluators[type(node)](node)
+        return evaluate(tree)
 
     def solve_expression(self):
         try:
@@ -813,6 +1014,7 @@ class MatricesPage(QWidget):
             expr = self.expr_input.text().strip()
             self._clear_steps()
             self._next_step = 1
+            level = step_log.get_verbosity()
             # Si hay expresión, evaluarla con precedencia * antes que +/‑
             if expr:
                 tokens = self._tokenize(expr)
@@ -823,34 +1025,45 @@ class MatricesPage(QWidget):
             # Operaciones básicas sin expresión
             basic = self.basic_op.currentText()
             adv = self.adv_op.currentText()
+            if self._start_background_job(basic, adv, matA, matB):
+                return
             base = matA
             if expr:
                 # ya manejado arriba
                 pass
+            elif level == step_log.RESULT and basic in ("Suma", "Resta", "Multiplicación"):
+                # sin procedimiento: operar de una vez, sin registrar pasos
+                op = {"Suma": operations_sum.add_matrices, "Resta": operations_subtract.subtract_matrices,
+                      "Multiplicación": operations_multiply.multiply_matrices}[basic]
+                res, _ = op(matA, matB, log=False)
             elif basic == "Suma":
                 res = Matrix([[matA[i, j] for j in range(matA.cols)] for i in range(matA.rows)])
                 for i in range(matA.rows):
                     for j in range(matA.cols):
-                        old = res[i, j]
                         val = matA[i, j] + matB[i, j]
                         res[i, j] = val
-                        self._add_step_panel(
-                            f"Paso {self._next_step}",
-                            f"c[{i+1},{j+1}] = A[{i+1},{j+1}] + B[{i+1},{j+1}] = {self._fmt(val)}",
-                            res
-                        ); self._next_step += 1
+                        if level == step_log.FULL:
+                            self._add_step_panel(
+                                f"Paso {self._next_step}",
+                                f"c[{i+1},{j+1}] = A[{i+1},{j+1}] + B[{i+1},{j+1}] = {self._fmt(val)}",
+                                res, cell=(i, j)
+                            ); self._next_step += 1
+                    if level == step_log.SUMMARY:
+                        self._add_step_panel(f"Paso {self._next_step}", f"fila {i+1} = A fila {i+1} + B fila {i+1}", res, row=i); self._next_step += 1
             elif basic == "Resta":
                 res = Matrix([[matA[i, j] for j in range(matA.cols)] for i in range(matA.rows)])
                 for i in range(matA.rows):
                     for j in range(matA.cols):
-                        old = res[i, j]
                         val = matA[i, j] - matB[i, j]
                         res[i, j] = val
-                        self._add_step_panel(
-                            f"Paso {self._next_step}",
-                            f"c[{i+1},{j+1}] = A[{i+1},{j+1}] − B[{i+1},{j+1}] = {self._fmt(val)}",
-                            res
-                        ); self._next_step += 1
+                        if level == step_log.FULL:
+                            self._add_step_panel(
+                                f"Paso {self._next_step}",
+                                f"c[{i+1},{j+1}] = A[{i+1},{j+1}] − B[{i+1},{j+1}] = {self._fmt(val)}",
+                                res, cell=(i, j)
+                            ); self._next_step += 1
+                    if level == step_log.SUMMARY:
+                        self._add_step_panel(f"Paso {self._next_step}", f"fila {i+1} = A fila {i+1} − B fila {i+1}", res, row=i); self._next_step += 1
             elif basic == "Multiplicación":
                 res = Matrix([[Fraction(0) for _ in range(matB.cols)] for _ in range(matA.rows)])
                 for i in range(matA.rows):
@@ -860,26 +1073,32 @@ class MatricesPage(QWidget):
                         for k in range(matA.cols):
                             prod = matA[i, k] * matB[k, j]
                             s += prod
-                            terms.append(f"{self._fmt(matA[i,k])}×{self._fmt(matB[k,j])}")
+                            if level == step_log.FULL:
+                                terms.append(f"{self._fmt(matA[i,k])}×{self._fmt(matB[k,j])}")
                         res[i, j] = s
-                        self._add_step_panel(
-                            f"Paso {self._next_step}",
-                            f"c[{i+1},{j+1}] = " + " + ".join(terms) + f" = {self._fmt(s)}",
-                            res
-                        ); self._next_step += 1
+                        if level == step_log.FULL:
+                            self._add_step_panel(
+                                f"Paso {self._next_step}",
+                                f"c[{i+1},{j+1}] = " + " + ".join(terms) + f" = {self._fmt(s)}",
+                                res, cell=(i, j)
+                            ); self._next_step += 1
+                    if level == step_log.SUMMARY:
+                        self._add_step_panel(f"Paso {self._next_step}", f"fila {i+1} = A fila {i+1} × B", res, row=i); self._next_step += 1
             elif basic == "Escalar":
                 k = parse_fraction(self.scalar_input.text() or "1")
                 res = Matrix([[base[i, j] for j in range(base.cols)] for i in range(base.rows)])
                 for i in range(base.rows):
                     for j in range(base.cols):
-                        old = res[i, j]
                         val = base[i, j] * k
                         res[i, j] = val
-                        self._add_step_panel(
-                            f"Paso {self._next_step}",
-                            f"c[{i+1},{j+1}] = A[{i+1},{j+1}] · {self._fmt(k)} = {self._fmt(val)}",
-                            res
-                        ); self._next_step += 1
+                        if level == step_log.FULL:
+                            self._add_step_panel(
+                                f"Paso {self._next_step}",
+                                f"c[{i+1},{j+1}] = A[{i+1},{j+1}] · {self._fmt(k)} = {self._fmt(val)}",
+                                res, cell=(i, j)
+                            ); self._next_step += 1
+                    if level == step_log.SUMMARY:
+                        self._add_step_panel(f"Paso {self._next_step}", f"fila {i+1} = {self._fmt(k)} · A fila {i+1}", res, row=i); self._next_step += 1
             else:
                 res = base
             # Operaciones avanzadas
@@ -897,12 +1116,12 @@ class MatricesPage(QWidget):
                 res = self._lower(base2); self._add_step_panel(f"Paso {self._next_step}", f"Triangular inferior de {self.adv_target}", res); self._next_step += 1
             elif adv == "Determinante":
                 base2 = matA if self.adv_target == 'A' else matB if self.adv_target == 'B' else self._mul(matA, matB)
-                det, _logs = operations_determinant.determinant_with_log(base2.data)
+                det, _ = operations_determinant.determinant_with_log(base2.data, log=False)
                 res = Matrix([[det]])
                 self._add_step_panel(f"Paso {self._next_step}", f"Determinante de {self.adv_target}", res); self._next_step += 1
             elif adv == "Cofactor":
                 base2 = matA if self.adv_target == 'A' else matB if self.adv_target == 'B' else self._mul(matA, matB)
-                res, _logs = operations_cofactor.cofactor_matrix(base2)
+                res, _ = operations_cofactor.cofactor_matrix(base2, log=False)
                 self._add_step_panel(f"Paso {self._next_step}", f"Matriz de cofactores de {self.adv_target}", res); self._next_step += 1
             elif adv == "Ecuaciones matriciales":
                 rref, sol = self._system_solve(matA, matB)
@@ -913,9 +1132,46 @@ class MatricesPage(QWidget):
             self._set_final(res)
             self.inner_tabs.setCurrentIndex(1)
         except Exception as e:
+            # mostrar los pasos registrados hasta el error
+            self.steps_model.refresh()
             self._show_error_dialog(str(e))
 
+    def _start_background_job(self, basic, adv, matA, matB):
+        """Envía al pool de procesos los productos, inversas y determinantes
+        grandes (solo con el resultado, sin procedimiento paso a paso);
+        devuelve False si conviene calcular aquí mismo."""
+        big = matrix_jobs.PARALLEL_MIN_SIZE
+        target = matA if self.adv_target == 'A' else matB
+        if adv == "Ninguna" and basic == "Multiplicación" and max(matA.rows, matA.cols, matB.cols) >= big:
+            job = (matrix_jobs.submit_multiply, matA, matB)
+        elif adv in ("Inversa", "Determinante") and self.adv_target in ('A', 'B') and target.rows >= big:
+            job = (matrix_jobs.submit_inverse if adv == "Inversa" else matrix_jobs.submit_determinant, target)
+        else:
+            return False
+        self.jobs.start(*job)
+        self.btn_solve.setEnabled(False)
+        self.btn_cancel.setText("Cancelar"); self.btn_cancel.show()
+        return True
+
+    def _end_job(self):
+        self.btn_cancel.hide()
+        self.btn_solve.setEnabled(True)
+
+    def _on_job_finished(self, result):
+        self._end_job()
+        self._set_final(result if isinstance(result, Matrix) else Matrix([[result]]))
+        self.inner_tabs.setCurrentIndex(1)
+
+    def _on_job_failed(self, message):
+        self._end_job()
+        self._show_error_dialog(message)
+
+    def _cancel_job(self):
+        self.jobs.cancel()
+        self._end_job()
+
     def clear_all(self):
+        self.jobs.cancel(); self._end_job(); self.factored.clear()
         for tbl in (self.tableA, self.tableB):
             tbl.clear(); tbl.setRowCount(0); tbl.setColumnCount(0)
         # restaurar tamaño por defecto 3x3
@@ -958,12 +1214,9 @@ class MatricesPage(QWidget):
                     self._clear_layout(sub)
 
     def _clear_steps(self):
-        if hasattr(self, 'steps_layout') and self.steps_layout is not None:
-            while self.steps_layout.count() > 1:
-                item = self.steps_layout.takeAt(0)
-                w = item.widget()
-                if w:
-                    w.deleteLater()
+        if hasattr(self, 'step_trace'):
+            self.step_trace.clear()
+            self.steps_model.refresh()
 
     def _show_error_dialog(self, message: str):
         dlg = QMessageBox(self)
@@ -990,9 +1243,9 @@ class GaussJordanPage(QWidget):
         main.addWidget(title, alignment=Qt.AlignLeft)
 
         controls_top = QHBoxLayout();
-        self.spin_rows = QSpinBox(); self.spin_rows.setRange(1, 10); self.spin_rows.setValue(3)
-        self.spin_cols = QSpinBox(); self.spin_cols.setRange(1, 10); self.spin_cols.setValue(3)
-        self.spin_bcols = QSpinBox(); self.spin_bcols.setRange(1, 10); self.spin_bcols.setValue(1)
+        self.spin_rows = QSpinBox(); self.spin_rows.setRange(1, MAX_MATRIX_SIZE); self.spin_rows.setValue(3)
+        self.spin_cols = QSpinBox(); self.spin_cols.setRange(1, MAX_MATRIX_SIZE); self.spin_cols.setValue(3)
+        self.spin_bcols = QSpinBox(); self.spin_bcols.setRange(1, MAX_MATRIX_SIZE); self.spin_bcols.setValue(1)
         controls_top.addWidget(QLabel("Ecuaciones:")); controls_top.addWidget(self.spin_rows)
         controls_top.addWidget(QLabel("Variables:")); controls_top.addWidget(self.spin_cols)
         controls_top.addWidget(QLabel("Vectores:")); controls_top.addWidget(self.spin_bcols)
@@ -1007,8 +1260,18 @@ class GaussJordanPage(QWidget):
         self.btn_equations = QPushButton("Ingresar…")
         self.method_combo = QComboBox(); self.method_combo.addItems(["Gauss‑Jordan", "Gauss", "Cramer", "Sarrus", "Leontief"]); self.method_combo.setFixedWidth(200)
         self.btn_solve = QPushButton("Resolver"); self.btn_clear = QPushButton("Limpiar")
-        for w in (self.btn_generate, self.rb_equations, self.rb_vectors, self.btn_equations, self.method_combo, self.btn_solve, self.btn_clear):
+        self.btn_cancel = QPushButton("Cancelar"); self.btn_cancel.hide()
+        for w in (self.btn_generate, self.rb_equations, self.rb_vectors, self.btn_equations, self.method_combo, self.btn_solve, self.btn_cancel, self.btn_clear):
             actions.addWidget(w)
+        # sistemas grandes: se resuelven en el pool de procesos
+        # la misma matriz de la tabla no se vuelve a factorizar
+        self.factored = MatrixCache()
+        self.jobs = MatrixJobRunner(self)
+        self._job = None
+        self.jobs.progress.connect(lambda done, total: self.btn_cancel.setText(f"Cancelar {done}/{total}" if total > 1 else "Cancelar"))
+        self.jobs.finished.connect(self._on_solve_finished)
+        self.jobs.failed.connect(self._on_solve_failed)
+        self.btn_cancel.clicked.connect(self._cancel_job)
         main.addLayout(actions)
 
         layout_main = QHBoxLayout()
@@ -1029,9 +1292,24 @@ class GaussJordanPage(QWidget):
         left_col.addWidget(self.table_b)
 
         lbl_det = QLabel("Procedimiento detallado"); lbl_det.setStyleSheet(f"color:{self.colors['text']};")
-        self.log = QPlainTextEdit(); self.log.setReadOnly(True); self.log.setMinimumHeight(280); self.log.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.log = QPlainTextEdit(); self.log.setReadOnly(True); self.log.setMinimumHeight(160); self.log.setLineWrapMode(QPlainTextEdit.NoWrap)
+        # operaciones de fila: matriz inicial + filas cambiadas; la matriz de
+        # cada paso se reconstruye solo al expandirlo
+        self._trace = StepTrace()
+        self.lbl_trace = QLabel("Operaciones de fila (expande un paso para ver la matriz)"); self.lbl_trace.setStyleSheet(f"color:{self.colors['text']};")
+        self.trace_view = QTreeWidget(); self.trace_view.setHeaderHidden(True); self.trace_view.setMinimumHeight(200)
+        self.trace_view.itemExpanded.connect(self._expand_trace_item)
+        self.lbl_trace.hide(); self.trace_view.hide()
         left_col.addWidget(lbl_det)
+        left_col.addWidget(self.lbl_trace)
+        left_col.addWidget(self.trace_view)
         left_col.addWidget(self.log)
+        # el procedimiento se acumula y se vuelca en bloque; las trazas muy
+        # largas se muestran por páginas
+        self.btn_more = QPushButton(); self.btn_more.hide()
+        self.btn_more.clicked.connect(lambda: self.out.show_more())
+        self.out = PlainTextSink(self.log, lambda fn: QTimer.singleShot(0, fn), on_more=self._update_more_button)
+        left_col.addWidget(self.btn_more)
 
         self.result_card = QFrame(); self.result_card.setObjectName("resultCard")
         self.result_card.setStyleSheet(
@@ -1077,7 +1355,7 @@ class GaussJordanPage(QWidget):
         self.spin_rows.valueChanged.connect(lambda _: self.generate_matrix())
         self.spin_cols.valueChanged.connect(lambda _: self.generate_matrix())
         self.spin_bcols.valueChanged.connect(lambda _: self.generate_matrix())
-        self.setStyleSheet(f"QLabel {{ color:{self.colors['text']}; }} QTableWidget {{ background:{self.colors['matrix_bg']}; color:{self.colors['text']}; }} QPlainTextEdit {{ background:{self.colors['secondary_bg']}; color:{self.colors['text']}; }}")
+        self.setStyleSheet(f"QLabel {{ color:{self.colors['text']}; }} QTableWidget {{ background:{self.colors['matrix_bg']}; color:{self.colors['text']}; }} QPlainTextEdit {{ background:{self.colors['secondary_bg']}; color:{self.colors['text']}; }} QTreeWidget {{ background:{self.colors['secondary_bg']}; color:{self.colors['text']}; }}")
 
         self.generate_matrix()
         self.round2 = False
@@ -1095,11 +1373,12 @@ class GaussJordanPage(QWidget):
                         self.table.setItem(r, c, QTableWidgetItem("0"))
             self.lbl_b.hide(); self.table_b.hide()
         elif self.method_combo.currentText() == "Leontief":
-            self.table.setRowCount(rows); self.table.setColumnCount(cols + 1)
+            k = self.spin_bcols.value()
+            self.table.setRowCount(rows); self.table.setColumnCount(cols + k)
             for c in range(self.table.columnCount()):
                 self.table.setColumnWidth(c, 100)
             for r in range(rows):
-                for c in range(cols + 1):
+                for c in range(cols + k):
                     if not self.table.item(r, c):
                         self.table.setItem(r, c, QTableWidgetItem("0"))
             self.lbl_b.hide(); self.table_b.hide()
@@ -1119,14 +1398,12 @@ class GaussJordanPage(QWidget):
         rows = self.table.rowCount(); cols = self.table.columnCount(); data = []
         # construir matriz aumentada [A|b]
         if self.method_combo.currentText() == "Leontief":
+            # las últimas spin_bcols columnas son vectores de demanda D1..Dk
             for r in range(rows):
                 row = []
-                for c in range(cols - 1):
+                for c in range(cols):
                     item = self.table.item(r, c); text = item.text() if item else "0"
                     row.append(parse_fraction(text))
-                bitem = self.table.item(r, cols - 1)
-                btext = bitem.text() if bitem else "0"
-                row.append(parse_fraction(btext))
                 data.append(row)
         elif self.rb_vectors.isChecked():
             for r in range(rows):
@@ -1149,42 +1426,67 @@ class GaussJordanPage(QWidget):
                 btext = bitem.text() if bitem else "0"
                 row.append(parse_fraction(btext))
                 data.append(row)
-        self.log.clear()
+        self.out.clear()
         method = self.method_combo.currentText()
+        # nivel de detalle: sin traza, una matriz por pivote o una por operación de fila
+        level = step_log.get_verbosity()
+        trace = level != step_log.RESULT
+        full = level == step_log.FULL
+        self._trace.clear()
+        pending = []; touched = set()
+        def row_op(text, mat, *changed):
+            # FULL: un paso por operación; SUMMARY: se acumulan hasta cerrar el pivote
+            if full:
+                self._trace.add_rows(text, "", mat, changed)
+            elif trace:
+                pending.append(text); touched.update(changed)
+        def close_pivot(title, mat):
+            if trace and not full:
+                self._trace.add_rows(title, "\n".join(pending), mat, sorted(touched))
+            pending.clear(); touched.clear()
         try:
+            n_vars = len(data[0]) - 1 if data else 0
+            if max(len(data), n_vars) >= matrix_jobs.PARALLEL_MIN_SIZE and (
+                    method in ("Gauss‑Jordan", "Gauss") or (method == "Cramer" and n_vars == len(data))):
+                # sistema grande: LU / Gauss-Jordan en el pool de procesos, solo el resultado
+                self.out.line(f"Sistema de {len(data)}×{n_vars}: se resuelve en segundo plano, sin procedimiento paso a paso…")
+                self._job = (method, n_vars)
+                self.jobs.start(matrix_jobs.submit_solve, data)
+                self.btn_solve.setEnabled(False)
+                self.btn_cancel.setText("Cancelar"); self.btn_cancel.show()
+                return
             if method == "Gauss‑Jordan":
                 mat = [row[:] for row in data]
                 n = len(mat); m = len(mat[0]); n_vars = m - 1
                 pivot_cols = []
                 r = 0
-                self.log.appendPlainText("Inicio: matriz aumentada")
-                self.log.appendPlainText(self._format_matrix_lines(mat))
+                if trace:
+                    self._trace.add_rows("Inicio: matriz aumentada", "", mat)
                 for c in range(n_vars):
                     piv = None
                     for i in range(r, n):
                         if mat[i][c] != 0:
                             piv = i; break
                     if piv is None:
-                        self.log.appendPlainText(f"Columna {c+1} sin pivote. Variable libre x{c+1}")
+                        if trace:
+                            self._trace.add_rows(f"Columna {c+1} sin pivote. Variable libre x{c+1}", "", mat)
                         continue
-                    self.log.appendPlainText(f"Seleccionar pivote en columna {c+1}: fila {piv+1}")
+                    row_op(f"Seleccionar pivote en columna {c+1}: fila {piv+1}", mat)
                     if piv != r:
                         mat[r], mat[piv] = mat[piv], mat[r]
-                        self.log.appendPlainText(f"Intercambiar fila {r+1} con {piv+1}")
-                        self.log.appendPlainText(self._format_matrix_lines(mat))
+                        row_op(f"Intercambiar fila {r+1} con {piv+1}", mat, r, piv)
                     pivot = mat[r][c]
                     if pivot != 1:
                         for j in range(c, m):
                             mat[r][j] = mat[r][j] / pivot
-                        self.log.appendPlainText(f"Dividir fila {r+1} por {pivot}")
-                        self.log.appendPlainText(self._format_matrix_lines(mat))
+                        row_op(f"Dividir fila {r+1} por {pivot}", mat, r)
                     for i in range(n):
                         if i != r and mat[i][c] != 0:
                             factor = mat[i][c]
                             for j in range(c, m):
                                 mat[i][j] -= factor * mat[r][j]
-                            self.log.appendPlainText(f"R{i+1} = R{i+1} - {factor} * R{r+1}")
-                            self.log.appendPlainText(self._format_matrix_lines(mat))
+                            row_op(f"R{i+1} = R{i+1} - {factor} * R{r+1}", mat, i)
+                    close_pivot(f"Columna {c+1}: pivote en fila {r+1}", mat)
                     pivot_cols.append(c)
                     r += 1
                     if r == n:
@@ -1194,20 +1496,20 @@ class GaussJordanPage(QWidget):
                     if all(mat[i][j] == 0 for j in range(n_vars)) and mat[i][-1] != 0:
                         inconsistent = True
                         break
-                self.log.appendPlainText("")
-                self.log.appendPlainText("Análisis del sistema:")
-                self.log.appendPlainText(f"Columnas pivote: {[p+1 for p in pivot_cols]}")
+                self.out.line("")
+                self.out.line("Análisis del sistema:")
+                self.out.line(f"Columnas pivote: {[p+1 for p in pivot_cols]}")
                 free_vars = [i+1 for i in range(n_vars) if i not in pivot_cols]
                 if inconsistent:
-                    self.log.appendPlainText("El sistema es INCONSISTENTE (no tiene solución)")
+                    self.out.line("El sistema es INCONSISTENTE (no tiene solución)")
                 elif len(pivot_cols) < n_vars:
-                    self.log.appendPlainText("El sistema tiene INFINITAS SOLUCIONES (variables libres)")
-                    self.log.appendPlainText(f"Variables libres: x{', x'.join(map(str, free_vars))}" if free_vars else "")
+                    self.out.line("El sistema tiene INFINITAS SOLUCIONES (variables libres)")
+                    self.out.line(f"Variables libres: x{', x'.join(map(str, free_vars))}" if free_vars else "")
                 else:
-                    self.log.appendPlainText("El sistema tiene SOLUCIÓN ÚNICA")
+                    self.out.line("El sistema tiene SOLUCIÓN ÚNICA")
                 rankA = len(pivot_cols)
                 lin_indep = "INDEPENDIENTE" if rankA == n_vars else "DEPENDIENTE"
-                self.log.appendPlainText(f"Columnas de A: {lin_indep}")
+                self.out.line(f"Columnas de A: {lin_indep}")
                 sol = None
                 if not inconsistent and len(pivot_cols) == n_vars:
                     sol = [Fraction(0)] * n_vars
@@ -1218,18 +1520,18 @@ class GaussJordanPage(QWidget):
                                 row_idx = i; break
                         val = mat[row_idx][-1] if row_idx is not None else Fraction(0)
                         sol[c] = val
-                    self.log.appendPlainText("")
-                    self.log.appendPlainText("Valores de variables:")
+                    self.out.line("")
+                    self.out.line("Valores de variables:")
                     for i, val in enumerate(sol, start=1):
-                        self.log.appendPlainText(f"x{i} = {self._fmt_val(val)}")
+                        self.out.line(f"x{i} = {self._fmt_val(val)}")
                 status_txt = "INCONSISTENTE" if inconsistent else ("INFINITAS" if len(pivot_cols) < n_vars else "ÚNICA")
                 self._update_result_panel(status_txt, pivot_cols, free_vars, lin_indep, sol)
             elif method == "Gauss":
                 mat = [row[:] for row in data]
                 n = len(mat); m = len(mat[0])
                 n_vars = m - 1
-                self.log.appendPlainText("Inicio: matriz aumentada")
-                self.log.appendPlainText(self._format_matrix_lines(mat))
+                if trace:
+                    self._trace.add_rows("Inicio: matriz aumentada", "", mat)
                 pivot_cols = []
                 for i in range(n_vars):
                     piv = None
@@ -1237,27 +1539,27 @@ class GaussJordanPage(QWidget):
                         if mat[r][i] != 0:
                             piv = r; break
                     if piv is None:
-                        self.log.appendPlainText(f"Columna {i+1} sin pivote. Variable libre x{i+1}")
+                        if trace:
+                            self._trace.add_rows(f"Columna {i+1} sin pivote. Variable libre x{i+1}", "", mat)
                         continue
                     pivot_cols.append(i)
                     if piv != i:
                         mat[i], mat[piv] = mat[piv], mat[i]
-                        self.log.appendPlainText(f"Intercambiar fila {i+1} con {piv+1}")
-                        self.log.appendPlainText(self._format_matrix_lines(mat))
+                        row_op(f"Intercambiar fila {i+1} con {piv+1}", mat, i, piv)
                     pivot = mat[i][i]
                     for r in range(i+1, n):
                         if mat[r][i] != 0:
                             factor = mat[r][i] / pivot
                             for c in range(i, m):
                                 mat[r][c] -= factor * mat[i][c]
-                            self.log.appendPlainText(f"R{r+1} = R{r+1} - {factor} * R{i+1}")
-                            self.log.appendPlainText(self._format_matrix_lines(mat))
+                            row_op(f"R{r+1} = R{r+1} - {factor} * R{i+1}", mat, r)
+                    close_pivot(f"Columna {i+1}: eliminar debajo del pivote", mat)
                 inconsistent = False
                 for r in range(n):
                     if all(mat[r][c] == 0 for c in range(n_vars)) and mat[r][-1] != 0:
                         inconsistent = True; break
                 if inconsistent:
-                    self.log.appendPlainText("Sistema inconsistente")
+                    self.out.line("Sistema inconsistente")
                     self._update_result_panel("INCONSISTENTE", pivot_cols, [i+1 for i in range(n_vars) if i not in pivot_cols], "DEPENDIENTE" if len(pivot_cols) < n_vars else "INDEPENDIENTE", None)
                 else:
                     sol = [Fraction(0)] * n_vars
@@ -1266,78 +1568,82 @@ class GaussJordanPage(QWidget):
                         for j in range(i+1, n_vars):
                             s -= mat[i][j] * sol[j]
                         sol[i] = s / (mat[i][i] if mat[i][i] != 0 else Fraction(1))
-                    self.log.appendPlainText("Solución por Gauss:")
+                    self.out.line("Solución por Gauss:")
                     for i, val in enumerate(sol, start=1):
-                        self.log.appendPlainText(f"x{i} = {self._fmt_val(val)}")
+                        self.out.line(f"x{i} = {self._fmt_val(val)}")
                     self._update_result_panel("ÚNICA" if len(pivot_cols) == n_vars else "INFINITAS", pivot_cols, [i+1 for i in range(n_vars) if i not in pivot_cols], "INDEPENDIENTE" if len(pivot_cols) == n_vars else "DEPENDIENTE", sol)
             elif method == "Cramer":
                 A = [row[:-1] for row in data]; b = [row[-1] for row in data]
                 n = len(A)
                 if any(len(row) != n for row in A):
-                    self.log.appendPlainText("Cramer requiere matriz cuadrada")
+                    self.out.line("Cramer requiere matriz cuadrada")
                     self._update_result_panel("N/A", [], [], "DEPENDIENTE", None)
                     return
-                detA, logA = operations_determinant.determinant_with_log(A)
+                lu = self.factored.get(A).lu()
+                detA = lu.det()
                 if detA == 0:
-                    self.log.appendPlainText("Determinante de A es cero; Cramer no aplicable")
+                    self.out.line("Determinante de A es cero; Cramer no aplicable")
                     self._update_result_panel("INDETERMINADO", [], list(range(1, n+1)), "DEPENDIENTE", None)
                     return
-                sol = []
-                for i in range(n):
-                    Ai = [row[:] for row in A]
-                    for r in range(n):
-                        Ai[r][i] = b[r]
-                    detAi, _ = operations_determinant.determinant_with_log(Ai)
-                    sol.append(detAi / detA)
-                self.log.appendPlainText("Solución por Cramer:")
+                # x_i = det(A_i)/det(A) = (A⁻¹b)_i: una sola factorización da todos los cocientes
+                sol = lu.solve(b)
+                self.out.line("Solución por Cramer:")
                 for i, val in enumerate(sol, start=1):
-                    self.log.appendPlainText(f"x{i} = {self._fmt_val(val)}")
+                    self.out.line(f"x{i} = {self._fmt_val(val)}")
                 self._update_result_panel("ÚNICA", list(range(n)), [], "INDEPENDIENTE", sol)
             elif method == "Leontief":
-                A = [row[:-1] for row in data]; b = [row[-1] for row in data]
+                k = self.spin_bcols.value()
+                A = [row[:-k] for row in data]; D = [row[-k:] for row in data]
                 n = len(A)
                 if any(len(row) != n for row in A):
-                    self.log.appendPlainText("Leontief requiere A cuadrada y b compatible")
+                    self.out.line("Leontief requiere A cuadrada y b compatible")
                     self._update_result_panel("N/A", [], [], "DEPENDIENTE", None)
                     return
-                self.log.appendPlainText("Modelo de Leontief — Objetivo: calcular producción total X que satisface la demanda intermedia y final D")
-                self.log.appendPlainText("Relación: X = (I - A)^{-1} D")
-                self.log.appendPlainText("")
-                self.log.appendPlainText("Matriz de Coeficientes Técnicos A")
-                self.log.appendPlainText(self._format_matrix_plain(A))
+                self.out.line("Modelo de Leontief — Objetivo: calcular producción total X que satisface la demanda intermedia y final D")
+                self.out.line("Relación: X = (I - A)^{-1} D")
+                self.out.line("")
                 I_minus_A = [[Fraction(1 if i == j else 0) - A[i][j] for j in range(n)] for i in range(n)]
-                self.log.appendPlainText("Matriz de Leontief L = I - A")
-                self.log.appendPlainText(self._format_matrix_plain(I_minus_A))
-                try:
-                    inv_list = self._invert_with_pivot(I_minus_A)
-                except Exception:
-                    self.log.appendPlainText("(I - A) no es invertible")
+                if trace:
+                    self.out.line("Matriz de Coeficientes Técnicos A")
+                    self.out.line(self._format_matrix_plain(A))
+                    self.out.line("Matriz de Leontief L = I - A")
+                    self.out.line(self._format_matrix_plain(I_minus_A))
+                lu = self.factored.get(I_minus_A).lu()
+                if not lu.is_invertible():
+                    self.out.line("(I - A) no es invertible")
                     # Fallback: solución mínima‑norma con pseudoinversa (Moore‑Penrose)
                     try:
                         import numpy as _np
                         L_np = _np.array([[float(v) for v in row] for row in I_minus_A], dtype=float)
-                        b_np = _np.array([float(v) for v in b], dtype=float)
-                        x_np = _np.linalg.pinv(L_np).dot(b_np)
-                        self.log.appendPlainText("Se aplica pseudoinversa para solución aproximada X")
-                        self.log.appendPlainText(self._format_matrix_plain([[val] for val in x_np]))
+                        D_np = _np.array([[float(v) for v in row] for row in D], dtype=float)
+                        X_np = _np.linalg.pinv(L_np).dot(D_np)
+                        self.out.line("Se aplica pseudoinversa para solución aproximada X")
+                        self.out.line(self._format_matrix_plain(X_np.tolist()))
                         self.round2 = True
-                        self._update_result_panel("APROX.", list(range(n)), [], "DEPENDIENTE", list(x_np))
+                        self._update_result_panel("APROX.", list(range(n)), [], "DEPENDIENTE", list(X_np[:, 0]))
                         self.round2 = False
                         return
                     except Exception:
                         self._update_result_panel("INDETERMINADO", [], [], "DEPENDIENTE", None)
                         return
-                self.log.appendPlainText("Matriz Inversa de Leontief L^{-1} = (I - A)^{-1}")
-                self.log.appendPlainText(self._format_matrix_plain(inv_list))
-                self.log.appendPlainText("L^{-1} actúa como matriz de multiplicadores que relaciona directamente D con X")
-                self.log.appendPlainText("")
-                self.log.appendPlainText("Demanda final D")
-                self.log.appendPlainText(self._format_matrix_plain([[v] for v in b]))
-                x = self._mul_mat_vec(inv_list, b)
-                self.log.appendPlainText("Producción total X = L^{-1} D")
-                self.log.appendPlainText(self._format_matrix_plain([[v] for v in x]))
-                for i, val in enumerate(x, start=1):
-                    self.log.appendPlainText(f"x{i} = {float(val):.2f}")
+                if trace:
+                    inv_list = lu.inverse()
+                    self.out.line("Matriz Inversa de Leontief L^{-1} = (I - A)^{-1}")
+                    self.out.line(self._format_matrix_plain(inv_list))
+                    self.out.line("L^{-1} actúa como matriz de multiplicadores que relaciona directamente D con X")
+                    self.out.line("")
+                    self.out.line("Demanda final D")
+                    self.out.line(self._format_matrix_plain(D))
+                # una factorización de (I - A) y dos sustituciones triangulares por vector
+                X = lu.solve_many(D)
+                self.out.line("Producción total X = L^{-1} D")
+                self.out.line(self._format_matrix_plain(X))
+                for j in range(k):
+                    if k > 1:
+                        self.out.line(f"Demanda D{j+1}:")
+                    for i, row in enumerate(X, start=1):
+                        self.out.line(f"x{i} = {float(row[j]):.2f}")
+                x = [row[0] for row in X]
                 self.round2 = True
                 self._update_result_panel("ÚNICA", list(range(n)), [], "INDEPENDIENTE", x)
                 self.round2 = False
@@ -1345,12 +1651,12 @@ class GaussJordanPage(QWidget):
                 A = [row[:-1] for row in data]; b = [row[-1] for row in data]
                 n = len(A)
                 if n != 3 or any(len(row) != 3 for row in A):
-                    self.log.appendPlainText("Sarrus solo disponible para 3×3")
+                    self.out.line("Sarrus solo disponible para 3×3")
                     self._update_result_panel("N/A", [], [], "DEPENDIENTE", None)
                     return
-                detA, _ = operations_determinant.determinant_with_log(A)
+                detA, _ = operations_determinant.determinant_with_log(A, log=False)
                 if detA == 0:
-                    self.log.appendPlainText("Determinante de A es cero; Sarrus no aplicable")
+                    self.out.line("Determinante de A es cero; Sarrus no aplicable")
                     self._update_result_panel("INDETERMINADO", [], [1,2,3], "DEPENDIENTE", None)
                     return
                 sol = []
@@ -1358,20 +1664,100 @@ class GaussJordanPage(QWidget):
                     Ai = [row[:] for row in A]
                     for r in range(3):
                         Ai[r][i] = b[r]
-                    detAi, _ = operations_determinant.determinant_with_log(Ai)
+                    detAi = _determinant_bareiss(Ai)
                     sol.append(detAi / detA)
-                self.log.appendPlainText("Solución por Sarrus/Cramer 3×3:")
+                self.out.line("Solución por Sarrus/Cramer 3×3:")
                 for i, val in enumerate(sol, start=1):
-                    self.log.appendPlainText(f"x{i} = {self._fmt_val(val)}")
+                    self.out.line(f"x{i} = {self._fmt_val(val)}")
                 self._update_result_panel("ÚNICA", [0,1,2], [], "INDEPENDIENTE", sol)
         except Exception as e:
-            self.log.appendPlainText(f"Error: {e}")
+            self.out.line(f"Error: {e}")
+        finally:
+            self.out.flush()
+            self._show_trace()
+
+    def _end_job(self):
+        self.btn_cancel.hide()
+        self.btn_solve.setEnabled(True)
+
+    def _on_solve_finished(self, result):
+        self._end_job()
+        method, n_vars = self._job
+        status, pivot_cols, sol = result
+        if method == "Cramer":
+            if status != 'unique':
+                self.out.line("Determinante de A es cero; Cramer no aplicable")
+                self._update_result_panel("INDETERMINADO", [], list(range(1, n_vars+1)), "DEPENDIENTE", None)
+                return
+            self.out.line("Solución por Cramer:")
+            for i, val in enumerate(sol, start=1):
+                self.out.line(f"x{i} = {self._fmt_val(val)}")
+            self._update_result_panel("ÚNICA", pivot_cols, [], "INDEPENDIENTE", sol)
+            return
+        free_vars = [i+1 for i in range(n_vars) if i not in pivot_cols]
+        lin_indep = "INDEPENDIENTE" if len(pivot_cols) == n_vars else "DEPENDIENTE"
+        self.out.line("Análisis del sistema:")
+        self.out.line(f"Columnas pivote: {[p+1 for p in pivot_cols]}")
+        if status == 'inconsistent':
+            self.out.line("El sistema es INCONSISTENTE (no tiene solución)")
+        elif status == 'infinite':
+            self.out.line("El sistema tiene INFINITAS SOLUCIONES (variables libres)")
+            self.out.line(f"Variables libres: x{', x'.join(map(str, free_vars))}")
+        else:
+            self.out.line("El sistema tiene SOLUCIÓN ÚNICA")
+        self.out.line(f"Columnas de A: {lin_indep}")
+        if sol is not None:
+            self.out.line("")
+            self.out.line("Valores de variables:")
+            for i, val in enumerate(sol, start=1):
+                self.out.line(f"x{i} = {self._fmt_val(val)}")
+        status_txt = {'inconsistent': "INCONSISTENTE", 'infinite': "INFINITAS", 'unique': "ÚNICA"}[status]
+        self._update_result_panel(status_txt, pivot_cols, free_vars, lin_indep, sol)
+
+    def _on_solve_failed(self, message):
+        self._end_job()
+        self.out.line(f"Error: {message}")
+
+    def _cancel_job(self):
+        self.jobs.cancel()
+        self._end_job()
+        self.out.line("Operación cancelada")
+
+    def _update_more_button(self, held):
+        self.btn_more.setText(f"Mostrar más ({held} líneas restantes)")
+        self.btn_more.setVisible(held > 0)
+
+    def _show_trace(self):
+        # un elemento por paso, sin matriz; los hijos se crean al expandir
+        self.trace_view.clear()
+        items = []
+        for k in range(len(self._trace)):
+            item = QTreeWidgetItem([self._trace.title(k)])
+            item.setData(0, Qt.UserRole, k)
+            item.setChildIndicatorPolicy(QTreeWidgetItem.ShowIndicator)
+            items.append(item)
+        self.trace_view.addTopLevelItems(items)
+        self.lbl_trace.setVisible(bool(items)); self.trace_view.setVisible(bool(items))
+
+    def _expand_trace_item(self, item):
+        k = item.data(0, Qt.UserRole)
+        if k is None or item.childCount():
+            return
+        text = self._format_matrix_lines(self._trace.snapshot(k).data)
+        explanation = self._trace.explanation(k)
+        if explanation:
+            text = explanation + "\n" + text
+        child = QTreeWidgetItem([text])
+        child.setFont(0, QtGui.QFontDatabase.systemFont(QtGui.QFontDatabase.FixedFont))
+        item.addChild(child)
 
     def clear(self):
         self.table.clear(); self.table.setRowCount(0); self.table.setColumnCount(0)
         if hasattr(self, 'table_b'):
             self.table_b.clear(); self.table_b.setRowCount(0); self.table_b.setColumnCount(0)
-        self.log.clear()
+        self.jobs.cancel(); self._end_job(); self.factored.clear()
+        self.out.clear()
+        self._trace.clear(); self._show_trace()
         self._update_result_panel("", [], [], "", None)
         self.spin_rows.setValue(3); self.spin_cols.setValue(3)
         if hasattr(self, 'spin_bcols'):
@@ -1468,8 +1854,8 @@ class GaussJordanPage(QWidget):
         self.generate_matrix()
 
     def _on_method_changed(self, name: str):
-        self.spin_cols.setRange(1, 10)
-        self.spin_bcols.setRange(1, 10)
+        self.spin_cols.setRange(1, MAX_MATRIX_SIZE)
+        self.spin_bcols.setRange(1, MAX_MATRIX_SIZE)
         self.generate_matrix()
 
     def _parse_equations(self, text: str):
@@ -1554,7 +1940,9 @@ class GaussJordanPage(QWidget):
 
     def _set_headers(self, rows: int, cols: int):
         if self.method_combo.currentText() == "Leontief":
-            self.table.setHorizontalHeaderLabels([*(f"x{i+1}" for i in range(cols)), "b"])
+            k = self.spin_bcols.value()
+            demand = ["b"] if k == 1 else [f"D{i+1}" for i in range(k)]
+            self.table.setHorizontalHeaderLabels([*(f"x{i+1}" for i in range(cols)), *demand])
         elif self.rb_vectors.isChecked():
             self.table.setHorizontalHeaderLabels([*(f"x{i+1}" for i in range(cols))])
         else:
@@ -1586,40 +1974,10 @@ class GaussJordanPage(QWidget):
         return "\n".join(rows)
 
     def _invert_with_pivot(self, M):
-        n = len(M)
-        I = [[Fraction(1 if i == j else 0) for j in range(n)] for i in range(n)]
-        A = [row[:] for row in M]
-        B = [row[:] for row in I]
-        for k in range(n):
-            piv_row = max(range(k, n), key=lambda r: abs(A[r][k]))
-            if A[piv_row][k] == 0:
-                raise ValueError("Matriz singular")
-            if piv_row != k:
-                A[k], A[piv_row] = A[piv_row], A[k]
-                B[k], B[piv_row] = B[piv_row], B[k]
-            piv = A[k][k]
-            for j in range(n):
-                A[k][j] = A[k][j] / piv
-                B[k][j] = B[k][j] / piv
-            for i in range(n):
-                if i == k:
-                    continue
-                factor = A[i][k]
-                if factor != 0:
-                    for j in range(n):
-                        A[i][j] -= factor * A[k][j]
-                        B[i][j] -= factor * B[k][j]
-        return B
+        return self.factored.get(M).lu().inverse()
 
     def _mul_mat_vec(self, M, v):
-        n = len(M)
-        res = []
-        for i in range(n):
-            s = Fraction(0)
-            for j in range(n):
-                s += M[i][j] * v[j]
-            res.append(s)
-        return res
+        return matrix_multiply.multiply_vector(M, v)
 
     def _update_result_panel(self, status, pivot_cols, free_vars, indep, sol):
         self.res_status.setText(f"Estado: {status}" if status else "Estado: —")
@@ -1652,11 +2010,22 @@ class GaussJordanPage(QWidget):
             self.res_vars.setItem(i, 1, QTableWidgetItem(val_text))
 
 class RootFindingPage(QWidget):
+    # métodos que parten de un intervalo [a, b] con cambio de signo
+    ALL_ROOTS = "Todas las raíces"
+    INTERVAL_METHODS = ("Bisección", "Falsa Posición") + root_bracketing.METHODS + (ALL_ROOTS,)
+    # métodos con derivadas exactas (derivación automática); los dos primeros solo usan x₀
+    DERIVATIVE_METHODS = ("Newton-Raphson", "Halley", "Newton-Secante")
+    SINGLE_POINT_METHODS = ("Newton-Raphson", "Halley")
+
     def __init__(self, colors, parent=None):
+        # matplotlib y su backend Qt solo se cargan al construir esta página
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg, NavigationToolbar2QT
         super().__init__(parent)
         self.colors = colors
         self.current_method = "Bisección"
         self.last_root = None
+        self.last_roots = None
         self.last_func = ""
         self.last_params = {}
         main = QVBoxLayout(self); main.setContentsMargins(24, 24, 24, 24); main.setSpacing(16)
@@ -1695,22 +2064,31 @@ class RootFindingPage(QWidget):
         self.btn_bis = QPushButton("Bisección")
         self.btn_fp = QPushButton("Falsa Posición")
         self.btn_newton = QPushButton("Newton-Raphson")
+        self.btn_halley = QPushButton("Halley")
+        self.btn_newton_secant = QPushButton("Newton-Secante")
         self.btn_secant = QPushButton("Secante")
         self.method_buttons = {
             "Bisección": self.btn_bis,
             "Falsa Posición": self.btn_fp,
             "Newton-Raphson": self.btn_newton,
+            "Halley": self.btn_halley,
+            "Newton-Secante": self.btn_newton_secant,
             "Secante": self.btn_secant,
         }
-        for btn in self.method_buttons.values():
+        # familia de intervalo superlineal (root_bracketing), en una segunda fila
+        bracket_bar = QHBoxLayout()
+        for name in root_bracketing.METHODS + (self.ALL_ROOTS,):
+            self.method_buttons[name] = QPushButton(name)
+        for name, btn in self.method_buttons.items():
             btn.setCursor(Qt.PointingHandCursor)
             btn.setMinimumHeight(38)
             btn.setFont(QtGui.QFont("Segoe UI", 12))
             btn.setStyleSheet(
                 f"background: rgba(255,255,255,0.06); color:{self.colors['text']}; border-radius:10px; padding:10px 14px; border:1px solid rgba(255,255,255,0.10);"
             )
-            method_bar.addWidget(btn)
+            (bracket_bar if name in root_bracketing.METHODS + (self.ALL_ROOTS,) else method_bar).addWidget(btn)
         card.addLayout(method_bar)
+        card.addLayout(bracket_bar)
 
         grid = QGridLayout(); grid.setHorizontalSpacing(10); grid.setVerticalSpacing(6)
         for text in ("a / x₀:", "b / x₁:", "Tolerancia:", "Máx. iteraciones:"):
@@ -1793,6 +2171,15 @@ class RootFindingPage(QWidget):
         self.log.setFont(QtGui.QFont("Consolas", 10)); lay_res.addWidget(self.log)
         self.output_tabs.addTab(tab_results, "Resultados")
 
+        # modo "Todas las raíces": tabla ordenable por cualquier columna
+        self.roots_table = QTableWidget(0, 4)
+        self.roots_table.setHorizontalHeaderLabels(["x", "f(x)", "Tipo", "Iteraciones"])
+        self.roots_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.roots_table.verticalHeader().setVisible(False)
+        self.roots_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.roots_table.setSortingEnabled(True)
+        self.output_tabs.addTab(self.roots_table, "Raíces")
+
         right.addWidget(self.output_tabs)
 
         left_widget = QWidget(); left_widget.setLayout(left)
@@ -1810,15 +2197,29 @@ class RootFindingPage(QWidget):
         self.btn_bis.clicked.connect(lambda: self._set_method("Bisección"))
         self.btn_fp.clicked.connect(lambda: self._set_method("Falsa Posición"))
         self.btn_newton.clicked.connect(lambda: self._set_method("Newton-Raphson"))
+        self.btn_halley.clicked.connect(lambda: self._set_method("Halley"))
+        self.btn_newton_secant.clicked.connect(lambda: self._set_method("Newton-Secante"))
         self.btn_secant.clicked.connect(lambda: self._set_method("Secante"))
-        self.btn_calc.clicked.connect(self.compute)
+        for name in root_bracketing.METHODS + (self.ALL_ROOTS,):
+            self.method_buttons[name].clicked.connect(lambda _=False, name=name: self._set_method(name))
+        self.btn_calc.clicked.connect(self._on_calc_clicked)
         self.btn_plot.clicked.connect(lambda: self.plot_function(explicit=True))
         self.btn_suggest.clicked.connect(self.suggest_interval)
         self.btn_clear.clicked.connect(self._clear)
         self.func.textChanged.connect(self.update_preview)
         self.slider_font.valueChanged.connect(lambda v: self.log.setFont(QtGui.QFont("Consolas", v)))
+        # cálculo en segundo plano: las filas llegan por lotes y se vuelcan en bloque
+        self._worker = None
+        self.out = PlainTextSink(self.log, lambda fn: QTimer.singleShot(0, fn))
         self._set_method("Bisección"); self.update_preview()
 
+    def _on_calc_clicked(self):
+        if self._worker is not None:
+            self._cancel_compute()
+            self.out.line("Cálculo cancelado.")
+        else:
+            self.compute()
+
     def compute(self):
         method = self.current_method
         func = self.func.text().strip()
@@ -1826,29 +2227,96 @@ class RootFindingPage(QWidget):
             self.log.setPlainText("Ingresa una función para continuar.")
             return
         tol = self.tol.value(); max_it = self.max_iter.value(); a = self.a.value(); b = self.b.value()
-        try:
+        self._cancel_compute()
+
+        def solve(rows, cancelled):
+            # hilo del QThreadPool: método, y luego los datos de la gráfica
             if method == "Bisección":
-                data = self._bisection(func, a, b, tol, max_it); params = {"a": data["interval"][0], "b": data["interval"][1]}
+                data = self._bisection(func, a, b, tol, max_it, rows); params = {"a": data["interval"][0], "b": data["interval"][1]}
             elif method == "Falsa Posición":
-                data = self._false_position(func, a, b, tol, max_it); params = {"a": data["interval"][0], "b": data["interval"][1]}
+                data = self._false_position(func, a, b, tol, max_it, rows); params = {"a": data["interval"][0], "b": data["interval"][1]}
+            elif method in root_bracketing.METHODS:
+                data = self._bracketing(method, func, a, b, tol, max_it, rows); params = {"a": data["interval"][0], "b": data["interval"][1]}
+            elif method == self.ALL_ROOTS:
+                data = self._all_roots(func, a, b, tol, max_it, rows, cancelled); params = {"a": data["interval"][0], "b": data["interval"][1]}
             elif method == "Newton-Raphson":
-                data = self._newton(func, a, tol, max_it); params = {"x0": a}
+                data = self._newton(func, a, tol, max_it, rows); params = {"x0": a}
+            elif method == "Halley":
+                data = self._halley(func, a, tol, max_it, rows); params = {"x0": a}
+            elif method == "Newton-Secante":
+                data = self._newton_secant(func, a, b, tol, max_it, rows); params = {"x0": a, "x1": b}
             else:
-                data = self._secant(func, a, b, tol, max_it); params = {"x0": a, "x1": b}
-            report = self._build_result_text(method, func, tol, max_it, data, params)
-            self.log.setPlainText(report)
-            self.last_root = data["root"]; self.last_func = func; self.last_params = {"method": method, **params}
-            self._plot_function(method, func, params, data["root"])
-        except ValueError as err:
-            self.log.setPlainText(str(err))
-            self.plot_ax.clear(); self.plot_ax.text(0.5, 0.5, "Cálculo no disponible", ha="center", va="center", color="#FF453A")
-            self.plot_ax.set_axis_off(); self.canvas.draw_idle()
-
-    def _bisection(self, func, a, b, tol, max_it):
+                data = self._secant(func, a, b, tol, max_it, rows); params = {"x0": a, "x1": b}
+            rows.flush()
+            if cancelled.is_set():
+                raise SolveCancelled()
+            try:
+                samples = self._plot_samples(method, func, params)
+            except Exception:
+                samples = None  # el error se muestra al graficar en el hilo de la interfaz
+            return method, func, tol, max_it, data, params, samples
+
+        worker = SolveWorker(solve)
+        worker.signals.rows.connect(lambda rows: worker is self._worker and self._on_rows(rows))
+        worker.signals.finished.connect(lambda result: worker is self._worker and self._on_compute_finished(result))
+        worker.signals.failed.connect(lambda msg: worker is self._worker and self._on_compute_failed(msg))
+        self._worker = worker
+        self.out.clear()
+        self.out.line(f"MÉTODO DE {method.upper()}")
+        self.out.line("Calculando… (pulsa Cancelar para detener)")
+        self.btn_calc.setText("Cancelar")
+        QThreadPool.globalInstance().start(worker)
+
+    def _cancel_compute(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        self.btn_calc.setText("Calcular")
+
+    def _on_rows(self, rows):
+        for row in rows:
+            self.out.line("   ".join(str(v) if isinstance(v, (int, str)) else self._format_number(v) for v in row))
+
+    def _on_compute_finished(self, result):
+        self._worker = None
+        self.btn_calc.setText("Calcular")
+        method, func, tol, max_it, data, params, samples = result
+        report = self._build_result_text(method, func, tol, max_it, data, params)
+        self.out.clear()
+        self.log.setPlainText(report)
+        self.last_root = data["root"]; self.last_func = func; self.last_params = {"method": method, **params}
+        self.last_roots = data.get("roots")
+        self._fill_roots_table(self.last_roots or [])
+        self._plot_function(method, func, params, data["root"], samples, self.last_roots)
+
+    def _fill_roots_table(self, roots):
+        table = self.roots_table
+        table.setSortingEnabled(False)
+        table.setRowCount(len(roots))
+        for r, (x, fx, kind, iterations) in enumerate(roots):
+            for c, value in enumerate((x, fx, kind, iterations)):
+                if isinstance(value, str):
+                    item = QTableWidgetItem(value)
+                else:
+                    item = NumericItem(self._format_number(value) if isinstance(value, float) else str(value))
+                    item.setData(Qt.UserRole, value)
+                table.setItem(r, c, item)
+        table.setSortingEnabled(True)
+
+    def _on_compute_failed(self, message):
+        self._worker = None
+        self.btn_calc.setText("Calcular")
+        self.out.clear()
+        self.log.setPlainText(message)
+        self.plot_ax.clear(); self.plot_ax.text(0.5, 0.5, "Cálculo no disponible", ha="center", va="center", color="#FF453A")
+        self.plot_ax.set_axis_off(); self.canvas.draw_idle()
+
+    def _bisection(self, func, a, b, tol, max_it, rows=None):
         original = (a, b)
-        rows = []
-        fa = self._eval(a, func)
-        fb = self._eval(b, func)
+        rows = [] if rows is None else rows
+        f = math_utils.EvalMemo(lambda t: self._eval(t, func))
+        fa = f(a)
+        fb = f(b)
         if fa == 0.0:
             rows.append((1, a, b, a, fa, fb, fa, 0.0))
             return {
@@ -1858,6 +2326,7 @@ class RootFindingPage(QWidget):
                 "formats": ["d"] + ["float"] * 7,
                 "interval": (a, b),
                 "original": original,
+                "evals": f.stats(),
             }
         if fb == 0.0:
             rows.append((1, a, b, b, fa, fb, fb, 0.0))
@@ -1868,18 +2337,19 @@ class RootFindingPage(QWidget):
                 "formats": ["d"] + ["float"] * 7,
                 "interval": (a, b),
                 "original": original,
+                "evals": f.stats(),
             }
         if fa * fb > 0:
             interval = self._auto_interval(func, a, b)
             if interval is None:
                 raise ValueError("La función no cambia de signo en el intervalo dado ni en los rangos sugeridos.")
             a, b = interval
-            fa = self._eval(a, func)
-            fb = self._eval(b, func)
+            fa = f(a)
+            fb = f(b)
         root = None
         for it in range(1, max_it + 1):
             c = (a + b) / 2.0
-            fc = self._eval(c, func)
+            fc = f(c)
             error = abs(b - a) / 2.0
             rows.append((it, a, b, c, fa, fb, fc, error))
             if abs(fc) <= tol or error <= tol:
@@ -1893,18 +2363,20 @@ class RootFindingPage(QWidget):
             root = (a + b) / 2.0
         return {
             "root": root,
-            "f_root": self._eval(root, func),
+            "f_root": f(root),
             "rows": rows,
             "formats": ["d"] + ["float"] * 7,
             "interval": (a, b),
             "original": original,
+            "evals": f.stats(),
         }
 
-    def _false_position(self, func, a, b, tol, max_it):
+    def _false_position(self, func, a, b, tol, max_it, rows=None):
         original = (a, b)
-        rows = []
-        fa = self._eval(a, func)
-        fb = self._eval(b, func)
+        rows = [] if rows is None else rows
+        f = math_utils.EvalMemo(lambda t: self._eval(t, func))
+        fa = f(a)
+        fb = f(b)
         if fa == 0.0:
             rows.append((1, a, b, a, fa, fb, fa, 0.0))
             return {
@@ -1914,6 +2386,7 @@ class RootFindingPage(QWidget):
                 "formats": ["d"] + ["float"] * 7,
                 "interval": (a, b),
                 "original": original,
+                "evals": f.stats(),
             }
         if fb == 0.0:
             rows.append((1, a, b, b, fa, fb, fb, 0.0))
@@ -1924,23 +2397,22 @@ class RootFindingPage(QWidget):
                 "formats": ["d"] + ["float"] * 7,
                 "interval": (a, b),
                 "original": original,
+                "evals": f.stats(),
             }
         if fa * fb > 0:
             interval = self._auto_interval(func, a, b)
             if interval is None:
                 raise ValueError("La función no cambia de signo en el intervalo dado ni en los rangos sugeridos.")
             a, b = interval
-            fa = self._eval(a, func)
-            fb = self._eval(b, func)
+            fa = f(a)
+            fb = f(b)
         prev_c = None
         root = None
         for it in range(1, max_it + 1):
-            fa = self._eval(a, func)
-            fb = self._eval(b, func)
             if abs(fb - fa) < 1e-14:
                 raise ValueError("f(a) y f(b) casi iguales; el método de falsa posición es inestable.")
             c = b - fb * (b - a) / (fb - fa)
-            fc = self._eval(c, func)
+            fc = f(c)
             ea = abs(fc)
             rows.append((it, a, b, c, fa, fb, fc, ea))
             if abs(fc) <= tol or (prev_c is not None and abs(c - prev_c) <= tol) or abs(b - a) <= tol:
@@ -1955,42 +2427,145 @@ class RootFindingPage(QWidget):
             root = prev_c if prev_c is not None else (a + b) / 2.0
         return {
             "root": root,
-            "f_root": self._eval(root, func),
+            "f_root": f(root),
             "rows": rows,
             "formats": ["d"] + ["float"] * 7,
             "interval": (a, b),
             "original": original,
+            "evals": f.stats(),
         }
 
-    def _newton(self, func, x0, tol, max_it):
-        rows = []
+    def _bracketing(self, method, func, a, b, tol, max_it, rows=None):
+        original = (a, b)
+        rows = [] if rows is None else rows
+        f = math_utils.EvalMemo(lambda t: self._eval(t, func))
+        if f(a) * f(b) > 0:
+            interval = self._auto_interval(func, a, b)
+            if interval is None:
+                raise ValueError("La función no cambia de signo en el intervalo dado ni en los rangos sugeridos.")
+            a, b = interval
+        root, a, b, _ = root_bracketing.solve(method, f, a, b, tol, max_it, rows)
+        return {
+            "root": root,
+            "f_root": f(root),
+            "rows": rows,
+            "formats": ["d"] + ["float"] * 7,
+            "interval": (a, b),
+            "original": original,
+            "evals": f.stats(),
+        }
+
+    def _all_roots(self, func, a, b, tol, max_it, rows=None, cancelled=None):
+        rows = [] if rows is None else rows
+        t0 = time.perf_counter()
+        # las filas que llegan durante el cálculo siguen el orden de refinamiento
+        roots = root_scan.find_all_roots(func, a, b, tol, max_it, cancelled=cancelled,
+                                         on_root=lambda r: rows.append((len(rows) + 1,) + r))
+        return {
+            "root": None,
+            "roots": roots,
+            "polynomial": root_scan.polynomial_roots(func),
+            "rows": [(k,) + r for k, r in enumerate(roots, 1)],
+            "formats": ["d", "float", "float", "s", "d"],
+            "interval": (min(a, b), max(a, b)),
+            "original": (a, b),
+            "seconds": time.perf_counter() - t0,
+        }
+
+    def _newton(self, func, x0, tol, max_it, rows=None):
+        rows = [] if rows is None else rows
+        d = math_utils.EvalMemo(lambda t: self._derivatives(t, func))
         x = x0
         for it in range(1, max_it + 1):
-            fx = self._eval(x, func)
-            dfx = self._derivative(x, func)
+            fx, dfx, _ = d(x)
             if abs(dfx) < 1e-14:
                 raise ValueError("Derivada cercana a cero; intenta con otro punto inicial.")
             x_next = x - fx / dfx
             ea = abs(x_next - x)
             rows.append((it, x, fx, dfx, ea))
             x = x_next
-            if ea <= tol or abs(self._eval(x, func)) <= tol:
+            if ea <= tol or abs(d(x)[0]) <= tol:
                 break
         return {
             "root": x,
-            "f_root": self._eval(x, func),
+            "f_root": d(x)[0],
             "rows": rows,
             "formats": ["d"] + ["float"] * 4,
             "interval": (x, x),
             "original": (x0, None),
+            "evals": d.stats(),
         }
 
-    def _secant(self, func, x0, x1, tol, max_it):
+    def _halley(self, func, x0, tol, max_it, rows=None):
+        rows = [] if rows is None else rows
+        d = math_utils.EvalMemo(lambda t: self._derivatives(t, func))
+        x = x0
+        for it in range(1, max_it + 1):
+            fx, d1, d2 = d(x)
+            den = 2.0 * d1 * d1 - fx * d2
+            if abs(den) < 1e-14:
+                raise ValueError("Denominador de Halley cercano a cero; intenta con otro punto inicial.")
+            x_next = x - 2.0 * fx * d1 / den
+            ea = abs(x_next - x)
+            rows.append((it, x, fx, d1, d2, ea))
+            x = x_next
+            if ea <= tol or abs(d(x)[0]) <= tol:
+                break
+        return {
+            "root": x,
+            "f_root": d(x)[0],
+            "rows": rows,
+            "formats": ["d"] + ["float"] * 5,
+            "interval": (x, x),
+            "original": (x0, None),
+            "evals": d.stats(),
+        }
+
+    def _newton_secant(self, func, x0, x1, tol, max_it, rows=None):
+        """Newton con derivada exacta; si f'(x) ≈ 0 o el paso de Newton no
+        reduce |f|, se toma el paso de la secante con el punto anterior
+        (x₁ al comenzar)."""
+        rows = [] if rows is None else rows
+        d = math_utils.EvalMemo(lambda t: self._derivatives(t, func))
+        prev, f_prev = x1, d(x1)[0]
+        x = x0
+        for it in range(1, max_it + 1):
+            fx, dfx, _ = d(x)
+            step = "S"
+            if abs(dfx) >= 1e-14:
+                x_next = x - fx / dfx
+                try:
+                    if abs(d(x_next)[0]) < abs(fx):
+                        step = "N"
+                except ValueError:
+                    pass
+            if step == "S":
+                if abs(fx - f_prev) < 1e-14:
+                    raise ValueError("Derivada y secante degeneradas; intenta con otros puntos iniciales.")
+                x_next = x - fx * (x - prev) / (fx - f_prev)
+            ea = abs(x_next - x)
+            rows.append((it, x, fx, dfx, step, ea))
+            prev, f_prev = x, fx
+            x = x_next
+            if ea <= tol or abs(d(x)[0]) <= tol:
+                break
+        return {
+            "root": x,
+            "f_root": d(x)[0],
+            "rows": rows,
+            "formats": ["d", "float", "float", "float", "s", "float"],
+            "interval": (x, x),
+            "original": (x0, x1),
+            "evals": d.stats(),
+        }
+
+    def _secant(self, func, x0, x1, tol, max_it, rows=None):
         original = (x0, x1)
-        rows = []
+        rows = [] if rows is None else rows
+        f = math_utils.EvalMemo(lambda t: self._eval(t, func))
         a, b = x0, x1
-        fa = self._eval(a, func)
-        fb = self._eval(b, func)
+        fa = f(a)
+        fb = f(b)
         if fa == 0.0:
             rows.append((1, a, b, a, fa, 0.0))
             return {
@@ -2000,6 +2575,7 @@ class RootFindingPage(QWidget):
                 "formats": ["d"] + ["float"] * 5,
                 "interval": (a, b),
                 "original": original,
+                "evals": f.stats(),
             }
         if fb == 0.0:
             rows.append((1, a, b, b, fb, 0.0))
@@ -2010,13 +2586,14 @@ class RootFindingPage(QWidget):
                 "formats": ["d"] + ["float"] * 5,
                 "interval": (a, b),
                 "original": original,
+                "evals": f.stats(),
             }
         root = None
         for it in range(1, max_it + 1):
             if abs(fb - fa) < 1e-14:
                 raise ValueError("f(x0) y f(x1) casi iguales; el método de la secante falla.")
             c = b - fb * (b - a) / (fb - fa)
-            fc = self._eval(c, func)
+            fc = f(c)
             ea = abs(c - b)
             rows.append((it, a, b, c, fc, ea))
             if ea <= tol or abs(fc) <= tol:
@@ -2029,11 +2606,12 @@ class RootFindingPage(QWidget):
             root = b
         return {
             "root": root,
-            "f_root": self._eval(root, func),
+            "f_root": f(root),
             "rows": rows,
             "formats": ["d"] + ["float"] * 5,
             "interval": (a, b),
             "original": original,
+            "evals": f.stats(),
         }
 
     def _build_result_text(self, method, func, tol, max_it, data, params):
@@ -2044,21 +2622,47 @@ class RootFindingPage(QWidget):
             f"Tolerancia: {tol:.4g}",
             f"Máx. iteraciones: {max_it}",
         ]
-        if method in ("Bisección", "Falsa Posición"):
+        coeffs = math_utils.polynomial_coefficients(func)
+        if coeffs is not None:
+            how = "se evalúa por Horner" if math_utils.horner_coefficients(func) is not None else "se evalúa en la forma escrita"
+            lines.append(f"Polinomio de grado {polynomial.degree(coeffs)}: {how}")
+        if method in self.INTERVAL_METHODS:
             lines.append(f"Intervalo inicial: [{params['a']:.6f}, {params['b']:.6f}]")
             if tuple(params.values()) != data["original"]:
                 oa, ob = data["original"]; lines.append(f"Intervalo ajustado automáticamente desde [{oa:.6f}, {ob:.6f}]")
-        elif method == "Newton-Raphson":
+        elif method in self.SINGLE_POINT_METHODS:
             lines.append(f"x₀: {params['x0']:.6f}")
         else:
             lines.append(f"x₀: {params['x0']:.6f}")
             lines.append(f"x₁: {params['x1']:.6f}")
+        if "roots" in data:
+            roots = data["roots"]
+            lines.append(""); lines.append(f"RAÍCES EN EL INTERVALO ({len(roots)}):")
+            lines.extend(self._format_table(method, data["rows"], data["formats"]))
+            poly = data.get("polynomial")
+            even = sum(1 for r in roots if r[2] == root_scan.EVEN)
+            if even and poly is None:
+                lines.append(f"{even} raíz(ces) sin cambio de signo (multiplicidad par), halladas en mínimos de |f|.")
+            if poly is not None:
+                lines.append(""); lines.append("TODAS LAS RAÍCES DEL POLINOMIO (autovalores de la matriz compañera, pulidos con Newton):")
+                for z, m, steps in poly[1]:
+                    lines.append(f"   x = {polynomial.format_root(z)}" + (f"   (multiplicidad {m})" if m > 1 else ""))
+                lines.append(f"Tiempo total: {data['seconds'] * 1e3:.1f} ms")
+            else:
+                lines.append(f"Muestras del barrido: {root_scan.SAMPLES}; tiempo total: {data['seconds'] * 1e3:.1f} ms")
+            return "\n".join(lines)
         lines.append(""); lines.append("TABLA DE ITERACIONES:")
         lines.extend(self._format_table(method, data["rows"], data["formats"]))
         root = data["root"]; lines.append(""); lines.append(f"RESULTADO FINAL ({method}):")
         lines.append(f"Raíz aproximada x = {root:.10f}")
         lines.append(f"f({root:.10f}) = {data['f_root']:.3e}")
         lines.append(f"Iteraciones ejecutadas: {len(data['rows'])}")
+        evals = data["evals"]
+        per_eval = evals["seconds"] / evals["evaluations"] * 1e6 if evals["evaluations"] else 0.0
+        lines.append(f"Evaluaciones de f: {evals['evaluations']} ({evals['calls']} llamadas, {evals['hits']} desde memoria)")
+        if method in self.DERIVATIVE_METHODS:
+            lines.append("Cada evaluación da f, f' y f'' exactas por derivación automática.")
+        lines.append(f"Tiempo en f: {evals['seconds'] * 1e3:.3f} ms ({per_eval:.1f} µs por evaluación)")
         return "\n".join(lines)
 
     def _format_table(self, method, rows, formats):
@@ -2066,14 +2670,17 @@ class RootFindingPage(QWidget):
             "Bisección": ["Iter", "a", "b", "c", "f(a)", "f(b)", "f(c)", "ea"],
             "Falsa Posición": ["Iter", "a", "b", "c", "f(a)", "f(b)", "f(c)", "ea"],
             "Newton-Raphson": ["Iter", "x", "f(x)", "f'(x)", "ea"],
+            "Halley": ["Iter", "x", "f(x)", "f'(x)", "f''(x)", "ea"],
+            "Newton-Secante": ["Iter", "x", "f(x)", "f'(x)", "paso", "ea"],
+            self.ALL_ROOTS: ["N°", "x", "f(x)", "tipo", "iter"],
             "Secante": ["Iter", "x₀", "x₁", "x₂", "f(x₂)", "ea"],
-        }[method]
+        }.get(method, ["Iter", "a", "b", "c", "f(a)", "f(b)", "f(c)", "ea"])
         format_rows = []
         for row in rows:
             formatted = []
             for idx, value in enumerate(row):
                 fmt = formats[idx] if idx < len(formats) else "float"
-                formatted.append(f"{int(value)}" if fmt == "d" else self._format_number(value))
+                formatted.append(f"{int(value)}" if fmt == "d" else value if fmt == "s" else self._format_number(value))
             format_rows.append(formatted)
         widths = [len(h) for h in headers]
         for row in format_rows:
@@ -2107,7 +2714,7 @@ class RootFindingPage(QWidget):
     def _plot_function(self, method, func, params, root):
         self.plot_ax.clear()
         try:
-            if method in ("Bisección", "Falsa Posición"):
+            if method in self.INTERVAL_METHODS:
                 base_min, base_max = params.get("a", -5.0), params.get("b", 5.0)
             elif method == "Secante":
                 base_min = min(params.get("x0", -5.0), params.get("x1", 5.0))
@@ -2126,7 +2733,7 @@ class RootFindingPage(QWidget):
             self.plot_ax.axhline(0, color="#666", linestyle="--", linewidth=1.2, alpha=0.7)
             self.plot_ax.axvline(0, color="#666", linestyle="--", linewidth=1.2, alpha=0.7)
 
-            if method in ("Bisección", "Falsa Posición"):
+            if method in self.INTERVAL_METHODS:
                 a_line, b_line = params.get("a"), params.get("b")
                 if a_line is not None:
                     self.plot_ax.axvline(a_line, color="#30D158", linestyle=":", linewidth=1.4, label=f"a = {a_line:.3f}")
@@ -2378,7 +2985,7 @@ class RootFindingPage(QWidget):
             return
         method = self.current_method
         if explicit or not self.last_params or self.last_func != func:
-            if method in ("Bisección", "Falsa Posición"):
+            if method in self.INTERVAL_METHODS:
                 params = {"a": self.a.value(), "b": self.b.value()}
             elif method == "Newton-Raphson":
                 params = {"x0": self.a.value()}
@@ -2437,7 +3044,7 @@ class RootFindingPage(QWidget):
     def _plot_function(self, method, func, params, root):
         self.plot_ax.clear()
         try:
-            if method in ("Bisección", "Falsa Posición"):
+            if method in self.INTERVAL_METHODS:
                 base_min, base_max = params.get("a", -5.0), params.get("b", 5.0)
             elif method == "Secante":
                 base_min = min(params.get("x0", -5.0), params.get("x1", 5.0))
@@ -2456,7 +3063,7 @@ class RootFindingPage(QWidget):
             self.plot_ax.axhline(0, color="#666", linestyle="--", linewidth=1.2, alpha=0.7)
             self.plot_ax.axvline(0, color="#666", linestyle="--", linewidth=1.2, alpha=0.7)
 
-            if method in ("Bisección", "Falsa Posición"):
+            if method in self.INTERVAL_METHODS:
                 a_line, b_line = params.get("a"), params.get("b")
                 if a_line is not None:
                     self.plot_ax.axvline(a_line, color="#30D158", linestyle=":", linewidth=1.4, label=f"a = {a_line:.3f}")
@@ -2709,7 +3316,7 @@ class RootFindingPage(QWidget):
             return
         method = self.current_method
         if explicit or not self.last_params or self.last_func != func:
-            if method in ("Bisección", "Falsa Posición"):
+            if method in self.INTERVAL_METHODS:
                 params = {"a": self.a.value(), "b": self.b.value()}
             elif method == "Newton-Raphson":
                 params = {"x0": self.a.value()}
@@ -2762,32 +3369,44 @@ class RootFindingPage(QWidget):
     def _evaluate_vector(self, xs, func):
         return math_utils.evaluate_function_vectorized(xs, func)
     
-    def _derivative(self, x, func, h=1e-6):
-        return (self._eval(x + h, func) - self._eval(x - h, func)) / (2.0 * h)
+    def _derivatives(self, x, func):
+        return math_utils.evaluate_derivatives(x, func)
+
+    def _derivative(self, x, func):
+        return self._derivatives(x, func)[1]
     
-    def _plot_function(self, method, func, params, root):
+    def _plot_samples(self, method, func, params):
+        """Rango, muestras, vértices e inflexiones; no toca matplotlib, así que
+        puede calcularse fuera del hilo de la interfaz."""
+        if method in self.INTERVAL_METHODS:
+            base_min, base_max = params.get("a", -5.0), params.get("b", 5.0)
+        elif method == "Secante":
+            base_min = min(params.get("x0", -5.0), params.get("x1", 5.0))
+            base_max = max(params.get("x0", -5.0), params.get("x1", 5.0))
+        else:
+            x0 = params.get("x0", 0.0)
+            base_min, base_max = x0 - 5.0, x0 + 5.0
+        if base_min == base_max:
+            base_min -= 5.0
+            base_max += 5.0
+        x_min, x_max = self._determine_plot_range(func, base_min, base_max)
+        xs, ys = plot_sampling.adaptive_sample(func, x_min, x_max, plot_sampling.DEFAULT_MAX_POINTS)
+        ys = np.where(np.isfinite(ys), ys, np.nan)
+        vertices = infl = None
+        if np.any(np.isfinite(ys)):
+            vertices = plot_sampling.find_extrema(xs, ys, func)[2:]
+            infl = plot_sampling.find_inflections(xs, ys, func)[2:]
+        return x_min, x_max, xs, ys, vertices, infl
+
+    def _plot_function(self, method, func, params, root, samples=None, roots=None):
         self.plot_ax.clear()
         try:
-            if method in ("Bisección", "Falsa Posición"):
-                base_min, base_max = params.get("a", -5.0), params.get("b", 5.0)
-            elif method == "Secante":
-                base_min = min(params.get("x0", -5.0), params.get("x1", 5.0))
-                base_max = max(params.get("x0", -5.0), params.get("x1", 5.0))
-            else:
-                x0 = params.get("x0", 0.0)
-                base_min, base_max = x0 - 5.0, x0 + 5.0
-            if base_min == base_max:
-                base_min -= 5.0
-                base_max += 5.0
-            x_min, x_max = self._determine_plot_range(func, base_min, base_max)
-            xs = np.linspace(x_min, x_max, 4000)
-            ys = self._evaluate_vector(xs, func)
-            ys = np.where(np.isfinite(ys), ys, np.nan)
+            x_min, x_max, xs, ys, vertices, infl = samples or self._plot_samples(method, func, params)
             self.plot_ax.plot(xs, ys, color="#2F80ED", linewidth=2.0, label=f"f(x) = {math_utils.format_function_display(func)}")
             self.plot_ax.axhline(0, color="#666", linestyle="--", linewidth=1.2, alpha=0.7)
             self.plot_ax.axvline(0, color="#666", linestyle="--", linewidth=1.2, alpha=0.7)
 
-            if method in ("Bisección", "Falsa Posición"):
+            if method in self.INTERVAL_METHODS:
                 a_line, b_line = params.get("a"), params.get("b")
                 if a_line is not None:
                     self.plot_ax.axvline(a_line, color="#30D158", linestyle=":", linewidth=1.4, label=f"a = {a_line:.3f}")
@@ -2804,7 +3423,7 @@ class RootFindingPage(QWidget):
                 x0, x1 = params.get("x0"), params.get("x1")
                 if x0 is not None and x1 is not None:
                     self.plot_ax.scatter([x0, x1], [self._eval(x0, func), self._eval(x1, func)], color="#30D158", marker="o", label="Puntos iniciales")
-            elif method == "Newton-Raphson":
+            elif method in self.DERIVATIVE_METHODS:
                 x0 = params.get("x0")
                 if x0 is not None:
                     self.plot_ax.plot(x0, self._eval(x0, func), "o", color="#FF9F0A", markersize=7, label=f"x₀ = {x0:.3f}")
@@ -2814,38 +3433,21 @@ class RootFindingPage(QWidget):
                 if math.isfinite(fr):
                     self.plot_ax.plot(root, fr, "o", color="#BB33FF", markersize=9, label=f"Raíz ≈ {root:.4f}")
                     self.plot_ax.axvline(root, color="#BB33FF", linestyle="--", linewidth=1.2, alpha=0.8)
-
-            finite_mask = np.isfinite(ys)
-            if np.any(finite_mask):
-                dy = np.gradient(np.nan_to_num(ys, nan=0.0), xs)
-                vertex_x, vertex_y = [], []
-                current = []
-                for idx in range(len(xs)):
-                    if finite_mask[idx]:
-                        current.append(idx)
-                    elif current:
-                        if len(current) > 1:
-                            segment = current
-                            deriv = dy[segment]
-                            for j in range(1, len(deriv)):
-                                if deriv[j - 1] == 0:
-                                    continue
-                                if deriv[j - 1] > 0 >= deriv[j] or deriv[j - 1] < 0 <= deriv[j]:
-                                    k = segment[j]
-                                    vertex_x.append(xs[k])
-                                    vertex_y.append(ys[k])
-                        current = []
-                if current and len(current) > 1:
-                    deriv = dy[current]
-                    for j in range(1, len(deriv)):
-                        if deriv[j - 1] == 0:
-                            continue
-                        if deriv[j - 1] > 0 >= deriv[j] or deriv[j - 1] < 0 <= deriv[j]:
-                            k = current[j]
-                            vertex_x.append(xs[k])
-                            vertex_y.append(ys[k])
-                if vertex_x:
+            if roots:
+                odd = [(x, fx) for x, fx, kind, _ in roots if kind != root_scan.EVEN]
+                even = [(x, fx) for x, fx, kind, _ in roots if kind == root_scan.EVEN]
+                if odd:
+                    self.plot_ax.plot(*zip(*odd), "o", color="#BB33FF", markersize=8, label=f"Raíces ({len(odd)})")
+                if even:
+                    self.plot_ax.plot(*zip(*even), "s", color="#FF375F", markersize=8, label=f"Multiplicidad par ({len(even)})")
+
+            if vertices is not None:
+                vertex_x, vertex_y = vertices
+                if vertex_x.size:
                     self.plot_ax.plot(vertex_x, vertex_y, "D", color="#FF9F0A", markersize=6, label="Vértices")
+                infl_x, infl_y = infl
+                if infl_x.size:
+                    self.plot_ax.plot(infl_x, infl_y, "s", color="#64D2FF", markersize=5, label="Inflexión")
 
                 try:
                     low, high = np.nanpercentile(ys, [1, 99])
@@ -2881,33 +3483,9 @@ class RootFindingPage(QWidget):
         return res[0], res[1]
 
     def _suggest_interval_core(self, func, prefer_zero=True):
-        search_specs = [(-10, 10, 0.1), (-50, 50, 0.2), (-100, 100, 0.5)]
-        intervals = []
-        zeros = []
-        for start, end, step in search_specs:
-            prev_x = prev_y = None
-            x = float(start)
-            while x <= end:
-                try:
-                    y = self._eval(x, func)
-                except Exception:
-                    prev_x = prev_y = None
-                    x = round(x + step, 10)
-                    continue
-                if not math.isfinite(y):
-                    prev_x = prev_y = None
-                    x = round(x + step, 10)
-                    continue
-                if abs(y) < 1e-12:
-                    zeros.append((x, step))
-                if prev_y is not None and math.isfinite(prev_y) and prev_y * y < 0:
-                    intervals.append((prev_x, x))
-                    if len(intervals) >= 32:
-                        break
-                prev_x, prev_y = x, y
-                x = round(x + step, 10)
-            if intervals or zeros:
-                break
+        # barrido vectorizado y cacheado por función (compartido con la gráfica)
+        intervals, zeros = math_utils.scan_sign_changes(func)
+        intervals, zeros = list(intervals), list(zeros)
         if not intervals and not zeros:
             return None
         if zeros and prefer_zero:
@@ -2942,7 +3520,7 @@ class RootFindingPage(QWidget):
                 btn.setStyleSheet(f"background:{self.colors['accent']}; color:black; border-radius:6px; padding:8px 12px; font-weight:bold;")
             else:
                 btn.setStyleSheet(f"background:{self.colors['secondary_bg']}; color:{self.colors['text']}; border-radius:6px; padding:8px 12px;")
-        self.b.setEnabled(name != "Newton-Raphson")
+        self.b.setEnabled(name not in self.SINGLE_POINT_METHODS)
 
     def insert_text(self, value):
         if value == "<DEL>":
@@ -3039,9 +3617,9 @@ class RootFindingPage(QWidget):
             return
         method = self.current_method
         if explicit or not self.last_params or self.last_func != func:
-            if method in ("Bisección", "Falsa Posición"):
+            if method in self.INTERVAL_METHODS:
                 params = {"a": self.a.value(), "b": self.b.value()}
-            elif method == "Newton-Raphson":
+            elif method in self.SINGLE_POINT_METHODS:
                 params = {"x0": self.a.value()}
             else:
                 params = {"x0": self.a.value(), "x1": self.b.value()}
@@ -3049,7 +3627,8 @@ class RootFindingPage(QWidget):
             params = {k: v for k, v in self.last_params.items() if k != "method"}
             method = self.last_params.get("method", method)
         root = self.last_root if self.last_func == func else None
-        self._plot_function(method, func, params, root)
+        roots = self.last_roots if self.last_func == func else None
+        self._plot_function(method, func, params, root, roots=roots)
 
     def suggest_interval(self):
         func = self.func.text().strip()
@@ -3076,16 +3655,40 @@ class RootFindingPage(QWidget):
             self.suggest_log.clear(); self.suggest_log.appendPlainText(text)
 
     def _clear(self):
+        self._cancel_compute()
         self.func.clear()
-        self.log.clear()
+        self.out.clear()
         self.plot_ax.clear()
         self.plot_ax.set_axis_off()
         self.canvas.draw_idle()
+        self.roots_table.setRowCount(0)
         self.last_root = None
+        self.last_roots = None
         self.last_func = ""
         self.last_params = {}
         self._set_method("Bisección")
 
+class LazyPage(QWidget):
+    """Marcador de pestaña que construye la página real la primera vez que se muestra."""
+
+    def __init__(self, factory, name, parent=None):
+        super().__init__(parent)
+        self._factory = factory
+        self.name = name
+        self.page = None
+        self.build_time = None
+        lay = QVBoxLayout(self); lay.setContentsMargins(0,0,0,0)
+
+    def ensure_built(self):
+        if self.page is None:
+            t0 = time.perf_counter()
+            self.page = self._factory()
+            self.layout().addWidget(self.page)
+            self.build_time = time.perf_counter() - t0
+            print(f"[inicio] Página '{self.name}' construida en {self.build_time * 1000:.0f} ms")
+        return self.page
+
+
 class MainWindow(QMainWindow):
     def __init__(self, parent=None, colors=None):
         super().__init__(parent)
@@ -3156,9 +3759,19 @@ class MainWindow(QMainWindow):
             pass
 
         tabs.addTab(home, "Inicio")
-        tabs.addTab(MatricesPage(self.colors, self), "Matrices")
-        tabs.addTab(GaussJordanPage(self.colors, self), "Sistema de ecuaciones lineales")
-        tabs.addTab(RootFindingPage(self.colors, self), "Métodos numéricos")
+        # las páginas se construyen al mostrarse su pestaña por primera vez
+        for page_cls, name in ((MatricesPage, "Matrices"), (GaussJordanPage, "Sistema de ecuaciones lineales"), (RootFindingPage, "Métodos numéricos")):
+            tabs.addTab(LazyPage(lambda cls=page_cls: cls(self.colors, self), name), name)
+        tabs.currentChanged.connect(lambda idx: self._build_tab(tabs, idx))
+
+        # nivel de detalle del procedimiento, compartido por todas las páginas
+        detail = QWidget(); detail_lay = QHBoxLayout(detail); detail_lay.setContentsMargins(0,0,8,0); detail_lay.setSpacing(6)
+        lbl_detail = QLabel("Detalle:"); lbl_detail.setStyleSheet(f"color:{self.colors['text_secondary']};")
+        self.verbosity_combo = QComboBox(); self.verbosity_combo.addItems(step_log.VERBOSITY_LABELS)
+        self.verbosity_combo.setCurrentIndex(step_log.get_verbosity())
+        self.verbosity_combo.currentIndexChanged.connect(step_log.set_verbosity)
+        detail_lay.addWidget(lbl_detail); detail_lay.addWidget(self.verbosity_combo)
+        tabs.setCornerWidget(detail, Qt.TopRightCorner)
 
         btn_matrices.clicked.connect(lambda: tabs.setCurrentIndex(1))
         btn_sis.clicked.connect(lambda: tabs.setCurrentIndex(2))
@@ -3166,6 +3779,11 @@ class MainWindow(QMainWindow):
 
         self.setCentralWidget(tabs)
 
+    def _build_tab(self, tabs, idx):
+        widget = tabs.widget(idx)
+        if isinstance(widget, LazyPage):
+            widget.ensure_built()
+
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     window = MainWindow()
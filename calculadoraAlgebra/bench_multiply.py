@@ -0,0 +1,53 @@
+import random
+import time
+from fractions import Fraction
+import matrix_multiply
+from matrix_multiply import multiply_rows, _classic
+
+# Compara los núcleos de matrix_multiply para ubicar los cruces; ajustar
+# STRASSEN_THRESHOLD e INT64_BOUND en matrix_multiply.
+
+random.seed(0)
+
+def entera(n, digits=2):
+    top = 10 ** digits - 1
+    return [[random.randint(-top, top) for _ in range(n)] for _ in range(n)]
+
+def racional(n):
+    return [[Fraction(random.randint(-9, 9), random.randint(1, 9)) for _ in range(n)] for _ in range(n)]
+
+def medir(func, *args):
+    t0 = time.perf_counter()
+    c = func(*args)
+    return time.perf_counter() - t0, c
+
+# Enteros grandes (fuera de int64): clásico frente a Strassen-Winograd
+print("\n--- Entradas enteras de 30 dígitos (enteros de Python)")
+for n in (32, 64, 128, 256):
+    a, b = entera(n, 30), entera(n, 30)
+    t_classic, c_classic = medir(multiply_rows, a, b, n)
+    t_strassen, c_strassen = medir(multiply_rows, a, b, n // 2 - 1)
+    print(f"n={n:4d}  clásico {t_classic:8.3f}s  Strassen-Winograd {t_strassen:8.3f}s  "
+          f"razón {t_strassen / t_classic:5.2f}  coincide={c_classic == c_strassen}")
+
+# Enteros pequeños: NumPy int64 frente a enteros de Python
+print("\n--- Entradas enteras de 2 dígitos")
+for n in (32, 64, 128, 256):
+    a, b = entera(n), entera(n)
+    t_numpy, c_numpy = medir(multiply_rows, a, b)
+    saved = matrix_multiply.INT64_BOUND
+    matrix_multiply.INT64_BOUND = 0
+    t_python, c_python = medir(multiply_rows, a, b)
+    matrix_multiply.INT64_BOUND = saved
+    print(f"n={n:4d}  int64 {t_numpy:8.3f}s  Python {t_python:8.3f}s  coincide={c_numpy == c_python}")
+
+# Racionales: Fraction directo frente a denominador común + producto entero
+print("\n--- Entradas racionales")
+for n in (8, 16, 32, 64, 96):
+    a, b = racional(n), racional(n)
+    t_fraction, c_fraction = medir(_classic, a, b)
+    t_lifted, c_lifted = medir(multiply_rows, a, b)
+    print(f"n={n:4d}  Fraction {t_fraction:8.3f}s  denominador común {t_lifted:8.3f}s  "
+          f"razón {t_lifted / t_fraction:5.2f}  coincide={c_fraction == c_lifted}")
+
+print("\nDone tests.")
@@ -0,0 +1,182 @@
+"""Salida de texto acumulada para las áreas de resultados.
+
+Insertar línea por línea en un QPlainTextEdit o en un tk.Text obliga al
+widget a recalcular su diseño en cada llamada. Un LogSink guarda los pares
+(texto, etiqueta) y los vuelca de una sola vez: al final de la operación
+(`flush`) o, si se le da un planificador, en el siguiente ciclo de eventos.
+
+Para trazas muy largas solo se muestran las primeras `max_lines` líneas; el
+resto queda retenido y se agrega por páginas con `show_more`.
+"""
+
+MAX_LINES = 2000
+PAGE_LINES = 2000
+
+
+class LogSink:
+    """Búfer de (texto, etiqueta); las subclases implementan `_emit` y `_clear_widget`."""
+
+    def __init__(self, scheduler=None, max_lines=MAX_LINES, page_lines=PAGE_LINES, on_more=None):
+        self._pending = []
+        self._held = []       # texto que superó el límite, a la espera de "mostrar más"
+        self._held_lines = 0
+        self._shown_lines = 0
+        self._max_lines = max_lines
+        self._limit = max_lines
+        self._page = page_lines
+        self._scheduler = scheduler
+        self._scheduled = False
+        self.on_more = on_more  # recibe la cantidad de líneas retenidas (0 = ninguna)
+
+    def write(self, text, tag=None):
+        self._pending.append((text, tag))
+        if self._scheduler is not None and not self._scheduled:
+            self._scheduled = True
+            self._scheduler(self.flush)
+
+    def line(self, text="", tag=None):
+        self.write(text + "\n", tag)
+
+    @property
+    def held_lines(self):
+        return self._held_lines
+
+    def flush(self):
+        self._scheduled = False
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        if self._held:
+            # ya hay texto retenido: lo nuevo va detrás para respetar el orden
+            self._hold(pending)
+            self._notify()
+            return
+        visible = []
+        room = self._limit - self._shown_lines
+        for k, (text, tag) in enumerate(pending):
+            n = text.count("\n")
+            if n > room:
+                self._hold(pending[k:])
+                break
+            room -= n
+            visible.append((text, tag))
+        self._show(visible)
+        self._notify()
+
+    def show_more(self):
+        """Muestra la siguiente página del texto retenido."""
+        self.flush()
+        if not self._held:
+            return
+        held, self._held, self._held_lines = self._held, [], 0
+        self._limit = self._shown_lines + self._page
+        visible = []
+        room = self._page
+        for k, (text, tag) in enumerate(held):
+            n = text.count("\n")
+            if n > room and visible:
+                self._hold(held[k:])
+                break
+            room -= n
+            visible.append((text, tag))
+        self._show(visible)
+        self._notify()
+
+    def clear(self):
+        """Descarta lo pendiente y lo retenido y vacía el widget."""
+        self._pending.clear()
+        self._held.clear()
+        self._held_lines = 0
+        self._shown_lines = 0
+        self._limit = self._max_lines
+        self._clear_widget()
+        self._notify()
+
+    def _hold(self, chunks):
+        self._held.extend(chunks)
+        self._held_lines += sum(text.count("\n") for text, _ in chunks)
+
+    def _show(self, chunks):
+        if not chunks:
+            return
+        self._shown_lines += sum(text.count("\n") for text, _ in chunks)
+        self._emit(chunks)
+
+    def _notify(self):
+        if self.on_more is not None:
+            self.on_more(self._held_lines)
+
+    def _emit(self, chunks):
+        raise NotImplementedError
+
+    def _clear_widget(self):
+        raise NotImplementedError
+
+
+class TkTextSink(LogSink):
+    """Vuelca en un tk.Text con una sola llamada a `insert` por lote.
+
+    Las líneas retenidas se anuncian con un enlace "Mostrar más" al final del
+    texto, con la etiqueta `more`.
+    """
+
+    MORE_TAG = "more"
+
+    def __init__(self, text, max_lines=MAX_LINES, page_lines=PAGE_LINES):
+        super().__init__(text.after_idle, max_lines, page_lines, self._update_more)
+        self.text = text
+        text.tag_configure(self.MORE_TAG, underline=True)
+        text.tag_bind(self.MORE_TAG, "<Button-1>", lambda _e: self.show_more())
+
+    def _editable(self, action):
+        state = self.text.cget("state")
+        self.text.config(state="normal")
+        try:
+            action()
+        finally:
+            self.text.config(state=state)
+
+    def _emit(self, chunks):
+        # agrupar textos consecutivos con la misma etiqueta: insert(índice, texto, etiquetas, texto, etiquetas, ...)
+        args = []
+        for text, tag in chunks:
+            tags = tag or ()
+            if args and args[-1] == tags:
+                args[-2] += text
+            else:
+                args += [text, tags]
+        self._editable(lambda: self.text.insert(self._insert_index(), *args))
+
+    def _insert_index(self):
+        ranges = self.text.tag_ranges(self.MORE_TAG)
+        return ranges[0] if ranges else "end"
+
+    def _update_more(self, held):
+        def update():
+            ranges = self.text.tag_ranges(self.MORE_TAG)
+            if ranges:
+                self.text.delete(ranges[0], ranges[-1])
+            if held:
+                self.text.insert("end", f"▼ Mostrar más ({held} líneas restantes)\n", self.MORE_TAG)
+        self._editable(update)
+
+    def _clear_widget(self):
+        self._editable(lambda: self.text.delete("1.0", "end"))
+
+
+class PlainTextSink(LogSink):
+    """Vuelca en un QPlainTextEdit con un único `appendPlainText` por lote.
+
+    QPlainTextEdit no tiene etiquetas de formato, así que se ignoran.
+    """
+
+    def __init__(self, edit, scheduler=None, max_lines=MAX_LINES, page_lines=PAGE_LINES, on_more=None):
+        super().__init__(scheduler, max_lines, page_lines, on_more)
+        self.edit = edit
+
+    def _emit(self, chunks):
+        text = "".join(text for text, _ in chunks)
+        self.edit.appendPlainText(text[:-1] if text.endswith("\n") else text)
+
+    def _clear_widget(self):
+        self.edit.clear()
@@ -1,9 +1,13 @@
 import re
 import math
 import ast
+import time
 import numpy as np
+from functools import lru_cache
 from fractions import Fraction
 from matrix_core import fraction_to_str
+import autodiff
+import polynomial
 
 
 def preprocess_function(func_str: str) -> str:
@@ -40,41 +44,143 @@ def preprocess_function(func_str: str) -> str:
     return s
 
 
+# Número de funciones distintas cuya versión compilada se conserva.
+COMPILE_CACHE_SIZE = 128
+
+_ALLOWED_NAMES = {'x', 'math', 'abs'}
+_ALLOWED_ATTRS = {'sin', 'cos', 'tan', 'exp', 'log', 'log10', 'pi', 'e', 'sqrt'}
+
+
+@lru_cache(maxsize=COMPILE_CACHE_SIZE)
+def _scalar_source(func_str: str) -> str:
+    """Preprocesa y valida func_str; devuelve el cuerpo de `lambda x: ...`."""
+    s = func_str.strip()
+    if not s:
+        raise ValueError("Función vacía")
+
+    original_func = s
+    s = preprocess_function(s)
+    s = re.sub(r'(?<=\d)(?=x|\()', '*', s)
+    s = re.sub(r'(?<=x)(?=\d|\()', '*', s)
+    s = re.sub(r'(?<=\))(?=[\dx(])', '*', s)
+    s = re.sub(r'(?<=math\.pi)(?=[\dx(])', '*', s)
+    s = re.sub(r'(?<=math\.e)(?=(?:[\d(]|x(?!p)))', '*', s)
+
+    # AST validation
+    try:
+        tree = ast.parse(s, mode='eval')
+    except SyntaxError:
+        raise ValueError(f"Sintaxis inválida en la función: {original_func}")
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and node.id not in _ALLOWED_NAMES:
+            raise ValueError(f"Variable no permitida: {node.id}")
+        elif isinstance(node, ast.Attribute) and node.attr not in _ALLOWED_ATTRS:
+            raise ValueError(f"Función no permitida: {node.attr}")
+    return s
+
+
+@lru_cache(maxsize=COMPILE_CACHE_SIZE)
+def polynomial_coefficients(func_str: str):
+    """Coeficientes (mayor grado primero) si func_str es un polinomio en x; si no, None."""
+    try:
+        return polynomial.from_source(_scalar_source(func_str))
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=COMPILE_CACHE_SIZE)
+def horner_coefficients(func_str: str):
+    """Coeficientes si func_str es un polinomio ya expandido (Σ c·x^k); si no, None.
+
+    Las formas factorizadas ((x-2)^7) se compilan tal cual: expandirlas
+    cancela cifras cerca de sus raíces múltiples.
+    """
+    coeffs = polynomial_coefficients(func_str)
+    if coeffs is None or not polynomial.is_expanded(_scalar_source(func_str)):
+        return None
+    return coeffs
+
+
+def _horner(coeffs):
+    return lambda x: polynomial.horner(coeffs, x)
+
+
+@lru_cache(maxsize=COMPILE_CACHE_SIZE)
+def _compile_scalar(func_str: str):
+    """Compila func_str a una función f(x) (una sola vez por cadena).
+
+    Los polinomios expandidos se evalúan por Horner sobre sus coeficientes.
+    """
+    coeffs = horner_coefficients(func_str)
+    if coeffs is not None:
+        return _horner(coeffs)
+    code = compile(f"lambda x: ({_scalar_source(func_str)})", "<string>", "eval")
+    return eval(code, {"__builtins__": {}, "math": math, "abs": abs})
+
+
+@lru_cache(maxsize=COMPILE_CACHE_SIZE)
+def _compile_jet(func_str: str):
+    """La misma expresión con `math` y `abs` de autodiff: evaluada en un Jet
+    devuelve f, f' y f'' a la vez."""
+    coeffs = horner_coefficients(func_str)
+    if coeffs is not None:
+        return _horner(coeffs)
+    code = compile(f"lambda x: ({_scalar_source(func_str)})", "<string>", "eval")
+    return eval(code, {"__builtins__": {}, "math": autodiff.JET_MATH, "abs": autodiff.jet_abs})
+
+
+@lru_cache(maxsize=COMPILE_CACHE_SIZE)
+def _compile_vectorized(func_str: str):
+    """Versión NumPy compilada de func_str (una sola vez por cadena)."""
+    s = func_str.strip()
+    if not s:
+        raise ValueError("Función vacía")
+    coeffs = horner_coefficients(s)
+    if coeffs is not None:
+        return _horner(coeffs)
+    s = preprocess_function(s)
+    s = s.replace("math.sin", "np.sin")
+    s = s.replace("math.cos", "np.cos")
+    s = s.replace("math.tan", "np.tan")
+    s = s.replace("math.exp", "np.exp")
+    s = s.replace("math.log", "np.log")
+    s = s.replace("math.log10", "np.log10")
+    s = s.replace("math.sqrt", "np.sqrt")
+    s = s.replace("abs(", "np.abs(")
+    s = s.replace("math.pi", "np.pi")
+    s = s.replace("math.e", "np.e")
+    code = compile(f"lambda x: ({s})", "<string>", "eval")
+    return eval(code, {"__builtins__": {}, "np": np, "math": math, "abs": np.abs})
+
+
+def compile_cache_info():
+    """Aciertos/fallos de las cachés de compilación (escalar, derivadas y vectorizada)."""
+    return {"escalar": _compile_scalar.cache_info(), "derivadas": _compile_jet.cache_info(),
+            "vectorizada": _compile_vectorized.cache_info(), "polinomios": polynomial_coefficients.cache_info(),
+            "horner": horner_coefficients.cache_info()}
+
+
+def clear_compile_cache():
+    _scalar_source.cache_clear()
+    polynomial_coefficients.cache_clear()
+    horner_coefficients.cache_clear()
+    _compile_scalar.cache_clear()
+    _compile_jet.cache_clear()
+    _compile_vectorized.cache_clear()
+
+
 def evaluate_function(x, func_str: str) -> float:
     try:
-        s = func_str.strip()
-        if not s:
-            raise ValueError("Función vacía")
-
-        original_func = s
-        s = preprocess_function(s)
-        s = re.sub(r'(?<=\d)(?=x|\()', '*', s)
-        s = re.sub(r'(?<=x)(?=\d|\()', '*', s)
-        s = re.sub(r'(?<=\))(?=[\dx(])', '*', s)
-        s = re.sub(r'(?<=math\.pi)(?=[\dx(])', '*', s)
-        s = re.sub(r'(?<=math\.e)(?=(?:[\d(]|x(?!p)))', '*', s)
-
-        # AST validation
-        try:
-            tree = ast.parse(s, mode='eval')
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Name) and node.id not in ['x', 'math', 'abs']:
-                    raise ValueError(f"Variable no permitida: {node.id}")
-                elif isinstance(node, ast.Attribute) and node.attr not in ['sin', 'cos', 'tan', 'exp', 'log', 'log10', 'pi', 'e', 'sqrt']:
-                    raise ValueError(f"Función no permitida: {node.attr}")
-        except SyntaxError:
-            raise ValueError(f"Sintaxis inválida en la función: {original_func}")
-
-        env = {"x": x, "math": math, "abs": abs}
+        f = _compile_scalar(func_str)
         try:
-            result = eval(s, {"__builtins__": {}}, env)
+            result = f(x)
         except Exception as e:
             msg = str(e)
             if 'math domain error' in msg:
                 hints = []
-                if re.search(r'\bln\b|\blog\b', original_func):
+                if re.search(r'\bln\b|\blog\b', func_str):
                     hints.append('ln(x)/log(x) requiere x>0')
-                if 'sqrt' in original_func:
+                if 'sqrt' in func_str:
                     hints.append('sqrt(...) requiere argumento \u2265 0')
                 hint_msg = (': ' + '; '.join(hints)) if hints else ''
                 raise ValueError(f'Dominio inválido al evaluar f(x){hint_msg}. Ajusta el intervalo. x={x}')
@@ -86,25 +192,38 @@ def evaluate_function(x, func_str: str) -> float:
         raise ValueError(str(e))
 
 
+def evaluate_derivatives(x, func_str: str, h=1e-5):
+    """(f(x), f'(x), f''(x)) por derivación automática, en una sola pasada.
+
+    Si la expresión usa algo que el Jet no admite, f' y f'' se aproximan con
+    diferencias centrales de paso h.
+    """
+    try:
+        try:
+            value, d1, d2 = autodiff.derivatives(_compile_jet(func_str), x)
+        except (TypeError, AttributeError):
+            value = evaluate_function(x, func_str)
+            fp = evaluate_function(x + h, func_str)
+            fm = evaluate_function(x - h, func_str)
+            d1 = (fp - fm) / (2.0 * h)
+            d2 = (fp - 2.0 * value + fm) / (h * h)
+        if not all(isinstance(v, (int, float)) for v in (value, d1, d2)):
+            raise ValueError("La función debe devolver un número")
+        return float(value), float(d1), float(d2)
+    except ZeroDivisionError:
+        raise ValueError(f"División por cero al evaluar f(x) o sus derivadas. x={x}")
+    except Exception as e:
+        msg = str(e)
+        if 'math domain error' in msg:
+            raise ValueError(f'Dominio inválido al evaluar f(x). Ajusta el intervalo. x={x}')
+        raise ValueError(msg)
+
+
 def evaluate_function_vectorized(x_array, func_str: str):
     try:
-        s = func_str.strip()
-        if not s:
-            raise ValueError("Función vacía")
-        s = preprocess_function(s)
-        s = s.replace("math.sin", "np.sin")
-        s = s.replace("math.cos", "np.cos")
-        s = s.replace("math.tan", "np.tan")
-        s = s.replace("math.exp", "np.exp")
-        s = s.replace("math.log", "np.log")
-        s = s.replace("math.log10", "np.log10")
-        s = s.replace("math.sqrt", "np.sqrt")
-        s = s.replace("abs(", "np.abs(")
-        s = s.replace("math.pi", "np.pi")
-        s = s.replace("math.e", "np.e")
-        env = {"x": x_array, "np": np, "math": math, "abs": np.abs}
+        f = _compile_vectorized(func_str)
         with np.errstate(all='ignore'):
-            result = eval(s, {"__builtins__": {}}, env)
+            result = f(x_array)
         result = np.array(result, dtype=float)
         result = np.where(np.isinf(result), np.nan, result)
         return result
@@ -112,6 +231,100 @@ def evaluate_function_vectorized(x_array, func_str: str):
         raise ValueError(str(e))
 
 
+class EvalMemo:
+    """f(x) con memoria por x para una sola resolución.
+
+    Los métodos de raíces vuelven a pedir valores que ya conocen (extremos
+    del intervalo, f(raíz) para el reporte); con la memoria esas llamadas no
+    se repiten y los contadores miden el costo real en evaluaciones de f.
+    """
+
+    def __init__(self, f):
+        self._f = f
+        self._values = {}
+        self.calls = 0
+        self.hits = 0
+        self.seconds = 0.0
+
+    def __call__(self, x):
+        self.calls += 1
+        try:
+            value = self._values[x]
+        except KeyError:
+            t0 = time.perf_counter()
+            value = self._f(x)
+            self.seconds += time.perf_counter() - t0
+            self._values[x] = value
+        else:
+            self.hits += 1
+        return value
+
+    @property
+    def evaluations(self):
+        return self.calls - self.hits
+
+    def stats(self):
+        return {"calls": self.calls, "hits": self.hits, "evaluations": self.evaluations, "seconds": self.seconds}
+
+    def summary(self):
+        per_eval = self.seconds / self.evaluations * 1e6 if self.evaluations else 0.0
+        return (f"Evaluaciones de f: {self.evaluations} ({self.calls} llamadas, {self.hits} desde memoria), "
+                f"{self.seconds * 1e3:.3f} ms en total, {per_eval:.1f} µs por evaluación")
+
+
+# Rangos (inicio, fin, paso) que se recorren en orden hasta encontrar algo.
+SCAN_SPECS = ((-10, 10, 0.1), (-50, 50, 0.2), (-100, 100, 0.5))
+SCAN_MAX_INTERVALS = 32
+
+
+def _scan_values(xs, func_str):
+    try:
+        ys = evaluate_function_vectorized(xs, func_str)
+        return np.broadcast_to(ys, xs.shape).astype(float)
+    except ValueError:
+        # expresiones que NumPy no acepta: evaluar punto a punto
+        ys = np.empty_like(xs)
+        for idx, x in enumerate(xs):
+            try:
+                ys[idx] = evaluate_function(float(x), func_str)
+            except ValueError:
+                ys[idx] = np.nan
+        return ys
+
+
+@lru_cache(maxsize=COMPILE_CACHE_SIZE)
+def scan_sign_changes(func_str: str, y_limit=None):
+    """Busca cambios de signo y ceros de f en SCAN_SPECS (una pasada NumPy por rango).
+
+    Devuelve (intervalos, ceros) como tuplas: intervalos [(x_i, x_i+1)] donde f
+    cambia de signo y ceros [(x, paso)] con |f(x)| < 1e-12. Se detiene en el
+    primer rango que encuentra algo. Los puntos no finitos (o con |f| ≥ y_limit)
+    cortan el barrido igual que una evaluación fallida.
+    """
+    for start, end, step in SCAN_SPECS:
+        count = int(round((end - start) / step)) + 1
+        xs = np.round(start + np.arange(count) * step, 10)
+        ys = _scan_values(xs, func_str)
+        finite = np.isfinite(ys)
+        zero_mask = finite & (np.abs(np.where(finite, ys, 1.0)) < 1e-12)
+        valid = finite[:-1] & finite[1:]
+        if y_limit is not None:
+            small = finite & (np.abs(np.where(finite, ys, np.inf)) < y_limit)
+            valid &= small[:-1] & small[1:]
+        signs = np.sign(np.where(finite, ys, 0.0))
+        change = valid & (np.abs(np.diff(signs)) == 2)
+        idx = np.flatnonzero(change)
+        if idx.size >= SCAN_MAX_INTERVALS:
+            idx = idx[:SCAN_MAX_INTERVALS]
+            # el barrido escalar se detenía en el último intervalo aceptado
+            zero_mask[idx[-1] + 2:] = False
+        intervals = tuple((float(xs[i]), float(xs[i + 1])) for i in idx)
+        zeros = tuple((float(xs[i]), step) for i in np.flatnonzero(zero_mask))
+        if intervals or zeros:
+            return intervals, zeros
+    return (), ()
+
+
 def format_function_display(func_str: str) -> str:
     superscript_map = {
         '0': '⁰', '1': '¹', '2': '²', '3': '³', '4': '⁴',
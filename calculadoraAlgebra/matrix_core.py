@@ -1,3 +1,4 @@
+import math
 from fractions import Fraction
 
 
@@ -11,24 +12,222 @@ def fraction_to_str(frac):
 
 
 class Matrix:
+    """Matriz densa guardada en un único búfer plano en orden por filas.
+
+    `data` y `m[i, j]` se mantienen por compatibilidad; `row`, `col` e
+    `iter_rows` permiten recorrer filas/columnas completas sin indexar celda
+    a celda.
+    """
+
+    __slots__ = ("_buf", "rows", "cols", "shape", "strides", "_lu")
+
     def __init__(self, data):
-        self.data = data
-        self.rows = len(data)
-        self.cols = len(data[0]) if self.rows > 0 else 0
-        self.shape = (self.rows, self.cols)
+        rows = len(data)
+        cols = len(data[0]) if rows > 0 else 0
+        buf = []
+        for row in data:
+            if len(row) != cols:
+                raise ValueError("Todas las filas de la matriz deben tener la misma longitud")
+            buf.extend(row)
+        self._set_buffer(rows, cols, buf)
+
+    def _set_buffer(self, rows, cols, buf):
+        self._buf = buf
+        self.rows = rows
+        self.cols = cols
+        self.shape = (rows, cols)
+        self.strides = (cols, 1)
+        self._lu = None
+
+    @classmethod
+    def from_flat(cls, rows, cols, buf):
+        """Construye la matriz adoptando `buf` (lista plana rows*cols) sin copiarla."""
+        if len(buf) != rows * cols:
+            raise ValueError("El búfer no coincide con las dimensiones indicadas")
+        mat = cls.__new__(cls)
+        mat._set_buffer(rows, cols, buf)
+        return mat
+
+    @classmethod
+    def from_rows(cls, rows_iter, cols):
+        """Construye la matriz a partir de filas ya calculadas de longitud `cols`."""
+        buf = []
+        rows = 0
+        for row in rows_iter:
+            buf.extend(row)
+            rows += 1
+        return cls.from_flat(rows, cols, buf)
+
+    @property
+    def data(self):
+        """Copia de la matriz como lista de listas."""
+        c = self.cols
+        buf = self._buf
+        return [buf[i * c:(i + 1) * c] for i in range(self.rows)]
+
+    @property
+    def flat(self):
+        """Copia de solo lectura (tupla) del búfer plano; las escrituras van por
+        m[i, j] para que se descarte la factorización guardada."""
+        return tuple(self._buf)
 
     def __getitem__(self, indices):
         i, j = indices
-        return self.data[i][j]
+        return self._buf[i * self.cols + j]
 
     def __setitem__(self, indices, value):
         i, j = indices
-        self.data[i][j] = value
+        self._buf[i * self.cols + j] = value
+        self._lu = None
+
+    def lu(self):
+        """Factorización LUFactorization de la matriz, calculada una sola vez."""
+        if self._lu is None:
+            self._lu = LUFactorization(self)
+        return self._lu
+
+    def row(self, i):
+        """Copia de la fila i."""
+        start = i * self.cols
+        return self._buf[start:start + self.cols]
+
+    def col(self, j):
+        """Copia de la columna j."""
+        return self._buf[j::self.cols] if self.cols else []
+
+    def iter_rows(self):
+        c = self.cols
+        buf = self._buf
+        for start in range(0, self.rows * c, c):
+            yield buf[start:start + c]
+
+    def iter_cols(self):
+        for j in range(self.cols):
+            yield self._buf[j::self.cols]
+
+    def copy(self):
+        return Matrix.from_flat(self.rows, self.cols, list(self._buf))
+
+    def transpose(self):
+        return Matrix.from_rows(self.iter_cols(), self.rows)
+
+
+class LUFactorization:
+    """Factorización exacta P·A = L·U con pivoteo por filas.
+
+    L es triangular inferior unitaria (n×n) y U escalonada (n×m), ambas con
+    entradas Fraction; `perm[i]` es la fila de A que ocupa la posición i.
+    Para matrices cuadradas invertibles permite resolver sistemas con uno o
+    varios términos independientes sin repetir la eliminación.
+    """
+
+    __slots__ = ("n_rows", "n_cols", "perm", "L", "U", "pivot_cols", "rank", "_sign")
+
+    def __init__(self, matrix, progress=None):
+        """`progress(hechas, total)` se llama tras cada columna eliminada."""
+        rows = list(matrix.iter_rows()) if isinstance(matrix, Matrix) else matrix
+        n = len(rows)
+        m = len(rows[0]) if n else 0
+        U = [[Fraction(val) for val in row] for row in rows]
+        L = [[Fraction(0)] * n for _ in range(n)]
+        perm = list(range(n))
+        sign = 1
+        pivot_cols = []
+        r = 0
+        for c in range(m):
+            if r == n:
+                break
+            piv = next((i for i in range(r, n) if U[i][c] != 0), None)
+            if piv is None:
+                continue
+            if piv != r:
+                U[r], U[piv] = U[piv], U[r]
+                L[r], L[piv] = L[piv], L[r]
+                perm[r], perm[piv] = perm[piv], perm[r]
+                sign = -sign
+            head = U[r]
+            pivot = head[c]
+            for i in range(r + 1, n):
+                row_i = U[i]
+                if row_i[c] != 0:
+                    factor = row_i[c] / pivot
+                    L[i][r] = factor
+                    U[i] = row_i[:c] + [a - factor * b for a, b in zip(row_i[c:], head[c:])]
+            pivot_cols.append(c)
+            r += 1
+            if progress is not None:
+                progress(c + 1, m)
+        for i in range(n):
+            L[i][i] = Fraction(1)
+        self.n_rows = n
+        self.n_cols = m
+        self.perm = perm
+        self.L = L
+        self.U = U
+        self.pivot_cols = pivot_cols
+        self.rank = len(pivot_cols)
+        self._sign = sign
+
+    def is_invertible(self):
+        return self.n_rows == self.n_cols and self.rank == self.n_rows
+
+    def det(self):
+        if self.n_rows != self.n_cols:
+            raise ValueError("La matriz debe ser cuadrada para calcular su determinante")
+        if self.rank < self.n_rows:
+            return Fraction(0)
+        det = Fraction(self._sign)
+        for i in range(self.n_rows):
+            det *= self.U[i][i]
+        return det
+
+    def solve(self, b):
+        """Solución exacta de A·x = b (lista de n valores)."""
+        if not self.is_invertible():
+            raise ValueError("Matriz singular")
+        n = self.n_rows
+        L, U = self.L, self.U
+        y = []
+        for i in range(n):
+            s = Fraction(b[self.perm[i]])
+            row = L[i]
+            for k in range(i):
+                if row[k]:
+                    s -= row[k] * y[k]
+            y.append(s)
+        x = [Fraction(0)] * n
+        for i in range(n - 1, -1, -1):
+            s = y[i]
+            row = U[i]
+            for k in range(i + 1, n):
+                if row[k]:
+                    s -= row[k] * x[k]
+            x[i] = s / row[i]
+        return x
+
+    def solve_many(self, B, progress=None):
+        """Resuelve A·X = B para B de n×k (Matrix o lista de filas); devuelve el mismo tipo.
+
+        `progress(hechas, total)` se llama tras cada columna resuelta.
+        """
+        cols = list(B.iter_cols()) if isinstance(B, Matrix) else [list(col) for col in zip(*B)]
+        sols = []
+        for col in cols:
+            sols.append(self.solve(col))
+            if progress is not None:
+                progress(len(sols), len(cols))
+        out = [list(row) for row in zip(*sols)]
+        return Matrix(out) if isinstance(B, Matrix) else out
+
+    def inverse(self, progress=None):
+        n = self.n_rows
+        identity = [[Fraction(1 if i == j else 0) for j in range(n)] for i in range(n)]
+        return self.solve_many(identity, progress)
 
 
 def format_matrix_lines(matrix):
     if isinstance(matrix, Matrix):
-        data = matrix.data
+        data = list(matrix.iter_rows())
     else:
         data = matrix
     if not data:
@@ -42,29 +241,158 @@ def format_matrix_lines(matrix):
     return lines
 
 
+def _integer_rows(rows):
+    """Escala cada fila por el mcm de sus denominadores.
+
+    Devuelve (filas_enteras, denominadores): filas_enteras[i] = den[i]·rows[i],
+    así que det(original) = det(filas_enteras) / prod(den).
+    """
+    int_rows = []
+    dens = []
+    for row in rows:
+        fracs = [val if isinstance(val, (int, Fraction)) else Fraction(val) for val in row]
+        den = 1
+        for val in fracs:
+            if isinstance(val, Fraction) and val.denominator != 1:
+                den = math.lcm(den, val.denominator)
+        if den == 1:
+            int_rows.append([int(val) for val in fracs])
+        else:
+            int_rows.append([int(val * den) for val in fracs])
+        dens.append(den)
+    return int_rows, dens
+
+
+def _determinant_bareiss(matrix, progress=None):
+    """Determinante exacto por eliminación libre de fracciones (Bareiss).
+
+    Las filas se llevan a enteros una sola vez; cada paso usa división entera
+    exacta, así que no se crean objetos Fraction durante la eliminación.
+    `progress(hechos, total)` se llama tras cada pivote.
+    """
+    rows = list(matrix.iter_rows()) if isinstance(matrix, Matrix) else matrix
+    n = len(rows)
+    if n == 0:
+        return Fraction(1)
+    sub, dens = _integer_rows(rows)
+    sign = 1
+    prev = 1
+    for k in range(n - 1):
+        # sub es la submatriz activa (n-k)×(n-k); su primera columna es la del pivote
+        piv = next((idx for idx, row in enumerate(sub) if row[0] != 0), None)
+        if piv is None:
+            return Fraction(0)
+        if piv != 0:
+            sub[0], sub[piv] = sub[piv], sub[0]
+            sign = -sign
+        head = sub[0]
+        pivot = head[0]
+        tail = head[1:]
+        sub = [
+            [(pivot * x - row[0] * y) // prev for x, y in zip(row[1:], tail)]
+            for row in sub[1:]
+        ]
+        prev = pivot
+        if progress is not None:
+            progress(k + 1, n - 1)
+    return Fraction(sign * sub[0][0], math.prod(dens))
+
+
 def _determinant_step(matrix):
     """Calcula determinante por reducción (sin pasos de UI)."""
-    from fractions import Fraction
-    n = len(matrix)
-    mat = [row[:] for row in matrix]
-    det = Fraction(1)
-    for i in range(n):
-        pivot = mat[i][i]
-        if pivot == 0:
-            for k in range(i+1, n):
-                if mat[k][i] != 0:
-                    mat[i], mat[k] = mat[k], mat[i]
-                    det *= -1
-                    pivot = mat[i][i]
-                    break
-        if pivot == 0:
-            return Fraction(0)
-        det *= pivot
-        for j in range(i+1, n):
-            factor = mat[j][i] / pivot
-            for k in range(i, n):
-                mat[j][k] -= factor * mat[i][k]
-    return det
+    return _determinant_bareiss(matrix)
+
+
+def _kernel_vector(rows):
+    """Rango y un vector no nulo del núcleo (None si el rango es completo) por RREF exacta."""
+    mat = [[Fraction(val) for val in row] for row in rows]
+    n_rows = len(mat)
+    n_cols = len(mat[0]) if n_rows else 0
+    pivot_cols = []
+    r = 0
+    for c in range(n_cols):
+        piv = next((i for i in range(r, n_rows) if mat[i][c] != 0), None)
+        if piv is None:
+            continue
+        mat[r], mat[piv] = mat[piv], mat[r]
+        pivot = mat[r][c]
+        mat[r] = [val / pivot for val in mat[r]]
+        head = mat[r]
+        for i in range(n_rows):
+            if i != r and mat[i][c] != 0:
+                factor = mat[i][c]
+                mat[i] = [a - factor * b for a, b in zip(mat[i], head)]
+        pivot_cols.append(c)
+        r += 1
+        if r == n_rows:
+            break
+    rank = len(pivot_cols)
+    free = next((c for c in range(n_cols) if c not in pivot_cols), None)
+    if free is None:
+        return rank, None
+    vec = [Fraction(0)] * n_cols
+    vec[free] = Fraction(1)
+    for i, c in enumerate(pivot_cols):
+        vec[c] = -mat[i][free]
+    return rank, vec
+
+
+def _adjugate_exact(matrix):
+    """Adjunta exacta adj(A) (lista de listas) a partir de una sola eliminación.
+
+    Si A es invertible, una eliminación de Gauss-Jordan libre de fracciones
+    sobre [A | I] deja [d·I | E] con E = adj(P·A), de donde sale adj(A) sin
+    calcular ningún menor. Si el rango es n-1, adj(A) = c·v·wᵀ con A·v = 0 y
+    wᵀ·A = 0, y c se obtiene de un único cofactor. Con rango ≤ n-2 es nula.
+    """
+    rows = list(matrix.iter_rows()) if isinstance(matrix, Matrix) else matrix
+    n = len(rows)
+    if n == 0:
+        return []
+    if n == 1:
+        return [[Fraction(1)]]
+    int_rows, dens = _integer_rows(rows)
+    aug = [int_row + [1 if j == i else 0 for j in range(n)] for i, int_row in enumerate(int_rows)]
+    sign = 1
+    prev = 1
+    singular = False
+    for k in range(n):
+        piv = next((i for i in range(k, n) if aug[i][k] != 0), None)
+        if piv is None:
+            singular = True
+            break
+        if piv != k:
+            aug[k], aug[piv] = aug[piv], aug[k]
+            sign = -sign
+        head = aug[k]
+        pivot = head[k]
+        for i in range(n):
+            if i != k:
+                row_i = aug[i]
+                factor = row_i[k]
+                aug[i] = [(pivot * x - factor * y) // prev for x, y in zip(row_i, head)]
+        prev = pivot
+    if not singular:
+        # A' = D·A: la parte derecha es E con E·A' = d·I, d = sign·det(A'),
+        # luego adj(A') = sign·E y adj(A) = adj(A')·D / det(D)
+        det_d = math.prod(dens)
+        return [
+            [Fraction(sign * aug[i][n + j] * dens[j], det_d) for j in range(n)]
+            for i in range(n)
+        ]
+    # A singular: solo hay adjunta no nula si el rango es exactamente n-1
+    rank, v = _kernel_vector(rows)
+    zero = [[Fraction(0)] * n for _ in range(n)]
+    if rank < n - 1:
+        return zero
+    _, w = _kernel_vector([list(col) for col in zip(*rows)])
+    k = next(idx for idx, val in enumerate(v) if val != 0)
+    l = next(idx for idx, val in enumerate(w) if val != 0)
+    # adj[k][l] = C[l][k] = (-1)^(l+k)·det(A sin fila l ni columna k)
+    minor = [[val for c, val in enumerate(row) if c != k] for r, row in enumerate(rows) if r != l]
+    cof = _determinant_bareiss(minor) * (-1) ** (l + k)
+    c = cof / (v[k] * w[l])
+    return [[c * v[i] * w[j] for j in range(n)] for i in range(n)]
 
 
 def _determinant_sarrus(matrix):
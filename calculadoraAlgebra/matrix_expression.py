@@ -0,0 +1,222 @@
+"""Árbol de expresiones matriciales (A, B, coeficientes, +, -, *, ^T).
+
+`parse` convierte los tokens de MatricesPage en un árbol; `optimize` lleva
+las transpuestas hasta las hojas ((XY)ᵀ = YᵀXᵀ, (X+Y)ᵀ = Xᵀ+Yᵀ, Xᵀᵀ = X),
+aplana los productos encadenados y elige, por programación dinámica, el
+orden de multiplicación con menos productos escalares. El resultado es un
+árbol de productos binarios que se evalúa tal cual; `describe` muestra el
+orden elegido.
+"""
+
+
+class Leaf:
+    """Matriz `name` ('A' o 'B') por `coef`, opcionalmente transpuesta."""
+
+    __slots__ = ("name", "coef", "transposed")
+
+    def __init__(self, name, coef=1, transposed=False):
+        self.name = name
+        self.coef = coef
+        self.transposed = transposed
+
+
+class Scale:
+    """coef · (expresión entre paréntesis)."""
+
+    __slots__ = ("coef", "child")
+
+    def __init__(self, coef, child):
+        self.coef = coef
+        self.child = child
+
+
+class Transpose:
+    __slots__ = ("child",)
+
+    def __init__(self, child):
+        self.child = child
+
+
+class Product:
+    """Producto de `factors` en ese orden (dos factores tras `optimize`)."""
+
+    __slots__ = ("factors",)
+
+    def __init__(self, factors):
+        self.factors = factors
+
+
+class Sum:
+    """Suma de términos (signo, nodo) con signo ±1."""
+
+    __slots__ = ("terms",)
+
+    def __init__(self, terms):
+        self.terms = terms
+
+
+def parse(tokens, parse_number):
+    """Árbol de la expresión; `parse_number` convierte los coeficientes."""
+
+    def starts_factor(tk):
+        return tk in ('A', 'B', '(') or (tk and tk[0].isdigit())
+
+    def read_factor(idx):
+        coef = 1
+        if idx < len(tokens) and (tokens[idx] and tokens[idx][0].isdigit()):
+            coef = parse_number(tokens[idx]); idx += 1
+        if idx >= len(tokens):
+            raise ValueError("Expresión incompleta")
+        if tokens[idx] == '(':
+            node, idx = read_sum(idx + 1)
+            if idx >= len(tokens) or tokens[idx] != ')':
+                raise ValueError("Paréntesis no balanceados")
+            idx += 1
+            if coef != 1:
+                node = Scale(coef, node)
+        elif tokens[idx] in ('A', 'B'):
+            node = Leaf(tokens[idx], coef); idx += 1
+        else:
+            raise ValueError("Se esperaba A, B o ( ... )")
+        while idx < len(tokens) and tokens[idx] == '^T':
+            node = Transpose(node); idx += 1
+        return node, idx
+
+    def read_term(idx):
+        node, idx = read_factor(idx)
+        factors = [node]
+        while idx < len(tokens) and (tokens[idx] == '*' or starts_factor(tokens[idx])):
+            if tokens[idx] == '*':
+                idx += 1
+            node, idx = read_factor(idx)
+            factors.append(node)
+        return (factors[0] if len(factors) == 1 else Product(factors)), idx
+
+    def read_sum(idx):
+        terms = []
+        sign = 1
+        while idx < len(tokens) and tokens[idx] != ')':
+            if tokens[idx] == '+':
+                sign = 1; idx += 1; continue
+            if tokens[idx] == '-':
+                sign = -1; idx += 1; continue
+            term, idx = read_term(idx)
+            terms.append((sign, term))
+        if not terms:
+            raise ValueError("Expresión incompleta")
+        return (terms[0][1] if len(terms) == 1 and terms[0][0] == 1 else Sum(terms)), idx
+
+    root, pos = read_sum(0)
+    if pos != len(tokens):
+        raise ValueError("Expresión inválida")
+    return root
+
+
+def push_transposes(node, transposed=False):
+    """Árbol equivalente sin nodos Transpose (solo hojas transpuestas)."""
+    if isinstance(node, Transpose):
+        return push_transposes(node.child, not transposed)
+    if isinstance(node, Leaf):
+        return Leaf(node.name, node.coef, node.transposed != transposed)
+    if isinstance(node, Scale):
+        return Scale(node.coef, push_transposes(node.child, transposed))
+    if isinstance(node, Sum):
+        return Sum([(sign, push_transposes(term, transposed)) for sign, term in node.terms])
+    factors = node.factors[::-1] if transposed else node.factors
+    # los productos entre paréntesis sin coeficiente se funden con el exterior
+    flat = []
+    for f in factors:
+        f = push_transposes(f, transposed)
+        flat.extend(f.factors if isinstance(f, Product) else (f,))
+    return Product(flat)
+
+
+def shape(node, shapes):
+    """(filas, columnas) del resultado; `shapes` da la forma de A y B."""
+    if isinstance(node, Leaf):
+        rows, cols = shapes[node.name]
+        return (cols, rows) if node.transposed else (rows, cols)
+    if isinstance(node, (Scale, Transpose)):
+        rows, cols = shape(node.child, shapes)
+        return (cols, rows) if isinstance(node, Transpose) else (rows, cols)
+    if isinstance(node, Sum):
+        return shape(node.terms[0][1], shapes)
+    return shape(node.factors[0], shapes)[0], shape(node.factors[-1], shapes)[1]
+
+
+def chain_order(dims):
+    """Orden óptimo para multiplicar matrices de formas dims[i]×dims[i+1].
+
+    Devuelve (costo, split) donde split[i][j] es el índice k tal que el
+    producto i..j se parte en (i..k)·(k+1..j).
+    """
+    n = len(dims) - 1
+    cost = [[0] * n for _ in range(n)]
+    split = [[0] * n for _ in range(n)]
+    for length in range(2, n + 1):
+        for i in range(n - length + 1):
+            j = i + length - 1
+            best = None
+            for k in range(i, j):
+                c = cost[i][k] + cost[k + 1][j] + dims[i] * dims[k + 1] * dims[j + 1]
+                if best is None or c < best:
+                    best = c; split[i][j] = k
+            cost[i][j] = best
+    return cost[0][n - 1], split
+
+
+def _reorder(node, shapes):
+    if isinstance(node, Scale):
+        return Scale(node.coef, _reorder(node.child, shapes))
+    if isinstance(node, Sum):
+        return Sum([(sign, _reorder(term, shapes)) for sign, term in node.terms])
+    if not isinstance(node, Product):
+        return node
+    factors = [_reorder(f, shapes) for f in node.factors]
+    dims = [shape(factors[0], shapes)[0]]
+    for f in factors:
+        rows, cols = shape(f, shapes)
+        if rows != dims[-1]:
+            raise ValueError("Dimensiones no compatibles para multiplicación")
+        dims.append(cols)
+    _, split = chain_order(dims)
+
+    def build(i, j):
+        if i == j:
+            return factors[i]
+        k = split[i][j]
+        return Product([build(i, k), build(k + 1, j)])
+    return build(0, len(factors) - 1)
+
+
+def optimize(node, shapes):
+    """Transpuestas en las hojas y productos binarios en el orden más barato."""
+    return _reorder(push_transposes(node), shapes)
+
+
+def describe(node, fmt=str):
+    """Texto de la expresión tal como se evaluará, p. ej. "A × (B × Bᵀ)"."""
+    if isinstance(node, Leaf):
+        text = node.name + ("ᵀ" if node.transposed else "")
+        return text if node.coef == 1 else f"{fmt(node.coef)}·{text}"
+    if isinstance(node, Scale):
+        return f"{fmt(node.coef)}·({describe(node.child, fmt)})"
+    if isinstance(node, Transpose):
+        return f"({describe(node.child, fmt)})ᵀ"
+    if isinstance(node, Sum):
+        parts = []
+        for idx, (sign, term) in enumerate(node.terms):
+            text = describe(term, fmt)
+            if isinstance(term, Sum):
+                text = f"({text})"
+            if idx:
+                text = ("− " if sign < 0 else "+ ") + text
+            elif sign < 0:
+                text = "−" + text
+            parts.append(text)
+        return " ".join(parts)
+    parts = []
+    for f in node.factors:
+        text = describe(f, fmt)
+        parts.append(f"({text})" if isinstance(f, (Product, Sum)) else text)
+    return " × ".join(parts)
@@ -0,0 +1,300 @@
+"""Operaciones exactas largas en un ProcessPoolExecutor.
+
+Las matrices viajan a los procesos como enteros: cada fila se escala por el
+mcm de sus denominadores (`_integer_rows`) y se envía (filas, columnas,
+tupla plana de enteros); los denominadores se quedan en el proceso
+principal y se aplican al combinar. Así no se serializan objetos Fraction
+y los procesos trabajan solo con enteros de Python.
+
+El producto se reparte en bloques de filas entre los procesos del pool
+compartido (`Job`, progreso bloque a bloque). Determinantes, inversas y
+sistemas son una sola eliminación larga: corren en un proceso propio
+(`ProcessJob`) que informa el avance fila a fila y que `cancel()` termina,
+así no queda ocupando el pool que usan también otras operaciones (p. ej.
+root_scan). Las devoluciones de llamada se ejecutan en un hilo auxiliar, no
+en el de la interfaz.
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from fractions import Fraction
+
+from matrix_core import Matrix, LUFactorization, _integer_rows, _determinant_bareiss
+from operations_gauss import gauss_jordan_solve
+from matrix_multiply import _int_product, STRASSEN_THRESHOLD
+
+# Por debajo de este tamaño (mayor dimensión) el envío al pool cuesta más que la operación.
+PARALLEL_MIN_SIZE = 48
+
+WORKERS = os.cpu_count() or 2
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Pool de procesos compartido, creado al primer uso."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=WORKERS)
+        return _executor
+
+
+def encode_rows(rows):
+    """(filas, columnas, enteros planos) y denominadores por fila."""
+    int_rows, dens = _integer_rows(rows)
+    cols = len(int_rows[0]) if int_rows else 0
+    return (len(int_rows), cols, tuple(v for row in int_rows for v in row)), dens
+
+
+def _decode_ints(enc):
+    rows, cols, flat = enc
+    return [list(flat[i * cols:(i + 1) * cols]) for i in range(rows)]
+
+
+# --- tareas (en el pool o en el proceso propio de un ProcessJob) ---
+
+def _task_multiply(a_enc, b_enc):
+    a = _decode_ints(a_enc)
+    b = _decode_ints(b_enc)
+    c = _int_product(a, b, len(a), len(b), len(b[0]), STRASSEN_THRESHOLD)
+    return len(c), len(c[0]) if c else 0, tuple(v for row in c for v in row)
+
+
+def _task_determinant(enc, progress=None):
+    return _determinant_bareiss(_decode_ints(enc), progress)
+
+
+def _task_inverse(enc, dens, progress=None):
+    rows = [[Fraction(v, d) for v in row] for row, d in zip(_decode_ints(enc), dens)]
+    n = len(rows)
+
+    def half(offset):
+        # factorización y n sustituciones: cada una es la mitad del avance
+        if progress is None:
+            return None
+        return lambda done, total: progress(offset + done, 2 * total)
+    lu = LUFactorization(rows, half(0))
+    return encode_rows(lu.inverse(half(n)))
+
+
+def _task_solve(enc, dens, progress=None):
+    rows = [[Fraction(v, d) for v in row] for row, d in zip(_decode_ints(enc), dens)]
+    n_vars = len(rows[0]) - 1
+    lu = LUFactorization([row[:n_vars] for row in rows], progress)
+    if lu.is_invertible():
+        return 'unique', tuple(lu.pivot_cols), encode_rows([lu.solve([row[-1] for row in rows])])
+    status, result = gauss_jordan_solve(rows)
+    return status, tuple(lu.pivot_cols), encode_rows([result]) if status == 'unique' else None
+
+
+def _process_main(conn, task, args):
+    # proceso propio de un ProcessJob: avance y resultado viajan por la tubería
+    try:
+        result = task(*args, progress=lambda done, total: conn.send(("progress", done, total)))
+    except Exception as err:
+        conn.send(("error", err))
+    else:
+        conn.send(("done", result))
+    finally:
+        conn.close()
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class Job:
+    """Tareas enviadas al pool cuyos resultados se combinan al terminar todas.
+
+    `on_progress(hechas, total)` y `on_done(resultado, error)` se llaman desde
+    un hilo del ejecutor.
+    """
+
+    def __init__(self, futures, combine, on_progress=None, on_done=None):
+        self._futures = futures
+        self._combine = combine
+        self._on_progress = on_progress
+        self._on_done = on_done
+        self._lock = threading.Lock()
+        self._done = 0
+        self._finished = threading.Event()
+        self._result = None
+        self._error = None
+        self.cancelled = False
+        for fut in futures:
+            fut.add_done_callback(self._task_done)
+
+    @property
+    def total(self):
+        return len(self._futures)
+
+    def done(self):
+        return self._finished.is_set()
+
+    def cancel(self):
+        """Descarta las tareas pendientes; las que ya corren terminan pero se ignoran."""
+        with self._lock:
+            if self._finished.is_set():
+                return
+            self.cancelled = True
+        self._finish(None, JobCancelled("Operación cancelada"))
+        self._cancel_pending()
+
+    def _task_done(self, fut):
+        with self._lock:
+            if self.cancelled or self._finished.is_set():
+                return
+            self._done += 1
+            done = self._done
+        if self._on_progress is not None:
+            self._on_progress(done, self.total)
+        if fut.exception() is not None:
+            self._finish(None, fut.exception())
+            self._cancel_pending()
+        elif done == self.total:
+            try:
+                result = self._combine([f.result() for f in self._futures])
+            except Exception as err:
+                self._finish(None, err)
+            else:
+                self._finish(result, None)
+
+    def _cancel_pending(self):
+        for fut in self._futures:
+            fut.cancel()
+
+    def _finish(self, result, error):
+        with self._lock:
+            if self._finished.is_set():
+                return
+            self._result, self._error = result, error
+            self._finished.set()
+        if self._on_done is not None:
+            self._on_done(result, error)
+
+    def result(self, timeout=None):
+        """Espera el resultado (para scripts y pruebas; la interfaz usa on_done)."""
+        if not self._finished.wait(timeout):
+            raise TimeoutError("La operación no terminó a tiempo")
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+
+class ProcessJob(Job):
+    """Una sola tarea en un proceso propio: informa el avance que envía la
+    tarea (`progress(hechas, total)`) y `cancel()` termina el proceso."""
+
+    def __init__(self, task, args, combine, on_progress=None, on_done=None):
+        super().__init__([], combine, on_progress, on_done)
+        self._total = 1
+        ctx = multiprocessing.get_context()
+        self._conn, child = ctx.Pipe(duplex=False)
+        self._process = ctx.Process(target=_process_main, args=(child, task, args), daemon=True)
+        self._process.start()
+        child.close()
+        threading.Thread(target=self._listen, daemon=True).start()
+
+    @property
+    def total(self):
+        return self._total
+
+    def cancel(self):
+        super().cancel()
+        self._process.terminate()
+
+    def _listen(self):
+        try:
+            while True:
+                kind, *payload = self._conn.recv()
+                if kind == "progress":
+                    self._done, self._total = payload
+                    if self._on_progress is not None and not self._finished.is_set():
+                        self._on_progress(*payload)
+                    continue
+                if kind == "error":
+                    self._finish(None, payload[0])
+                else:
+                    try:
+                        result = self._combine([payload[0]])
+                    except Exception as err:
+                        self._finish(None, err)
+                    else:
+                        self._finish(result, None)
+                return
+        except (EOFError, OSError):
+            # proceso terminado por cancel() o caído sin enviar resultado
+            self._finish(None, RuntimeError("El proceso de cálculo terminó sin resultado"))
+        finally:
+            self._conn.close()
+            self._process.join()
+
+
+def submit_multiply(A: Matrix, B: Matrix, on_progress=None, on_done=None, blocks=None):
+    """A·B repartiendo bloques de filas de A entre los procesos."""
+    if A.cols != B.rows:
+        raise ValueError("Dimensiones incompatibles para multiplicación")
+    a_int, da = _integer_rows(A.data)
+    bt_int, db = _integer_rows([list(col) for col in B.iter_cols()])
+    b_enc = (B.rows, B.cols, tuple(v for row in zip(*bt_int) for v in row))
+    blocks = blocks or min(A.rows, 2 * WORKERS)
+    size = -(-A.rows // blocks)
+    executor = get_executor()
+    futures = []
+    for start in range(0, A.rows, size):
+        chunk = a_int[start:start + size]
+        futures.append(executor.submit(_task_multiply, (len(chunk), A.cols, tuple(v for row in chunk for v in row)), b_enc))
+
+    def combine(parts):
+        buf = []
+        row = 0
+        for _, cols, flat in parts:
+            for i in range(len(flat) // cols if cols else 0):
+                di = da[row]; row += 1
+                buf.extend(Fraction(v, di * dj) for v, dj in zip(flat[i * cols:(i + 1) * cols], db))
+        return Matrix.from_flat(A.rows, B.cols, buf)
+    return Job(futures, combine, on_progress, on_done)
+
+
+def submit_determinant(A: Matrix, on_progress=None, on_done=None):
+    if A.rows != A.cols:
+        raise ValueError("La matriz debe ser cuadrada para calcular el determinante")
+    enc, dens = encode_rows(A.data)
+    den = 1
+    for d in dens:
+        den *= d
+    return ProcessJob(_task_determinant, (enc,), lambda parts: Fraction(parts[0], den), on_progress, on_done)
+
+
+def submit_inverse(A: Matrix, on_progress=None, on_done=None):
+    if A.rows != A.cols:
+        raise ValueError("La matriz debe ser cuadrada para inversa")
+    enc, dens = encode_rows(A.data)
+
+    def combine(parts):
+        inv_enc, inv_dens = parts[0]
+        rows, cols, flat = inv_enc
+        return Matrix.from_flat(rows, cols, [Fraction(v, inv_dens[k // cols]) for k, v in enumerate(flat)])
+    return ProcessJob(_task_inverse, (enc, tuple(dens)), combine, on_progress, on_done)
+
+
+def submit_solve(rows, on_progress=None, on_done=None):
+    """Sistema [A | b] resuelto en un proceso: una factorización LU si A es
+    cuadrada e invertible, Gauss-Jordan si no.
+
+    El resultado es (estado, columnas pivote, solución o None) con estado
+    'unique', 'infinite' o 'inconsistent', como operations_gauss.
+    """
+    enc, dens = encode_rows(rows)
+
+    def combine(parts):
+        status, pivot_cols, sol = parts[0]
+        if sol is None:
+            return status, list(pivot_cols), None
+        (_, _, flat), (den,) = sol
+        return status, list(pivot_cols), [Fraction(v, den) for v in flat]
+    return ProcessJob(_task_solve, (enc, tuple(dens)), combine, on_progress, on_done)
@@ -0,0 +1,223 @@
+"""Determinante y rango exactos de matrices enteras por aritmética modular.
+
+Las eliminaciones se hacen módulo primos menores que 2**31 con NumPy int64
+(los productos de dos residuos caben en 62 bits). El determinante se
+reconstruye con el Teorema Chino del Resto usando tantos primos como exija
+la cota de Hadamard; el rango es el máximo de los rangos modulares, que con
+esa misma cantidad de primos queda certificado.
+"""
+
+import math
+from fractions import Fraction
+
+import numpy as np
+
+from matrix_core import Matrix
+
+# A partir de este tamaño (min(filas, columnas)) conviene la vía modular.
+MODULAR_THRESHOLD = 12
+
+_PRIME_START = 2 ** 31 - 1
+_primes = []
+
+
+def _is_prime(n):
+    if n < 2:
+        return False
+    for p in (2, 3, 5, 7, 11, 13):
+        if n % p == 0:
+            return n == p
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    # bases suficientes para n < 3.4e14
+    for a in (2, 3, 5, 7, 11, 13, 17):
+        x = pow(a, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def _prime(k):
+    """k-ésimo primo (desde 0) descendiendo desde 2**31 - 1."""
+    candidate = _primes[-1] - 2 if _primes else _PRIME_START
+    while len(_primes) <= k:
+        if _is_prime(candidate):
+            _primes.append(candidate)
+        candidate -= 2
+    return _primes[k]
+
+
+def _as_rows(matrix):
+    return list(matrix.iter_rows()) if isinstance(matrix, Matrix) else matrix
+
+
+def is_integer_matrix(matrix):
+    for row in _as_rows(matrix):
+        for val in row:
+            if isinstance(val, Fraction):
+                if val.denominator != 1:
+                    return False
+            elif not isinstance(val, int):
+                return False
+    return True
+
+
+def prefer_modular(matrix):
+    """True si la matriz es entera y suficientemente grande para la vía modular."""
+    rows = _as_rows(matrix)
+    if not rows or min(len(rows), len(rows[0])) < MODULAR_THRESHOLD:
+        return False
+    return is_integer_matrix(rows)
+
+
+def _int_rows(matrix):
+    return [[int(val) for val in row] for row in _as_rows(matrix)]
+
+
+def _hadamard_bits(int_rows):
+    """log2 de la cota de Hadamard: producto de las normas euclídeas de las filas."""
+    bits = 0.0
+    for row in int_rows:
+        sq = sum(v * v for v in row)
+        if sq == 0:
+            return None
+        bits += 0.5 * math.log2(sq)
+    return bits
+
+
+def _primes_for_bits(bits):
+    """Cantidad de primos (~31 bits cada uno) cuyo producto supera 2**(bits+1)."""
+    return max(1, int(bits + 1) // 30 + 1)
+
+
+def _reduce(int_rows, p):
+    try:
+        arr = np.array(int_rows, dtype=np.int64)
+    except OverflowError:
+        arr = (np.array(int_rows, dtype=object) % p).astype(np.int64)
+    return arr % p
+
+
+def _eliminate_mod_p(arr, p):
+    """Escalona `arr` (int64, entradas en [0, p)) en su lugar.
+
+    Devuelve (rango, determinante mod p); el determinante solo tiene sentido
+    para matrices cuadradas y es 0 si el rango no es completo.
+    """
+    n_rows, n_cols = arr.shape
+    det = 1
+    r = 0
+    for c in range(n_cols):
+        if r == n_rows:
+            break
+        nz = np.flatnonzero(arr[r:, c])
+        if nz.size == 0:
+            det = 0
+            continue
+        piv = r + int(nz[0])
+        if piv != r:
+            arr[[r, piv]] = arr[[piv, r]]
+            det = -det
+        pivot = int(arr[r, c])
+        det = det * pivot % p
+        below = arr[r + 1:, c:c + 1]
+        if below.size:
+            factors = below * pow(pivot, p - 2, p) % p
+            arr[r + 1:, c:] = (arr[r + 1:, c:] - factors * arr[r, c:]) % p
+        r += 1
+    if r < n_rows or r < n_cols:
+        det = 0
+    return r, det % p
+
+
+def _det_residues(int_rows, primes):
+    """Determinante módulo cada primo, eliminando todos los primos a la vez.
+
+    La pila tiene forma (k, n, n); cada columna se procesa una sola vez para
+    todos los primos, intercambiando filas solo en los primos que lo necesiten.
+    """
+    k = len(primes)
+    n = len(int_rows)
+    p = np.array(primes, dtype=np.int64)
+    stack = np.stack([_reduce(int_rows, q) for q in primes])
+    det = np.ones(k, dtype=np.int64)
+    idx = np.arange(k)
+    p_mat = p[:, None, None]
+    for c in range(n):
+        nz = stack[:, c:, c] != 0
+        has_pivot = nz.any(axis=1)
+        det[~has_pivot] = 0
+        piv = c + nz.argmax(axis=1)
+        swap = piv != c
+        if swap.any():
+            rows_c = stack[idx, c].copy()
+            stack[idx, c] = stack[idx, piv]
+            stack[idx, piv] = rows_c
+            det = np.where(swap, (p - det) % p, det)
+        pivots = stack[:, c, c]
+        det = det * pivots % p
+        below = stack[:, c + 1:, c:c + 1]
+        if below.shape[1]:
+            inv = np.array([pow(int(v), int(q) - 2, int(q)) for v, q in zip(pivots, primes)], dtype=np.int64)
+            factors = below * inv[:, None, None] % p_mat
+            # residuos < 2**31: factor·fila < 2**62, una sola reducción basta
+            stack[:, c + 1:, c + 1:] = (stack[:, c + 1:, c + 1:] - factors * stack[:, c:c + 1, c + 1:]) % p_mat
+            stack[:, c + 1:, c] = 0
+    return [int(v) for v in det]
+
+
+def det_modular(matrix):
+    """Determinante exacto (int) de una matriz cuadrada entera."""
+    int_rows = _int_rows(matrix)
+    n = len(int_rows)
+    if n == 0:
+        return 1
+    if any(len(row) != n for row in int_rows):
+        raise ValueError("La matriz debe ser cuadrada para calcular su determinante")
+    bits = _hadamard_bits(int_rows)
+    if bits is None:
+        return 0
+    primes = [_prime(k) for k in range(_primes_for_bits(bits))]
+    value = 0
+    modulus = 1
+    for p, residue in zip(primes, _det_residues(int_rows, primes)):
+        # Garner incremental: value ≡ residue (mod p) manteniendo las congruencias previas
+        t = (residue - value) * pow(modulus % p, p - 2, p) % p
+        value += modulus * t
+        modulus *= p
+    if value > modulus // 2:
+        value -= modulus
+    return value
+
+
+def rank_modular(matrix):
+    """Rango exacto de una matriz entera."""
+    int_rows = _int_rows(matrix)
+    if not int_rows or not int_rows[0]:
+        return 0
+    full = min(len(int_rows), len(int_rows[0]))
+    # cota de cualquier menor: producto de las `full` normas de fila más grandes
+    norms = sorted((sum(v * v for v in row) for row in int_rows), reverse=True)
+    bits = sum(0.5 * math.log2(sq) for sq in norms[:full] if sq)
+    best = 0
+    for k in range(_primes_for_bits(bits)):
+        p = _prime(k)
+        rank, _ = _eliminate_mod_p(_reduce(int_rows, p), p)
+        best = max(best, rank)
+        if best == full:
+            break
+    return best
+
+
+def primes_used_for_det(matrix):
+    """Número de primos que necesitaría det_modular (para el registro de pasos)."""
+    bits = _hadamard_bits(_int_rows(matrix))
+    return 0 if bits is None else _primes_for_bits(bits)
@@ -0,0 +1,136 @@
+"""Producto exacto de matrices (enteros y Fraction).
+
+Las matrices racionales se llevan a enteros con un denominador común por
+fila (A) y por columna (B): A = Da⁻¹·A', B = B'·Db⁻¹, así que
+C[i,j] = (A'·B')[i,j] / (da[i]·db[j]) y solo se reduce una fracción por
+entrada, al final, en lugar de un mcd por cada producto parcial y suma.
+
+El producto entero se hace con NumPy (int64) si la cota k·max|A'|·max|B'|
+no desborda; si no, con enteros de Python: el producto fila-columna clásico
+por debajo del umbral y la recursión de Strassen–Winograd (7 productos y 15
+sumas de bloques por nivel) por encima. Para la recursión las dimensiones se
+rellenan con ceros hasta un múltiplo de 2^profundidad y el relleno se
+descarta al final.
+
+El umbral se puede ajustar con `bench_multiply.py`.
+"""
+
+from fractions import Fraction
+from operator import add, mul, sub
+
+import numpy as np
+
+from matrix_core import Matrix, _integer_rows
+
+# Dimensión (la menor de m, k, n) a partir de la cual se divide en bloques.
+STRASSEN_THRESHOLD = 128
+# Cota de k·max|A'|·max|B'| por debajo de la cual int64 no desborda.
+INT64_BOUND = 2 ** 63
+
+
+def _classic(a_rows, b_rows):
+    cols_b = list(zip(*b_rows))
+    return [[sum(map(mul, row, col)) for col in cols_b] for row in a_rows]
+
+
+def _add(x, y):
+    return [list(map(add, rx, ry)) for rx, ry in zip(x, y)]
+
+
+def _sub(x, y):
+    return [list(map(sub, rx, ry)) for rx, ry in zip(x, y)]
+
+
+def _split(rows):
+    h = len(rows) // 2
+    w = len(rows[0]) // 2
+    return ([r[:w] for r in rows[:h]], [r[w:] for r in rows[:h]],
+            [r[:w] for r in rows[h:]], [r[w:] for r in rows[h:]])
+
+
+def _winograd(a, b, depth):
+    if depth == 0:
+        return _classic(a, b)
+    a11, a12, a21, a22 = _split(a)
+    b11, b12, b21, b22 = _split(b)
+    s1 = _add(a21, a22); s2 = _sub(s1, a11); s3 = _sub(a11, a21); s4 = _sub(a12, s2)
+    t1 = _sub(b12, b11); t2 = _sub(b22, t1); t3 = _sub(b22, b12); t4 = _sub(t2, b21)
+    d = depth - 1
+    m1 = _winograd(a11, b11, d)
+    m2 = _winograd(a12, b21, d)
+    m3 = _winograd(s4, b22, d)
+    m4 = _winograd(a22, t4, d)
+    m5 = _winograd(s1, t1, d)
+    m6 = _winograd(s2, t2, d)
+    m7 = _winograd(s3, t3, d)
+    u2 = _add(m1, m6)
+    u3 = _add(u2, m7)
+    u4 = _add(u2, m5)
+    c11 = _add(m1, m2)
+    c12 = _add(u4, m3)
+    c21 = _sub(u3, m4)
+    c22 = _add(u3, m5)
+    return [r1 + r2 for r1, r2 in zip(c11, c12)] + [r1 + r2 for r1, r2 in zip(c21, c22)]
+
+
+def _pad(rows, n_rows, n_cols):
+    extra = n_cols - (len(rows[0]) if rows else 0)
+    padded = [list(r) + [0] * extra for r in rows]
+    padded.extend([0] * n_cols for _ in range(n_rows - len(rows)))
+    return padded
+
+
+def _max_abs(rows):
+    return max((abs(v) for row in rows for v in row), default=0)
+
+
+def _int_product(a_rows, b_rows, m, k, n, threshold):
+    """Producto de matrices de enteros de Python (listas de filas)."""
+    if _max_abs(a_rows) * _max_abs(b_rows) * k < INT64_BOUND:
+        c = np.array(a_rows, dtype=np.int64) @ np.array(b_rows, dtype=np.int64)
+        return c.tolist()
+    depth = 0
+    while min(m, k, n) >> depth > threshold:
+        depth += 1
+    if depth == 0:
+        return _classic(a_rows, b_rows)
+    block = 1 << depth
+    pm, pk, pn = (-(-d // block) * block for d in (m, k, n))
+    c = _winograd(_pad(a_rows, pm, pk), _pad(b_rows, pk, pn), depth)
+    return [row[:n] for row in c[:m]]
+
+
+def multiply_rows(a_rows, b_rows, threshold=None):
+    """Producto de dos matrices dadas como listas de filas; devuelve filas.
+
+    Con entradas enteras el resultado es entero; si alguna es Fraction (o
+    float, que se convierte de forma exacta), todas son Fraction.
+    """
+    m = len(a_rows)
+    k = len(a_rows[0]) if m else 0
+    if k != len(b_rows):
+        raise ValueError("Dimensiones incompatibles para multiplicación")
+    n = len(b_rows[0]) if b_rows else 0
+    if m == 0 or n == 0 or k == 0:
+        return [[0] * n for _ in range(m)]
+    if threshold is None:
+        threshold = STRASSEN_THRESHOLD
+    if all(type(v) is int for rows in (a_rows, b_rows) for row in rows for v in row):
+        return _int_product(a_rows, b_rows, m, k, n, threshold)
+    a_int, da = _integer_rows(a_rows)
+    bt_int, db = _integer_rows(list(zip(*b_rows)))
+    c = _int_product(a_int, [list(col) for col in zip(*bt_int)], m, k, n, threshold)
+    return [[Fraction(v, di * dj) for v, dj in zip(row, db)] for row, di in zip(c, da)]
+
+
+def multiply_vector(rows, v):
+    """Producto matriz-vector (listas) por el mismo camino entero."""
+    return [row[0] for row in multiply_rows(rows, [[x] for x in v])]
+
+
+def multiply(A: Matrix, B: Matrix, threshold=None) -> Matrix:
+    """A·B exacto; elige el núcleo entero según el tamaño de las entradas."""
+    if A.cols != B.rows:
+        raise ValueError("Dimensiones incompatibles para multiplicación")
+    rows = multiply_rows(A.data, B.data, threshold)
+    return Matrix.from_rows(rows, B.cols)
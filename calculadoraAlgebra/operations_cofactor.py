@@ -1,33 +1,71 @@
-from matrix_core import Matrix, fraction_to_str, format_matrix_lines
-from operations_determinant import determinant_with_log
+from matrix_core import Matrix, _adjugate_exact
+from operations_determinant import determinant_steps, determinant_with_log
+from step_log import StepLog, collect, resolve_level, vector_str, TEXT, FORMAT, MATRIX, NESTED, RESULT, FULL
 
-def cofactor_matrix(matA: Matrix):
+# Tamaño máximo para el desarrollo por menores paso a paso (n² determinantes).
+STEPS_MAX_SIZE = 6
+
+def _cofactors_by_adjugate(matA: Matrix) -> Matrix:
+    return Matrix(_adjugate_exact(matA)).transpose()
+
+def cofactor_steps(matA: Matrix, steps: bool = False, level=FULL):
+    """Generador de registros de pasos; su valor de retorno es la matriz de cofactores.
+
+    Con SUMMARY el desarrollo por menores se resume en una línea por fila.
+    """
     if matA.rows != matA.cols:
         raise ValueError("La matriz debe ser cuadrada para cofactores")
     n = matA.rows
-    log = [
-        "Paso 1: Confirmar matriz cuadrada para calcular cofactores",
-        "Paso 2: Registrar matriz original A",
-        *format_matrix_lines(matA),
-    ]
+    yield (TEXT, "Paso 1: Confirmar matriz cuadrada para calcular cofactores")
+    yield (TEXT, "Paso 2: Registrar matriz original A")
+    yield (MATRIX, matA.copy(), "")
+    if not steps or n > STEPS_MAX_SIZE:
+        if steps:
+            yield (TEXT, f"Matriz mayor que {STEPS_MAX_SIZE}×{STEPS_MAX_SIZE}: se omite el desarrollo por menores")
+        yield (TEXT, "Paso 3: Calcular la adjunta adj(A) con una sola eliminación exacta")
+        yield (TEXT, "    Si det(A) ≠ 0: adj(A) = det(A)·A⁻¹; si rango(A) = n-1: adj(A) = c·v·wᵀ (núcleos); si no, adj(A) = 0")
+        result_matrix = _cofactors_by_adjugate(matA)
+        yield (TEXT, "Paso final: Matriz de cofactores C = adj(A)ᵀ =")
+        yield (MATRIX, result_matrix, "")
+        return result_matrix
     cofact = []
     for i in range(n):
         row = []
+        if level < FULL:
+            for j in range(n):
+                sub = [[matA[r, c] for c in range(n) if c != j] for r in range(n) if r != i]
+                det_sub, _ = determinant_with_log(sub, log=False)
+                row.append((-1) ** (i + j) * det_sub)
+            yield (TEXT, f"Paso 3.{i+1}: Cofactores de la fila {i+1}: C[{i+1},j] = (-1)^({i+1}+j)·|M[{i+1},j]| = {vector_str(row)}")
+            cofact.append(row)
+            continue
         for j in range(n):
-            log.append(f"Paso 3.{i+1}.{j+1}: Construir menor eliminando fila {i+1} y columna {j+1}")
+            yield (FORMAT, "Paso 3.{}.{}: Construir menor eliminando fila {} y columna {}", i + 1, j + 1, i + 1, j + 1)
             sub = [[matA[r, c] for c in range(n) if c != j] for r in range(n) if r != i]
-            log.extend(f"    {line}" for line in format_matrix_lines(sub))
-            det_sub, det_log = determinant_with_log(sub)
-            log.append(f"    Resultado del determinante del menor:")
-            log.extend(f"      {line}" for line in det_log)
+            yield (MATRIX, sub, "    ")
+            det_sub, det_log = collect(determinant_steps(sub))
+            yield (TEXT, "    Resultado del determinante del menor:")
+            yield (NESTED, det_log.records, "      ")
             sign = (-1) ** (i + j)
             cof = sign * det_sub
             row.append(cof)
-            log.append(
-                f"    Cofactor C[{i+1},{j+1}] = (-1)^({i+1}+{j+1}) × {fraction_to_str(det_sub)} = {fraction_to_str(cof)}"
-            )
+            yield (FORMAT, "    Cofactor C[{},{}] = (-1)^({}+{}) × {} = {}", i + 1, j + 1, i + 1, j + 1, det_sub, cof)
         cofact.append(row)
     result_matrix = Matrix(cofact)
-    log.append("Paso final: Matriz de cofactores C =")
-    log.extend(format_matrix_lines(result_matrix))
-    return result_matrix, log
+    yield (TEXT, "Paso final: Matriz de cofactores C =")
+    yield (MATRIX, result_matrix, "")
+    return result_matrix
+
+def cofactor_matrix(matA: Matrix, steps: bool = False, log: bool = True, level=None):
+    """Devuelve (matriz_cofactores, log).
+
+    Por defecto C = adj(A)ᵀ sale de una sola eliminación exacta; con
+    steps=True (y n ≤ STEPS_MAX_SIZE) se registra el desarrollo de cada menor.
+    Con log=False o level=RESULT no se generan registros.
+    """
+    level = resolve_level(log, level)
+    if level != RESULT:
+        return collect(cofactor_steps(matA, steps, level))
+    if matA.rows != matA.cols:
+        raise ValueError("La matriz debe ser cuadrada para cofactores")
+    return _cofactors_by_adjugate(matA), StepLog()
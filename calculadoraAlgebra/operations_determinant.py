@@ -1,12 +1,19 @@
 from fractions import Fraction
-from matrix_core import _determinant_step, _determinant_sarrus, fraction_to_str, Matrix, format_matrix_lines
+import matrix_modular
+from matrix_core import _determinant_bareiss, _determinant_sarrus, Matrix
+from step_log import StepLog, collect, resolve_level, TEXT, FORMAT, MATRIX, SARRUS, RESULT, FULL
 
-def determinant_with_log(matrix):
+def determinant_steps(matrix, level=FULL):
+    """Generador de registros de pasos; su valor de retorno es el determinante.
+
+    Con SUMMARY se omiten los productos de cada diagonal de Sarrus.
+    """
     data = matrix.data if isinstance(matrix, Matrix) else matrix
     n = len(data)
-    log = ["Paso 1: Registrar matriz para determinar |A|", *format_matrix_lines(data)]
+    yield (TEXT, "Paso 1: Registrar matriz para determinar |A|")
+    yield (MATRIX, data, "")
     if n == 3:
-        log.append("Paso 2: Aplicar regla de Sarrus")
+        yield (TEXT, "Paso 2: Aplicar regla de Sarrus")
         main_positions = [
             ((0, 0), (1, 1), (2, 2)),
             ((0, 1), (1, 2), (2, 0)),
@@ -16,38 +23,48 @@ def determinant_with_log(matrix):
         for idx, positions in enumerate(main_positions, start=1):
             vals = [data[r][c] for r, c in positions]
             prod = vals[0] * vals[1] * vals[2]
-            indices_txt = " × ".join(f"A[{r+1},{c+1}]" for r, c in positions)
-            values_txt = " × ".join(fraction_to_str(v) for v in vals)
-            log.append(
-                f"  Paso 2.{idx}: {indices_txt} = {values_txt} = {fraction_to_str(prod)}"
-            )
+            if level == FULL:
+                yield (SARRUS, 2, idx, positions, vals, prod)
             main_sum += prod
-        log.append(f"  Suma diagonales principales = {fraction_to_str(main_sum)}")
+        yield (FORMAT, "  Suma diagonales principales = {}", main_sum)
         secondary_positions = [
             ((0, 2), (1, 1), (2, 0)),
             ((0, 0), (1, 2), (2, 1)),
             ((0, 1), (1, 0), (2, 2)),
         ]
         secondary_sum = Fraction(0)
-        log.append("Paso 3: Restar diagonales secundarias")
+        yield (TEXT, "Paso 3: Restar diagonales secundarias")
         for idx, positions in enumerate(secondary_positions, start=1):
             vals = [data[r][c] for r, c in positions]
             prod = vals[0] * vals[1] * vals[2]
-            indices_txt = " × ".join(f"A[{r+1},{c+1}]" for r, c in positions)
-            values_txt = " × ".join(fraction_to_str(v) for v in vals)
-            log.append(
-                f"  Paso 3.{idx}: {indices_txt} = {values_txt} = {fraction_to_str(prod)}"
-            )
+            if level == FULL:
+                yield (SARRUS, 3, idx, positions, vals, prod)
             secondary_sum += prod
-        log.append(f"  Suma diagonales secundarias = {fraction_to_str(secondary_sum)}")
+        yield (FORMAT, "  Suma diagonales secundarias = {}", secondary_sum)
         det = main_sum - secondary_sum
-        log.append(
-            f"Paso 4: Determinante = {fraction_to_str(main_sum)} - {fraction_to_str(secondary_sum)} = {fraction_to_str(det)}"
-        )
+        yield (FORMAT, "Paso 4: Determinante = {} - {} = {}", main_sum, secondary_sum, det)
+    elif matrix_modular.prefer_modular(data):
+        k = matrix_modular.primes_used_for_det(data)
+        yield (TEXT, f"Paso 2: Matriz entera grande: eliminar módulo {k} primo(s) y reconstruir con el Teorema Chino del Resto")
+        det = Fraction(matrix_modular.det_modular(data))
+        yield (FORMAT, "Paso 3: Determinante calculado = {}", det)
+    else:
+        yield (TEXT, "Paso 2: Aplicar eliminación libre de fracciones (Bareiss) con aritmética entera exacta")
+        det = _determinant_bareiss(data)
+        yield (FORMAT, "Paso 3: Determinante calculado = {}", det)
+    yield (TEXT, "Paso final: Representar determinante como matriz 1×1")
+    yield (MATRIX, [[det]], "")
+    return det
+
+def determinant_with_log(matrix, log: bool = True, level=None):
+    level = resolve_level(log, level)
+    if level != RESULT:
+        return collect(determinant_steps(matrix, level))
+    data = matrix.data if isinstance(matrix, Matrix) else matrix
+    if len(data) == 3:
+        det = Fraction(_determinant_sarrus(data))
+    elif matrix_modular.prefer_modular(data):
+        det = Fraction(matrix_modular.det_modular(data))
     else:
-        log.append("Paso 2: Aplicar eliminación por filas (Gauss) para obtener determinante")
-        det = _determinant_step(data)
-        log.append(f"Paso 3: Determinante calculado = {fraction_to_str(det)}")
-    log.append("Paso final: Representar determinante como matriz 1×1")
-    log.extend(format_matrix_lines([[det]]))
-    return det, log
+        det = _determinant_bareiss(data)
+    return det, StepLog()
@@ -1,15 +1,23 @@
 from fractions import Fraction
-from matrix_core import Matrix
+from matrix_core import Matrix, LUFactorization
 
 def gauss_jordan_solve(matrix):
     """Recibe matriz aumentada (list of lists of Fraction). Devuelve (status, result_or_log)
     status: 'unique', 'infinite', 'inconsistent'
     result_or_log: if unique -> solution list; if others -> log lines list
     """
-    mat = [row[:] for row in matrix]
+    if isinstance(matrix, Matrix):
+        mat = list(matrix.iter_rows())
+    else:
+        mat = [list(row) for row in matrix]
     rows = len(mat)
     cols = len(mat[0])
     n_vars = cols - 1
+    if rows == n_vars:
+        # sistema cuadrado: con A invertible basta la factorización LU
+        lu = LUFactorization([row[:n_vars] for row in mat])
+        if lu.is_invertible():
+            return 'unique', lu.solve([row[-1] for row in mat])
     pivot_cols = []
     log = []
     # eliminación
@@ -27,16 +35,17 @@ def gauss_jordan_solve(matrix):
             mat[r], mat[piv] = mat[piv], mat[r]
             log.append(f"Intercambiar fila {r+1} con {piv+1}")
         # normalizar
-        pivot = mat[r][c]
-        for j in range(c, cols):
-            mat[r][j] = mat[r][j] / pivot
+        pivot_row = mat[r]
+        pivot = pivot_row[c]
+        pivot_row = pivot_row[:c] + [val / pivot for val in pivot_row[c:]]
+        mat[r] = pivot_row
         log.append(f"Dividir fila {r+1} por {pivot}")
         # eliminar
-        for i in range(rows):
-            if i!=r and mat[i][c] != 0:
-                factor = mat[i][c]
-                for j in range(c, cols):
-                    mat[i][j] -= factor * mat[r][j]
+        tail = pivot_row[c:]
+        for i, row_i in enumerate(mat):
+            if i!=r and row_i[c] != 0:
+                factor = row_i[c]
+                mat[i] = row_i[:c] + [a - factor * p for a, p in zip(row_i[c:], tail)]
                 log.append(f"R{i+1} = R{i+1} - {factor} * R{r+1}")
         pivot_cols.append(c)
         r += 1
@@ -44,8 +53,8 @@ def gauss_jordan_solve(matrix):
             break
 
     # comprobar inconsistencia
-    for i in range(rows):
-        if all(mat[i][j]==0 for j in range(n_vars)) and mat[i][-1] != 0:
+    for row_i in mat:
+        if row_i[-1] != 0 and all(val==0 for val in row_i[:n_vars]):
             log.append("Sistema inconsistente")
             return 'inconsistent', log
 
@@ -55,5 +64,5 @@ def gauss_jordan_solve(matrix):
         return 'infinite', log
 
     # solución única
-    sol = [mat[i][-1] for i in range(n_vars)]
+    sol = [row_i[-1] for row_i in mat[:n_vars]]
     return 'unique', sol
@@ -1,35 +1,34 @@
-from matrix_core import Matrix, fraction_to_str, format_matrix_lines
+from matrix_core import Matrix
+from matrix_multiply import multiply, multiply_rows
+from step_log import StepLog, collect, resolve_level, TEXT, MATRIX, MUL_CELL, MUL_ROW, RESULT, FULL
 
-def multiply_matrices(matA: Matrix, matB: Matrix):
+def multiply_steps(matA: Matrix, matB: Matrix, level=FULL):
+    """Un registro por entrada C[i,j] (por fila con SUMMARY); los productos
+    parciales se listan al formatear."""
     rowsA, colsA = matA.shape
     rowsB, colsB = matB.shape
     if colsA != rowsB:
         raise ValueError("Dimensiones incompatibles para multiplicación")
-    log = [
-        f"Paso 1: Verificar dimensiones A({rowsA}×{colsA}) y B({rowsB}×{colsB}) → columnas de A igual a filas de B",
-        "Paso 2: Calcular cada entrada C[i,j] como producto fila-columna",
-    ]
-    result = []
-    for i in range(rowsA):
-        row = []
-        for j in range(colsB):
-            partial_products = []
-            for k in range(colsA):
-                a_val = matA[i, k]
-                b_val = matB[k, j]
-                prod = a_val * b_val
-                partial_products.append(prod)
-                log.append(
-                    f"  Paso 2.{i+1}.{j+1}.{k+1}: A[{i+1},{k+1}] × B[{k+1},{j+1}] = {fraction_to_str(a_val)} × {fraction_to_str(b_val)} = {fraction_to_str(prod)}"
-                )
-            cell_value = sum(partial_products)
-            terms = " + ".join(fraction_to_str(val) for val in partial_products)
-            log.append(
-                f"  Paso 2.{i+1}.{j+1}: C[{i+1},{j+1}] = {terms} = {fraction_to_str(cell_value)}"
-            )
-            row.append(cell_value)
-        result.append(row)
-    res_matrix = Matrix(result)
-    log.append("Paso final: Matriz resultado C =")
-    log.extend(format_matrix_lines(res_matrix))
-    return res_matrix, log
+    yield (TEXT, f"Paso 1: Verificar dimensiones A({rowsA}×{colsA}) y B({rowsB}×{colsB}) → columnas de A igual a filas de B")
+    yield (TEXT, "Paso 2: Calcular cada entrada C[i,j] como producto fila-columna")
+    # el producto sale del motor exacto; los productos parciales solo se
+    # calculan si se formatea el paso a paso
+    rows_c = multiply_rows(matA.data, matB.data)
+    if level < FULL:
+        for i, row_c in enumerate(rows_c):
+            yield (MUL_ROW, i, row_c)
+    else:
+        cols_b = list(matB.iter_cols())
+        for i, (row_a, row_c) in enumerate(zip(matA.iter_rows(), rows_c)):
+            for j, col_b in enumerate(cols_b):
+                yield (MUL_CELL, i, j, row_a, col_b, row_c[j])
+    res_matrix = Matrix.from_rows(rows_c, colsB)
+    yield (TEXT, "Paso final: Matriz resultado C =")
+    yield (MATRIX, res_matrix, "")
+    return res_matrix
+
+def multiply_matrices(matA: Matrix, matB: Matrix, log: bool = True, level=None):
+    level = resolve_level(log, level)
+    if level != RESULT:
+        return collect(multiply_steps(matA, matB, level))
+    return multiply(matA, matB), StepLog()
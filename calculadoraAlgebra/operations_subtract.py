@@ -1,26 +1,34 @@
-from matrix_core import Matrix, fraction_to_str, format_matrix_lines
+from matrix_core import Matrix
+from step_log import StepLog, collect, resolve_level, TEXT, MATRIX, SUB_CELL, SUB_ROW, RESULT, FULL
 
-def subtract_matrices(matA: Matrix, matB: Matrix):
+def subtract_steps(matA: Matrix, matB: Matrix, level=FULL):
     if matA.shape != matB.shape:
         raise ValueError("Dimensiones no coinciden")
     rows, cols = matA.shape
-    result = []
-    log = [
-        f"Paso 1: Verificar dimensiones compatibles A({rows}×{cols}) y B({rows}×{cols})",
-        "Paso 2: Restar elemento a elemento",
-    ]
-    for i in range(rows):
-        row = []
-        for j in range(cols):
-            a_val = matA[i, j]
-            b_val = matB[i, j]
+    yield (TEXT, f"Paso 1: Verificar dimensiones compatibles A({rows}×{cols}) y B({rows}×{cols})")
+    yield (TEXT, "Paso 2: Restar elemento a elemento")
+    buf = []
+    for i, (row_a, row_b) in enumerate(zip(matA.iter_rows(), matB.iter_rows())):
+        if level < FULL:
+            row_c = [a_val - b_val for a_val, b_val in zip(row_a, row_b)]
+            buf.extend(row_c)
+            yield (SUB_ROW, i, row_a, row_b, row_c)
+            continue
+        for j, (a_val, b_val) in enumerate(zip(row_a, row_b)):
             d = a_val - b_val
-            row.append(d)
-            log.append(
-                f"  Paso 2.{i+1}.{j+1}: C[{i+1},{j+1}] = {fraction_to_str(a_val)} - {fraction_to_str(b_val)} = {fraction_to_str(d)}"
-            )
-        result.append(row)
-    res_matrix = Matrix(result)
-    log.append("Paso final: Matriz resultado C =")
-    log.extend(format_matrix_lines(res_matrix))
-    return res_matrix, log
+            buf.append(d)
+            yield (SUB_CELL, i, j, a_val, b_val, d)
+    res_matrix = Matrix.from_flat(rows, cols, buf)
+    yield (TEXT, "Paso final: Matriz resultado C =")
+    yield (MATRIX, res_matrix, "")
+    return res_matrix
+
+def subtract_matrices(matA: Matrix, matB: Matrix, log: bool = True, level=None):
+    level = resolve_level(log, level)
+    if level != RESULT:
+        return collect(subtract_steps(matA, matB, level))
+    if matA.shape != matB.shape:
+        raise ValueError("Dimensiones no coinciden")
+    rows, cols = matA.shape
+    buf = [a - b for a, b in zip(matA.flat, matB.flat)]
+    return Matrix.from_flat(rows, cols, buf), StepLog()
@@ -1,27 +1,40 @@
-from matrix_core import Matrix, fraction_to_str, format_matrix_lines
+from matrix_core import Matrix
+from step_log import StepLog, collect, resolve_level, TEXT, MATRIX, ADD_CELL, ADD_ROW, RESULT, FULL
 
-def add_matrices(matA: Matrix, matB: Matrix):
-    """Devuelve (result_matrix, log_lines) donde log_lines es lista de strings."""
+def add_steps(matA: Matrix, matB: Matrix, level=FULL):
+    """Generador de registros de pasos; su valor de retorno es la matriz suma."""
     if matA.shape != matB.shape:
         raise ValueError("Dimensiones no coinciden")
     rows, cols = matA.shape
-    result = []
-    log = [
-        f"Paso 1: Verificar dimensiones compatibles A({rows}×{cols}) y B({rows}×{cols})",
-        "Paso 2: Sumar elemento a elemento",
-    ]
-    for i in range(rows):
-        row = []
-        for j in range(cols):
-            a_val = matA[i, j]
-            b_val = matB[i, j]
+    yield (TEXT, f"Paso 1: Verificar dimensiones compatibles A({rows}×{cols}) y B({rows}×{cols})")
+    yield (TEXT, "Paso 2: Sumar elemento a elemento")
+    buf = []
+    for i, (row_a, row_b) in enumerate(zip(matA.iter_rows(), matB.iter_rows())):
+        if level < FULL:
+            row_c = [a_val + b_val for a_val, b_val in zip(row_a, row_b)]
+            buf.extend(row_c)
+            yield (ADD_ROW, i, row_a, row_b, row_c)
+            continue
+        for j, (a_val, b_val) in enumerate(zip(row_a, row_b)):
             s = a_val + b_val
-            row.append(s)
-            log.append(
-                f"  Paso 2.{i+1}.{j+1}: C[{i+1},{j+1}] = {fraction_to_str(a_val)} + {fraction_to_str(b_val)} = {fraction_to_str(s)}"
-            )
-        result.append(row)
-    res_matrix = Matrix(result)
-    log.append("Paso final: Matriz resultado C =")
-    log.extend(format_matrix_lines(res_matrix))
-    return res_matrix, log
+            buf.append(s)
+            yield (ADD_CELL, i, j, a_val, b_val, s)
+    res_matrix = Matrix.from_flat(rows, cols, buf)
+    yield (TEXT, "Paso final: Matriz resultado C =")
+    yield (MATRIX, res_matrix, "")
+    return res_matrix
+
+def add_matrices(matA: Matrix, matB: Matrix, log: bool = True, level=None):
+    """Devuelve (result_matrix, log) donde log es un StepLog iterable de strings.
+
+    `level` es el nivel de detalle (step_log.RESULT, SUMMARY o FULL); con
+    log=False o RESULT no se generan registros.
+    """
+    level = resolve_level(log, level)
+    if level != RESULT:
+        return collect(add_steps(matA, matB, level))
+    if matA.shape != matB.shape:
+        raise ValueError("Dimensiones no coinciden")
+    rows, cols = matA.shape
+    buf = [a + b for a, b in zip(matA.flat, matB.flat)]
+    return Matrix.from_flat(rows, cols, buf), StepLog()
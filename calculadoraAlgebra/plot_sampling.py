@@ -0,0 +1,235 @@
+"""Muestreo adaptativo de f(x) para las gráficas.
+
+Se parte de una malla uniforme gruesa y se subdividen solo los intervalos
+donde la curva se aparta de la recta entre vecinos (curvatura), hay cambio
+de signo, un salto grande o una frontera entre valores finitos y no finitos
+(asíntotas, bordes de dominio). Cada ronda evalúa todos los puntos medios
+nuevos en una sola llamada vectorizada, sin superar el presupuesto de puntos.
+"""
+
+import numpy as np
+
+from math_utils import evaluate_function, evaluate_function_vectorized
+
+DEFAULT_MAX_POINTS = 4000
+INITIAL_POINTS = 257
+MAX_ROUNDS = 12
+# Tolerancia de curvatura relativa a la altura visible de la curva.
+CURVATURE_TOL = 1e-3
+# Un salto mayor que esta fracción de la altura se considera brusco.
+JUMP_FRACTION = 0.05
+
+
+def _evaluate(xs, func_str):
+    try:
+        ys = evaluate_function_vectorized(xs, func_str)
+        ys = np.broadcast_to(ys, xs.shape).astype(float)
+    except ValueError as err:
+        # expresiones que NumPy no acepta: evaluar punto a punto
+        ys = np.empty_like(xs)
+        ok = False
+        for idx, x in enumerate(xs):
+            try:
+                ys[idx] = evaluate_function(float(x), func_str)
+                ok = True
+            except ValueError:
+                ys[idx] = np.nan
+        if not ok:
+            raise err
+    return np.where(np.isfinite(ys), ys, np.nan)
+
+
+def _interval_scores(xs, ys, y_scale, pixel_width):
+    """Puntuación de refinamiento para cada intervalo [xs[i], xs[i+1]]."""
+    finite = np.isfinite(ys)
+    y0 = np.where(finite, ys, 0.0)
+    n_int = len(xs) - 1
+    scores = np.zeros(n_int)
+
+    # desviación del punto central respecto a la recta entre sus vecinos
+    if len(xs) >= 3:
+        x_l, x_c, x_r = xs[:-2], xs[1:-1], xs[2:]
+        y_l, y_c, y_r = y0[:-2], y0[1:-1], y0[2:]
+        t = (x_c - x_l) / (x_r - x_l)
+        dev = np.abs(y_c - (y_l + t * (y_r - y_l))) / y_scale
+        dev = np.where(finite[:-2] & finite[1:-1] & finite[2:], dev, 0.0)
+        scores[:-1] = np.maximum(scores[:-1], dev)
+        scores[1:] = np.maximum(scores[1:], dev)
+
+    both = finite[:-1] & finite[1:]
+    jump = np.where(both, np.abs(np.diff(y0)) / y_scale, 0.0)
+    scores = np.maximum(scores, np.where(jump > JUMP_FRACTION, jump, 0.0))
+    # los cruces por cero se afinan hasta el ancho de un "píxel"; los bordes
+    # del dominio y las asíntotas hasta agotar las rondas
+    sign_change = both & (np.sign(y0[:-1]) * np.sign(y0[1:]) < 0) & (np.diff(xs) > pixel_width)
+    edge = finite[:-1] != finite[1:]
+    scores[sign_change | edge] = np.inf
+    return scores
+
+
+def adaptive_sample(func_str, x_min, x_max, max_points=DEFAULT_MAX_POINTS, initial_points=INITIAL_POINTS):
+    """Devuelve (xs, ys) ordenados con a lo sumo max_points muestras.
+
+    Los valores no finitos se devuelven como NaN para que matplotlib corte
+    la línea en ellos.
+    """
+    x_min, x_max = float(x_min), float(x_max)
+    n0 = max(3, min(int(initial_points), int(max_points)))
+    xs = np.linspace(x_min, x_max, n0)
+    ys = _evaluate(xs, func_str)
+    min_width = (x_max - x_min) * 1e-9
+    for _ in range(MAX_ROUNDS):
+        budget = int(max_points) - len(xs)
+        if budget <= 0:
+            break
+        finite_ys = ys[np.isfinite(ys)]
+        if finite_ys.size:
+            low, high = np.percentile(finite_ys, [5, 95])
+            y_scale = max(high - low, 1e-12)
+        else:
+            y_scale = 1.0
+        scores = _interval_scores(xs, ys, y_scale, (x_max - x_min) / max_points)
+        scores[np.diff(xs) <= min_width] = 0.0
+        candidates = np.flatnonzero(scores > CURVATURE_TOL)
+        if candidates.size == 0:
+            break
+        if candidates.size > budget:
+            # priorizar los intervalos con mayor puntuación
+            order = np.argsort(scores[candidates])[::-1]
+            candidates = np.sort(candidates[order[:budget]])
+        mids = 0.5 * (xs[candidates] + xs[candidates + 1])
+        new_ys = _evaluate(mids, func_str)
+        xs = np.insert(xs, candidates + 1, mids)
+        ys = np.insert(ys, candidates + 1, new_ys)
+    return xs, ys
+
+
+# Pasos del optimizador local con que se afina cada extremo y cada inflexión.
+REFINE_STEPS = 6
+INFLECTION_STEPS = 24
+_GOLDEN = 0.3819660112501051
+
+
+def _slopes(xs, ys):
+    """Pendientes de cada intervalo y máscara de intervalos utilizables.
+
+    Se descartan los intervalos con algún extremo no finito y los saltos que
+    cruzan el eje con una amplitud mayor que la altura visible (asíntotas).
+    """
+    finite = np.isfinite(ys)
+    y0 = np.where(finite, ys, 0.0)
+    dy = np.diff(y0)
+    pair_ok = finite[:-1] & finite[1:]
+    if finite.any():
+        low, high = np.percentile(y0[finite], [5, 95])
+        y_scale = max(high - low, 1e-12)
+        pair_ok &= ~((np.sign(y0[:-1]) * np.sign(y0[1:]) < 0) & (np.abs(dy) > y_scale))
+    with np.errstate(all='ignore'):
+        slopes = dy / np.diff(xs)
+    return slopes, pair_ok
+
+
+def _refine_extrema(lo, mid, hi, g_mid, func_str, orient, steps):
+    """Interpolación parabólica sucesiva, vectorizada sobre todos los candidatos.
+
+    Minimiza g = orient·f dentro de cada terna lo < mid < hi con g(mid) mínimo;
+    si la parábola degenera se usa el punto áureo del subintervalo mayor.
+    """
+    g_lo = orient * _evaluate(lo, func_str)
+    g_hi = orient * _evaluate(hi, func_str)
+    for _ in range(steps):
+        with np.errstate(all='ignore'):
+            p = (mid - lo) ** 2 * (g_mid - g_hi) - (mid - hi) ** 2 * (g_mid - g_lo)
+            q = (mid - lo) * (g_mid - g_hi) - (mid - hi) * (g_mid - g_lo)
+            v = mid - 0.5 * p / q
+        golden = np.where(hi - mid > mid - lo, mid + _GOLDEN * (hi - mid), mid - _GOLDEN * (mid - lo))
+        bad = ~np.isfinite(v) | (v <= lo) | (v >= hi) | (v == mid)
+        v = np.where(bad, golden, v)
+        g_v = orient * _evaluate(v, func_str)
+        better = np.isfinite(g_v) & (g_v < g_mid)
+        left = v < mid
+        # con v mejor, mid pasa a ser extremo del intervalo; si no, v lo acota
+        new_lo = np.where(better, np.where(left, lo, mid), np.where(left, v, lo))
+        new_hi = np.where(better, np.where(left, mid, hi), np.where(left, hi, v))
+        new_g_lo = np.where(better, np.where(left, g_lo, g_mid), np.where(left, g_v, g_lo))
+        new_g_hi = np.where(better, np.where(left, g_mid, g_hi), np.where(left, g_hi, g_v))
+        mid = np.where(better, v, mid)
+        g_mid = np.where(better, g_v, g_mid)
+        lo, hi, g_lo, g_hi = new_lo, new_hi, new_g_lo, new_g_hi
+    return mid, orient * g_mid
+
+
+def find_extrema(xs, ys, func_str=None, steps=REFINE_STEPS):
+    """Máximos y mínimos locales ("Vértices") de la curva muestreada.
+
+    Un punto interior es candidato si la pendiente cambia de signo entre sus
+    dos intervalos (ambos con extremos finitos), así que los tramos separados
+    por NaN no se mezclan. Devuelve (x_gruesos, y_gruesos, x_afinados,
+    y_afinados); sin func_str los afinados son los gruesos.
+    """
+    xs = np.asarray(xs, dtype=float)
+    ys = np.asarray(ys, dtype=float)
+    if xs.size < 3:
+        empty = np.array([])
+        return empty, empty, empty, empty
+    slopes, pair_ok = _slopes(xs, ys)
+    s0, s1 = slopes[:-1], slopes[1:]
+    ok = pair_ok[:-1] & pair_ok[1:]
+    is_max = ok & (s0 > 0) & (s1 <= 0)
+    is_min = ok & (s0 < 0) & (s1 >= 0)
+    idx = np.flatnonzero(is_max | is_min) + 1
+    coarse_x, coarse_y = xs[idx], ys[idx]
+    if func_str is None or idx.size == 0:
+        return coarse_x, coarse_y, coarse_x.copy(), coarse_y.copy()
+    orient = np.where(is_max[idx - 1], -1.0, 1.0)
+    ref_x, ref_y = _refine_extrema(xs[idx - 1], coarse_x.copy(), xs[idx + 1], orient * coarse_y, func_str, orient, steps)
+    return coarse_x, coarse_y, ref_x, ref_y
+
+
+def find_inflections(xs, ys, func_str=None, steps=INFLECTION_STEPS):
+    """Puntos de inflexión: cambios de signo de la curvatura discreta.
+
+    Los candidatos se afinan con bisección sobre el signo de la segunda
+    diferencia centrada de f. Devuelve (x_gruesos, y_gruesos, x_afinados,
+    y_afinados).
+    """
+    xs = np.asarray(xs, dtype=float)
+    ys = np.asarray(ys, dtype=float)
+    empty = np.array([])
+    if xs.size < 4:
+        return empty, empty, empty, empty
+    slopes, pair_ok = _slopes(xs, ys)
+    with np.errstate(all='ignore'):
+        curv = np.diff(slopes) / (0.5 * (xs[2:] - xs[:-2]))
+    curv_ok = pair_ok[:-1] & pair_ok[1:] & np.isfinite(curv)
+    finite = np.isfinite(ys)
+    if not curv_ok.any():
+        return empty, empty, empty, empty
+    # curvatura mínima significativa: una fracción de altura visible / ancho²
+    low, high = np.percentile(ys[finite], [5, 95])
+    tiny = 1e-9 * max(high - low, 1e-12) / (xs[-1] - xs[0]) ** 2
+    sig = np.flatnonzero(curv_ok & (np.abs(curv) > tiny))
+    if sig.size < 2:
+        return empty, empty, empty, empty
+    # cambios de signo entre curvaturas significativas consecutivas de un mismo tramo
+    breaks = np.concatenate(([0], np.cumsum(~curv_ok)))
+    p, q = sig[:-1], sig[1:]
+    change = (np.sign(curv[p]) != np.sign(curv[q])) & (breaks[q + 1] == breaks[p])
+    p, q = p[change], q[change]
+    # curv[k] corresponde a xs[k+1]
+    lo, hi = xs[p + 1], xs[q + 1]
+    coarse_x = 0.5 * (lo + hi)
+    coarse_y = 0.5 * (ys[p + 1] + ys[q + 1])
+    if func_str is None or p.size == 0:
+        return coarse_x, coarse_y, coarse_x.copy(), coarse_y.copy()
+    sign_lo = np.sign(curv[p])
+    h = (hi - lo) / 8.0
+    for _ in range(steps):
+        mid = 0.5 * (lo + hi)
+        second = _evaluate(mid - h, func_str) - 2.0 * _evaluate(mid, func_str) + _evaluate(mid + h, func_str)
+        same = np.sign(second) == sign_lo
+        lo = np.where(same, mid, lo)
+        hi = np.where(same, hi, mid)
+    ref_x = 0.5 * (lo + hi)
+    ref_y = _evaluate(ref_x, func_str)
+    return coarse_x, coarse_y, ref_x, np.where(np.isfinite(ref_y), ref_y, coarse_y)
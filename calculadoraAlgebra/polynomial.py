@@ -0,0 +1,281 @@
+"""Polinomios reconocidos en la expresión de entrada.
+
+`from_source` recorre el AST ya validado por math_utils y, si la expresión
+solo usa x, constantes, +, -, *, división por constantes y potencias enteras
+no negativas, la reduce a sus coeficientes. Con ellos:
+
+- `horner` evalúa con n multiplicaciones y sumas (escalar, arreglo NumPy,
+  complejo o Jet de autodiff), sin potencias ni llamadas. Solo conviene si la
+  expresión ya está expandida (`is_expanded`): desarrollar (x-2)^7 en
+  coeficientes cancela cifras cerca de la raíz múltiple;
+- `roots` da todas las raíces, complejas incluidas, como autovalores de la
+  matriz compañera, agrupa las que forman una raíz múltiple y las pule con
+  unos pasos de Newton sobre la derivada de orden m-1 (donde la raíz de
+  multiplicidad m es simple).
+
+Con coeficientes redondeados, una raíz de multiplicidad m se abre en m
+autovalores a distancia ≈ (eps·S/|a|)^(1/m), con S = Σ|c_i|·|x|^i y
+a = p^(m)(x)/m!; ese es el radio de agrupación. Cada raíz pulida se
+comprueba: p, p', …, p^(m-1) deben anularse dentro del error de redondeo.
+
+Los coeficientes van del término de mayor grado al independiente.
+"""
+
+import ast
+import math
+
+import numpy as np
+
+MAX_DEGREE = 100
+# Margen sobre el radio (eps·S/|a|)^(1/m) con que se abre una raíz de multiplicidad m.
+CLUSTER_FACTOR = 10.0
+# Solo se intenta agrupar autovalores a menos de esta distancia relativa.
+CLUSTER_SPAN = 0.5
+# |p^(k)(x)| admitido en una raíz, en unidades de eps·S_k(x) y por grado.
+CHECK_FACTOR = 1e3
+POLISH_STEPS = 8
+
+_EPS = 2.2e-16
+
+_CONSTANTS = {"pi": math.pi, "e": math.e}
+
+
+def _add(p, q):
+    if len(p) < len(q):
+        p, q = q, p
+    return [a + (q[i] if i < len(q) else 0.0) for i, a in enumerate(p)]
+
+
+def _mul(p, q):
+    out = [0.0] * (len(p) + len(q) - 1)
+    for i, a in enumerate(p):
+        if a:
+            for j, b in enumerate(q):
+                out[i + j] += a * b
+    return out
+
+
+def _poly(node):
+    """Coeficientes de menor a mayor grado, o None si no es polinomio."""
+    if isinstance(node, ast.Expression):
+        return _poly(node.body)
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        return [float(node.value)]
+    if isinstance(node, ast.Name) and node.id == "x":
+        return [0.0, 1.0]
+    if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id == "math":
+        value = _CONSTANTS.get(node.attr)
+        return None if value is None else [value]
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.UAdd, ast.USub)):
+        p = _poly(node.operand)
+        if p is None:
+            return None
+        return p if isinstance(node.op, ast.UAdd) else [-c for c in p]
+    if not isinstance(node, ast.BinOp):
+        return None
+    left = _poly(node.left)
+    right = _poly(node.right)
+    if left is None or right is None:
+        return None
+    if isinstance(node.op, ast.Add):
+        return _add(left, right)
+    if isinstance(node.op, ast.Sub):
+        return _add(left, [-c for c in right])
+    if isinstance(node.op, ast.Mult):
+        return _mul(left, right)
+    if isinstance(node.op, ast.Div):
+        right = _trim(right)
+        if len(right) != 1 or right[0] == 0.0:
+            return None
+        return [c / right[0] for c in left]
+    if isinstance(node.op, ast.Pow):
+        right = _trim(right)
+        n = right[0] if len(right) == 1 else -1.0
+        if n < 0 or n != int(n) or (len(_trim(left)) - 1) * n > MAX_DEGREE:
+            return None
+        out = [1.0]
+        for _ in range(int(n)):
+            out = _mul(out, left)
+        return out
+    return None
+
+
+def _trim(p):
+    p = list(p)
+    while len(p) > 1 and p[-1] == 0.0:
+        p.pop()
+    return p
+
+
+def from_source(source):
+    """Coeficientes (mayor grado primero) de una expresión en x, o None."""
+    try:
+        p = _poly(ast.parse(source, mode="eval"))
+    except (SyntaxError, RecursionError):
+        return None
+    if p is None:
+        return None
+    p = _trim(p)
+    if len(p) - 1 > MAX_DEGREE:
+        return None
+    return tuple(reversed(p))
+
+
+def _is_constant(node):
+    p = _poly(node)
+    return p is not None and len(_trim(p)) == 1
+
+
+def _monomial(node):
+    """c, x, x^k y sus productos o cocientes por constantes."""
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.UAdd, ast.USub)):
+        return _monomial(node.operand)
+    if not isinstance(node, ast.BinOp):
+        return _poly(node) is not None
+    if isinstance(node.op, ast.Mult):
+        return _monomial(node.left) and _monomial(node.right)
+    if isinstance(node.op, ast.Div):
+        return _monomial(node.left) and _is_constant(node.right)
+    if isinstance(node.op, ast.Pow):
+        is_x = isinstance(node.left, ast.Name) and node.left.id == "x"
+        return (is_x or _is_constant(node.left)) and _is_constant(node.right)
+    return False
+
+
+def is_expanded(source):
+    """True si la expresión es un polinomio escrito como suma de monomios
+    c·x^k, sin potencias ni productos de sumas."""
+    if from_source(source) is None:
+        return False
+    terms = [ast.parse(source, mode="eval").body]
+    while terms:
+        node = terms.pop()
+        if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Add, ast.Sub)):
+            terms += [node.left, node.right]
+        elif not _monomial(node):
+            return False
+    return True
+
+
+def degree(coeffs):
+    return len(coeffs) - 1
+
+
+def horner(coeffs, x):
+    y = coeffs[0]
+    for c in coeffs[1:]:
+        y = y * x + c
+    return y
+
+
+def derivative(coeffs, order=1):
+    for _ in range(order):
+        n = len(coeffs) - 1
+        coeffs = tuple(c * (n - i) for i, c in enumerate(coeffs[:-1])) or (0.0,)
+    return coeffs
+
+
+def companion(coeffs):
+    """Matriz compañera del polinomio mónico asociado."""
+    n = len(coeffs) - 1
+    c = np.zeros((n, n))
+    c[0, :] = -np.asarray(coeffs[1:], dtype=float) / coeffs[0]
+    c[np.arange(1, n), np.arange(n - 1)] = 1.0
+    return c
+
+
+def _polish(coeffs, z, m):
+    """Newton sobre p^(m-1), donde una raíz de multiplicidad m es simple."""
+    q = derivative(coeffs, m - 1)
+    dq = derivative(q)
+    steps = 0
+    for _ in range(POLISH_STEPS):
+        d = horner(dq, z)
+        if d == 0:
+            break
+        step = horner(q, z) / d
+        z -= step
+        steps += 1
+        if abs(step) <= 1e-15 * max(1.0, abs(z)):
+            break
+    return z, steps
+
+
+def _error_scale(coeffs, r):
+    """S(r) = Σ|c_i|·r^i: cota del error de redondeo de horner en |x| = r, en unidades de eps."""
+    return horner(tuple(abs(c) for c in coeffs), r)
+
+
+def _clusters(coeffs, eig):
+    """Agrupa autovalores que son una misma raíz múltiple, de a pares y
+    empezando por los más cercanos, mientras quepan en el radio de su
+    multiplicidad."""
+    clusters = [[z] for z in sorted(eig, key=lambda v: (v.real, v.imag))]
+    while True:
+        centers = [sum(cl) / len(cl) for cl in clusters]
+        pairs = sorted((abs(centers[i] - centers[j]), i, j)
+                       for i in range(len(clusters)) for j in range(i + 1, len(clusters))
+                       if abs(centers[i] - centers[j]) <= CLUSTER_SPAN * max(1.0, abs(centers[i])))
+        for _, i, j in pairs:
+            merged = clusters[i] + clusters[j]
+            m = len(merged)
+            center = sum(merged) / m
+            a = abs(horner(derivative(coeffs, m), center)) / math.factorial(m)
+            if a == 0:
+                continue
+            radius = CLUSTER_FACTOR * (_EPS * _error_scale(coeffs, abs(center)) / a) ** (1.0 / m)
+            if max(abs(z - center) for z in merged) <= radius:
+                clusters[i] = merged
+                del clusters[j]
+                break
+        else:
+            return clusters
+
+
+def _is_root(coeffs, z, m):
+    """p^(k)(z) ≈ 0 para k < m, dentro del error de redondeo de Horner."""
+    limit = CHECK_FACTOR * len(coeffs) * _EPS
+    for k in range(m):
+        q = derivative(coeffs, k)
+        if abs(horner(q, z)) > limit * _error_scale(q, abs(z)):
+            return False
+    return True
+
+
+def roots(coeffs):
+    """Raíces con multiplicidad: lista de (z, m, pasos de Newton), reales primero.
+
+    Las raíces con parte imaginaria despreciable se devuelven como float.
+    Devuelve None si algún grupo pulido no es raíz del polinomio con esa
+    multiplicidad (raíces muy juntas que no se pueden separar).
+    """
+    coeffs = tuple(float(c) for c in coeffs)
+    zero_mult = 0
+    while len(coeffs) > 1 and coeffs[-1] == 0.0:
+        coeffs = coeffs[:-1]
+        zero_mult += 1
+    found = [(0.0, zero_mult, 0)] if zero_mult else []
+    if len(coeffs) > 1:
+        # una raíz múltiple se abre en un círculo pequeño de autovalores
+        for cl in _clusters(coeffs, np.linalg.eigvals(companion(coeffs))):
+            m = len(cl)
+            z = complex(sum(cl) / m)
+            if abs(z.imag) <= 1e-10 * max(1.0, abs(z)):
+                z = complex(z.real, 0.0)
+            z, steps = _polish(coeffs, z, m)
+            if not _is_root(coeffs, z, m):
+                return None
+            if abs(z.imag) <= 1e-12 * max(1.0, abs(z)):
+                z = z.real
+            elif abs(z.real) <= 1e-12 * abs(z):
+                z = complex(0.0, z.imag)
+            found.append((z, m, steps))
+    found.sort(key=lambda r: (isinstance(r[0], complex), np.real(r[0]), np.imag(r[0])))
+    return found
+
+
+def format_root(z):
+    if not isinstance(z, complex):
+        return f"{z:.10f}"
+    sign = "+" if z.imag >= 0 else "-"
+    return f"{z.real:.10f} {sign} {abs(z.imag):.10f}i"
@@ -0,0 +1,131 @@
+"""Métodos de intervalo con convergencia superlineal.
+
+La falsa posición clásica se estanca en funciones convexas: un extremo no se
+mueve nunca y el intervalo no se cierra. Illinois, Pegasus y Anderson–Björck
+son la misma regla de falsa posición, pero cuando un extremo se conserva dos
+veces seguidas su valor f se multiplica por un factor m < 1, lo que empuja
+la secante hacia el otro lado. Brent combina bisección, secante e
+interpolación cuadrática inversa y nunca avanza menos que la bisección.
+
+Todos conservan el cambio de signo y agregan a `rows` filas
+(iteración, a, b, c, f(a), f(b), f(c), ea) como la falsa posición de la
+calculadora; `f` es un callable de un argumento (p. ej. un EvalMemo).
+"""
+
+import math
+
+METHODS = ("Illinois", "Pegasus", "Anderson-Björck", "Brent")
+
+_EPS = 2.2e-16
+
+
+def _illinois(f_replaced, f_new):
+    return 0.5
+
+
+def _pegasus(f_replaced, f_new):
+    return f_replaced / (f_replaced + f_new)
+
+
+def _anderson_bjorck(f_replaced, f_new):
+    m = 1.0 - f_new / f_replaced
+    return m if m > 0 else 0.5
+
+
+_SCALES = {"Illinois": _illinois, "Pegasus": _pegasus, "Anderson-Björck": _anderson_bjorck}
+
+
+def modified_false_position(f, a, b, tol, max_it, scale, rows, fa=None, fb=None):
+    """Falsa posición con el factor `scale(f_reemplazado, f_nuevo)` sobre el
+    extremo retenido. Devuelve (raíz, a, b) con el intervalo final."""
+    fa = f(a) if fa is None else fa
+    fb = f(b) if fb is None else fb
+    side = 0  # -1: se reemplazó b en el paso anterior, +1: se reemplazó a
+    prev_c = None
+    for it in range(1, max_it + 1):
+        c = b - fb * (b - a) / (fb - fa)
+        fc = f(c)
+        rows.append((it, a, b, c, fa, fb, fc, abs(fc)))
+        if fc == 0.0 or abs(fc) <= tol or (prev_c is not None and abs(c - prev_c) <= tol) or abs(b - a) <= tol:
+            return c, a, b
+        if fa * fc < 0:
+            if side == -1:
+                fa *= scale(fb, fc)
+            b, fb = c, fc
+            side = -1
+        else:
+            if side == 1:
+                fb *= scale(fa, fc)
+            a, fa = c, fc
+            side = 1
+        prev_c = c
+    return (prev_c if prev_c is not None else (a + b) / 2.0), a, b
+
+
+def brent(f, a, b, tol, max_it, rows, fa=None, fb=None):
+    """Método de Brent (zbrent). Devuelve (raíz, a, b) con el intervalo final."""
+    fa = f(a) if fa is None else fa
+    fb = f(b) if fb is None else fb
+    c, fc = a, fa
+    d = e = b - a
+    for it in range(1, max_it + 1):
+        if fb * fc > 0:
+            c, fc = a, fa
+            d = e = b - a
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+        tol1 = 2.0 * _EPS * abs(b) + 0.5 * tol
+        xm = 0.5 * (c - b)
+        if abs(xm) <= tol1 or fb == 0.0:
+            return b, min(b, c), max(b, c)
+        if abs(e) >= tol1 and abs(fa) > abs(fb):
+            s = fb / fa
+            if a == c:
+                p = 2.0 * xm * s
+                q = 1.0 - s
+            else:
+                q = fa / fc
+                r = fb / fc
+                p = s * (2.0 * xm * q * (q - r) - (b - a) * (r - 1.0))
+                q = (q - 1.0) * (r - 1.0) * (s - 1.0)
+            if p > 0:
+                q = -q
+            p = abs(p)
+            if 2.0 * p < min(3.0 * xm * q - abs(tol1 * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = xm
+        else:
+            d = e = xm
+        lo, hi, f_lo, f_hi = (b, c, fb, fc) if b < c else (c, b, fc, fb)
+        a, fa = b, fb
+        b += d if abs(d) > tol1 else math.copysign(tol1, xm)
+        fb = f(b)
+        rows.append((it, lo, hi, b, f_lo, f_hi, fb, abs(xm)))
+        if abs(fb) <= tol:
+            return b, lo, hi
+    return b, min(b, c), max(b, c)
+
+
+def solve(method, f, a, b, tol=1e-4, max_it=100, rows=None):
+    """Raíz de f en [a, b] con `method` (uno de METHODS).
+
+    Devuelve (raíz, a, b, filas). Lanza ValueError si f no cambia de signo.
+    """
+    rows = [] if rows is None else rows
+    fa = f(a)
+    fb = f(b)
+    if fa == 0.0:
+        rows.append((1, a, b, a, fa, fb, fa, 0.0))
+        return a, a, b, rows
+    if fb == 0.0:
+        rows.append((1, a, b, b, fa, fb, fb, 0.0))
+        return b, a, b, rows
+    if fa * fb > 0:
+        raise ValueError("La función no cambia de signo en [a,b]")
+    if method == "Brent":
+        root, a, b = brent(f, a, b, tol, max_it, rows, fa, fb)
+    else:
+        root, a, b = modified_false_position(f, a, b, tol, max_it, _SCALES[method], rows, fa, fb)
+    return root, a, b, rows
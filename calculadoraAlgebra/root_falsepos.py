@@ -15,6 +15,8 @@ import numpy as np
 from sympy import symbols, lambdify, pi, E
 from sympy.parsing.sympy_parser import parse_expr, standard_transformations, implicit_multiplication_application
 
+from math_utils import EvalMemo
+
 
 Transformations = standard_transformations + (implicit_multiplication_application,)
 
@@ -93,9 +95,10 @@ def _build_callable(func_str: str) -> Callable[[float], float]:
 def false_position_method(func_str: str, a: float, b: float, tol: float = 1e-4, max_iter: int = 100) -> Tuple[float, List[str], int]:
     """Calcula la raíz por el método de Falsa Posición.
 
-    Devuelve (root, logs, iterations). Lanza ValueError con un mensaje claro si algo falla.
+    Devuelve (root, logs, iterations); la última línea de logs resume las
+    evaluaciones de f. Lanza ValueError con un mensaje claro si algo falla.
     """
-    f = _build_callable(func_str)
+    f = EvalMemo(_build_callable(func_str))
 
     try:
         fa = f(a)
@@ -114,12 +117,6 @@ def false_position_method(func_str: str, a: float, b: float, tol: float = 1e-4,
     prev_c: Optional[float] = None
 
     while iteration < max_iter:
-        try:
-            fa = f(a)
-            fb = f(b)
-        except Exception as e:
-            raise ValueError(f"Evaluación fallida durante iteraciones: {e}")
-
         if fb == fa:
             logs.append("f(a) == f(b); fórmula indeterminada")
             break
@@ -138,13 +135,14 @@ def false_position_method(func_str: str, a: float, b: float, tol: float = 1e-4,
             break
 
         if fa * fc < 0:
-            b = c
+            b, fb = c, fc
         else:
-            a = c
+            a, fa = c, fc
 
         prev_c = c
         iteration += 1
 
     root = prev_c if prev_c is not None else (a + b) / 2
+    logs.append(f.summary())
     return root, logs, iteration
 
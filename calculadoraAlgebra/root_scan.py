@@ -0,0 +1,164 @@
+"""Todas las raíces de f en [a, b].
+
+1. Se muestrea f en una malla uniforme con NumPy (una sola pasada).
+2. Cada cambio de signo entre dos muestras es un intervalo que se refina con
+   Brent (root_bracketing). Si |f| en el punto final no es menor que en los
+   extremos, el cambio de signo es un polo o un salto (tan(x) en π/2) y se
+   descarta. Con muchos intervalos el refinamiento se reparte en el pool de
+   procesos compartido (la función viaja como cadena).
+3. Los mínimos locales de |f| sin cambio de signo pueden ser raíces de
+   multiplicidad par (f = (x-1)², p. ej.): ahí f' sí cambia de signo, así que
+   se refina f' = 0 con Brent usando la derivada automática y se acepta el
+   punto si |f| ≤ tol.
+4. Se ordenan y se funden las raíces más cercanas que la tolerancia.
+
+Si f es un polinomio no hace falta barrer: las raíces salen de la matriz
+compañera (polynomial.roots), con sus multiplicidades y las complejas. Si
+esas raíces no se pueden separar con fiabilidad se vuelve al barrido.
+
+Dos raíces más juntas que el paso de la malla pueden perderse; `samples`
+controla ese paso.
+"""
+
+from concurrent.futures import CancelledError, as_completed
+from functools import lru_cache
+
+import numpy as np
+
+import math_utils
+import polynomial
+import root_bracketing
+
+SAMPLES = 2001
+# A partir de esta cantidad de intervalos el refinamiento va al pool de procesos.
+PARALLEL_MIN_BRACKETS = 8
+
+SIGN_CHANGE = "cambio de signo"
+EVEN = "multiplicidad par"
+EXACT = "exacta"
+
+
+def _refine_bracket(func_str, a, b, tol, max_it):
+    f = math_utils.EvalMemo(lambda x: math_utils.evaluate_function(x, func_str))
+    root, _, _, rows = root_bracketing.solve("Brent", f, a, b, tol, max_it)
+    fx = f(root)
+    if not abs(fx) <= tol and not abs(fx) < min(abs(f(a)), abs(f(b))):
+        return None  # polo o salto: |f| no se achica hacia el cambio de signo
+    return root, fx, len(rows), f.evaluations
+
+
+def _refine_minimum(func_str, a, b, tol, max_it):
+    d = math_utils.EvalMemo(lambda x: math_utils.evaluate_derivatives(x, func_str))
+    root, _, _, rows = root_bracketing.solve("Brent", lambda x: d(x)[1], a, b, tol, max_it)
+    return root, d(root)[0], len(rows), d.evaluations
+
+
+def _task(kind, func_str, a, b, tol, max_it):
+    # se ejecuta en el pool: un intervalo que no converge no detiene a los demás
+    try:
+        refine = _refine_minimum if kind == EVEN else _refine_bracket
+        return refine(func_str, a, b, tol, max_it)
+    except ValueError:
+        return None
+
+
+def scan(func_str, a, b, samples=SAMPLES):
+    """Intervalos con cambio de signo, mínimos de |f| y ceros exactos de la malla."""
+    xs = np.linspace(a, b, samples)
+    ys = math_utils._scan_values(xs, func_str)
+    finite = np.isfinite(ys)
+    y = np.where(finite, ys, np.nan)
+    zeros = np.flatnonzero(finite & (y == 0.0))
+    both = finite[:-1] & finite[1:]
+    change = np.flatnonzero(both & (np.sign(y[:-1]) * np.sign(y[1:]) < 0))
+    brackets = [(float(xs[i]), float(xs[i + 1])) for i in change]
+    # mínimos locales estrictos de |f| con el mismo signo a ambos lados
+    mag = np.abs(y)
+    mid = np.arange(1, samples - 1)
+    is_min = (finite[mid - 1] & finite[mid] & finite[mid + 1]
+              & (mag[mid] <= mag[mid - 1]) & (mag[mid] < mag[mid + 1])
+              & (np.sign(y[mid - 1]) == np.sign(y[mid])) & (np.sign(y[mid + 1]) == np.sign(y[mid])))
+    minima = [(float(xs[i - 1]), float(xs[i + 1])) for i in mid[is_min]]
+    return brackets, minima, [float(xs[i]) for i in zeros]
+
+
+@lru_cache(maxsize=math_utils.COMPILE_CACHE_SIZE)
+def polynomial_roots(func_str):
+    """(coeficientes, raíces con multiplicidad) si f es un polinomio de grado ≥ 1
+    con raíces bien separadas; si no, None."""
+    coeffs = math_utils.polynomial_coefficients(func_str)
+    if coeffs is None or polynomial.degree(coeffs) < 1:
+        return None
+    roots = polynomial.roots(coeffs)
+    return None if roots is None else (coeffs, tuple(roots))
+
+
+def find_all_roots(func_str, a, b, tol=1e-8, max_it=100, samples=SAMPLES, cancelled=None, on_root=None):
+    """Raíces de f en [a, b] ordenadas: lista de (x, f(x), tipo, iteraciones).
+
+    `tipo` es SIGN_CHANGE, EVEN o EXACT. `on_root(fila)` se llama con cada
+    raíz refinada, en el orden en que terminan; `cancelled` (threading.Event)
+    detiene el refinamiento pendiente.
+    """
+    if a > b:
+        a, b = b, a
+    poly = polynomial_roots(func_str)
+    if poly is not None:
+        _, roots = poly
+        # las raíces de multiplicidad impar cambian de signo; las de multiplicidad par no
+        found = [(z, math_utils.evaluate_function(z, func_str), EVEN if m % 2 == 0 else SIGN_CHANGE, steps)
+                 for z, m, steps in roots if not isinstance(z, complex) and a <= z <= b]
+        if on_root is not None:
+            for row in found:
+                on_root(row)
+        return found
+    brackets, minima, zeros = scan(func_str, a, b, samples)
+    tasks = [(SIGN_CHANGE, lo, hi) for lo, hi in brackets] + [(EVEN, lo, hi) for lo, hi in minima]
+    found = [(x, 0.0, EXACT, 0) for x in zeros]
+    for row in found:
+        if on_root is not None:
+            on_root(row)
+
+    def collect(kind, result):
+        if result is None:
+            return
+        x, fx, iterations, _ = result
+        if kind == EVEN and not abs(fx) <= tol:
+            return  # mínimo de |f| que no toca el eje
+        row = (x, fx, kind, iterations)
+        found.append(row)
+        if on_root is not None:
+            on_root(row)
+
+    if len(tasks) >= PARALLEL_MIN_BRACKETS:
+        from matrix_jobs import get_executor
+        executor = get_executor()
+        futures = {executor.submit(_task, kind, func_str, lo, hi, tol, max_it): kind for kind, lo, hi in tasks}
+        try:
+            for fut in as_completed(futures):
+                if cancelled is not None and cancelled.is_set():
+                    break
+                collect(futures[fut], fut.result())
+        except CancelledError:
+            pass
+        finally:
+            for fut in futures:
+                fut.cancel()
+    else:
+        for kind, lo, hi in tasks:
+            if cancelled is not None and cancelled.is_set():
+                break
+            collect(kind, _task(kind, func_str, lo, hi, tol, max_it))
+    return dedupe(found, tol)
+
+
+def dedupe(rows, tol):
+    """Ordena por x y funde raíces a menos de max(10·tol, 1e-9·|x|); conserva la de menor |f|."""
+    merged = []
+    for row in sorted(rows, key=lambda r: r[0]):
+        if merged and abs(row[0] - merged[-1][0]) <= max(10.0 * tol, 1e-9 * abs(row[0])):
+            if abs(row[1]) < abs(merged[-1][1]):
+                merged[-1] = row
+            continue
+        merged.append(row)
+    return merged
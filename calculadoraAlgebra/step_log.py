@@ -0,0 +1,155 @@
+"""Registros de pasos compactos y su formateo diferido.
+
+Las operaciones (`operations_*`) producen tuplas (código, índices, operandos)
+desde un generador; el texto en español solo se arma cuando alguien itera
+el StepLog resultante, línea por línea.
+"""
+
+from matrix_core import fraction_to_str, format_matrix_lines
+
+TEXT = "text"        # (TEXT, línea)
+FORMAT = "fmt"       # (FORMAT, plantilla, *valores)  valores con fraction_to_str
+MATRIX = "matrix"    # (MATRIX, matriz, sangría)
+NESTED = "nested"    # (NESTED, registros, sangría)
+ADD_CELL = "add"     # (ADD_CELL, i, j, a, b, resultado)
+SUB_CELL = "sub"     # (SUB_CELL, i, j, a, b, resultado)
+MUL_CELL = "mul"     # (MUL_CELL, i, j, fila_a, columna_b, resultado)
+SARRUS = "sarrus"    # (SARRUS, paso, k, posiciones, valores, producto)
+ADD_ROW = "add_row"  # (ADD_ROW, i, fila_a, fila_b, fila_c)
+SUB_ROW = "sub_row"  # (SUB_ROW, i, fila_a, fila_b, fila_c)
+MUL_ROW = "mul_row"  # (MUL_ROW, i, fila_c)
+
+# Niveles de detalle del procedimiento, compartidos por todas las pantallas.
+RESULT = 0   # solo el resultado
+SUMMARY = 1  # un paso por fila o por pivote
+FULL = 2     # cada celda
+VERBOSITY_LABELS = ("Solo resultado", "Resumen por fila/pivote", "Paso a paso completo")
+
+_verbosity = FULL
+
+
+def get_verbosity():
+    return _verbosity
+
+
+def set_verbosity(level):
+    global _verbosity
+    if level not in (RESULT, SUMMARY, FULL):
+        raise ValueError("Nivel de detalle no válido")
+    _verbosity = level
+
+
+def resolve_level(log=True, level=None):
+    """Nivel efectivo: log=False equivale a RESULT; sin nivel se usa el compartido."""
+    if not log:
+        return RESULT
+    return _verbosity if level is None else level
+
+
+def vector_str(values):
+    return "[ " + "  ".join(fraction_to_str(v) for v in values) + " ]"
+
+
+def _text(rec):
+    return (rec[1],)
+
+
+def _format(rec):
+    return (rec[1].format(*(fraction_to_str(v) for v in rec[2:])),)
+
+
+def _matrix(rec):
+    indent = rec[2]
+    return (indent + line for line in format_matrix_lines(rec[1]))
+
+
+def _nested(rec):
+    return render(rec[1], rec[2])
+
+
+def _elementwise(symbol):
+    def renderer(rec):
+        _, i, j, a, b, res = rec
+        return (f"  Paso 2.{i+1}.{j+1}: C[{i+1},{j+1}] = {fraction_to_str(a)} {symbol} {fraction_to_str(b)} = {fraction_to_str(res)}",)
+    return renderer
+
+
+def _elementwise_row(symbol):
+    def renderer(rec):
+        _, i, row_a, row_b, row_c = rec
+        return (f"  Paso 2.{i+1}: C[{i+1},:] = {vector_str(row_a)} {symbol} {vector_str(row_b)} = {vector_str(row_c)}",)
+    return renderer
+
+
+def _mul_row(rec):
+    _, i, row_c = rec
+    return (f"  Paso 2.{i+1}: C[{i+1},:] = A[{i+1},:] × B = {vector_str(row_c)}",)
+
+
+def _mul_cell(rec):
+    _, i, j, row_a, col_b, value = rec
+    products = []
+    for k, (a_val, b_val) in enumerate(zip(row_a, col_b)):
+        prod = a_val * b_val
+        products.append(prod)
+        yield f"  Paso 2.{i+1}.{j+1}.{k+1}: A[{i+1},{k+1}] × B[{k+1},{j+1}] = {fraction_to_str(a_val)} × {fraction_to_str(b_val)} = {fraction_to_str(prod)}"
+    terms = " + ".join(fraction_to_str(val) for val in products)
+    yield f"  Paso 2.{i+1}.{j+1}: C[{i+1},{j+1}] = {terms} = {fraction_to_str(value)}"
+
+
+def _sarrus(rec):
+    _, step, idx, positions, vals, prod = rec
+    indices_txt = " × ".join(f"A[{r+1},{c+1}]" for r, c in positions)
+    values_txt = " × ".join(fraction_to_str(v) for v in vals)
+    return (f"  Paso {step}.{idx}: {indices_txt} = {values_txt} = {fraction_to_str(prod)}",)
+
+
+_RENDERERS = {
+    TEXT: _text,
+    FORMAT: _format,
+    MATRIX: _matrix,
+    NESTED: _nested,
+    ADD_CELL: _elementwise("+"),
+    SUB_CELL: _elementwise("-"),
+    MUL_CELL: _mul_cell,
+    SARRUS: _sarrus,
+    ADD_ROW: _elementwise_row("+"),
+    SUB_ROW: _elementwise_row("-"),
+    MUL_ROW: _mul_row,
+}
+
+
+def render(records, indent=""):
+    """Genera las líneas de texto de `records`, una a una."""
+    for rec in records:
+        for line in _RENDERERS[rec[0]](rec):
+            yield indent + line
+
+
+class StepLog:
+    """Lista de registros que se formatea al iterarla (cada vez, sin guardar texto)."""
+
+    __slots__ = ("records",)
+
+    def __init__(self, records=None):
+        self.records = records if records is not None else []
+
+    def __iter__(self):
+        return render(self.records)
+
+    def __bool__(self):
+        return bool(self.records)
+
+    def lines(self):
+        return list(render(self.records))
+
+
+def collect(steps):
+    """Consume el generador de pasos `steps`; devuelve (valor_retornado, StepLog)."""
+    records = []
+    append = records.append
+    try:
+        while True:
+            append(next(steps))
+    except StopIteration as stop:
+        return stop.value, StepLog(records)
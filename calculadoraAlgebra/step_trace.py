@@ -0,0 +1,124 @@
+"""Registro compacto de los pasos de una operación sobre matrices.
+
+Cada paso guarda su título, su explicación y, si solo cambiaron algunas
+celdas o filas de la matriz del paso anterior, esos valores nuevos. La
+matriz completa de un paso se reconstruye al pedirla, aplicando los cambios
+sobre la copia base del tablero o sobre la última instantánea conservada en
+caché.
+"""
+
+from collections import OrderedDict
+
+from matrix_core import Matrix
+
+# Instantáneas reconstruidas que se conservan (las filas visibles y vecinas).
+SNAPSHOT_CACHE_SIZE = 64
+
+
+class StepTrace:
+    """Secuencia de pasos; un "tablero" es la copia base de una matriz registrada."""
+
+    __slots__ = ("_steps", "_boards", "_live", "_cache")
+
+    def __init__(self):
+        # pasos: (título, explicación, tablero, cambios, es_final); cambios es
+        # None (tablero nuevo) o una tupla de (posición plana, valores)
+        self._steps = []
+        # tableros: (filas, columnas, búfer base, índice del primer paso)
+        self._boards = []
+        self._live = None
+        self._cache = OrderedDict()
+
+    def __len__(self):
+        return len(self._steps)
+
+    def clear(self):
+        self._steps.clear()
+        self._boards.clear()
+        self._live = None
+        self._cache.clear()
+
+    def _new_board(self, title, explanation, rows, cols, buf, final, live):
+        self._boards.append((rows, cols, tuple(buf), len(self._steps)))
+        self._steps.append((title, explanation, len(self._boards) - 1, None, final))
+        self._live = live
+
+    def add(self, title, explanation, mat, cell=None, row=None, final=False):
+        """Registra un paso que muestra `mat`.
+
+        Con `cell=(i, j)` o `row=i` y la misma matriz del paso anterior solo se
+        guarda esa celda o fila; en otro caso se copia la matriz como un
+        tablero nuevo.
+        """
+        if (cell is not None or row is not None) and mat is self._live and self._boards:
+            if cell is not None:
+                pos = cell[0] * mat.cols + cell[1]
+                values = (mat[cell],)
+            else:
+                pos = row * mat.cols
+                values = tuple(mat.row(row))
+            self._steps.append((title, explanation, len(self._boards) - 1, ((pos, values),), final))
+            return
+        self._new_board(title, explanation, mat.rows, mat.cols, mat.flat, final, mat)
+
+    def add_rows(self, title, explanation, rows, changed=()):
+        """Como `add`, para una matriz dada como lista de filas (eliminación
+        gaussiana): si `rows` es la lista del paso anterior solo se guardan
+        las filas de índices `changed`."""
+        if rows is self._live and self._boards:
+            cols = self._boards[-1][1]
+            deltas = tuple((i * cols, tuple(rows[i])) for i in changed)
+            self._steps.append((title, explanation, len(self._boards) - 1, deltas, False))
+            return
+        cols = len(rows[0]) if rows else 0
+        self._new_board(title, explanation, len(rows), cols, [v for row in rows for v in row], False, rows)
+
+    def title(self, index):
+        return self._steps[index][0]
+
+    def explanation(self, index):
+        return self._steps[index][1]
+
+    def is_final(self, index):
+        return self._steps[index][4]
+
+    def shape(self, index):
+        rows, cols, _, _ = self._boards[self._steps[index][2]]
+        return rows, cols
+
+    def changed_spans(self, index):
+        """Tupla de (posición plana, cantidad) con las celdas que modificó el
+        paso, o None si mostró una matriz nueva."""
+        deltas = self._steps[index][3]
+        if deltas is None:
+            return None
+        return tuple((pos, len(values)) for pos, values in deltas)
+
+    def cells(self, index):
+        """Búfer plano (tupla) de la matriz en el paso `index`."""
+        cached = self._cache.get(index)
+        if cached is not None:
+            self._cache.move_to_end(index)
+            return cached
+        board = self._steps[index][2]
+        _, _, base, start = self._boards[board]
+        # partir de la instantánea en caché más cercana del mismo tablero
+        begin = max((k for k in self._cache if start <= k < index), default=None)
+        if begin is None:
+            buf = list(base)
+            begin = start
+        else:
+            buf = list(self._cache[begin])
+        for k in range(begin + 1, index + 1):
+            for pos, values in self._steps[k][3]:
+                buf[pos:pos + len(values)] = values
+        result = tuple(buf)
+        self._cache[index] = result
+        if len(self._cache) > SNAPSHOT_CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return result
+
+    def snapshot(self, index):
+        """Matriz (copia) tal como estaba en el paso `index`."""
+        rows, cols = self.shape(index)
+        return Matrix.from_flat(rows, cols, list(self.cells(index)))
@@ -17,6 +17,8 @@ import operations_multiply
 import operations_determinant
 import operations_cofactor
 import operations_gauss
+import step_log
+from log_sink import TkTextSink
 import root_bisection
 import root_falsepos
 from file_io import save_file_path, read_saved_json, write_saved_json, collect_entries_as_strings, fill_entries_from_strings
@@ -43,6 +45,7 @@ class MatrixCalculator:
         self.entriesA = []
         self.entriesB = []
         self.operation = tk.StringVar(value="Suma")
+        self.verbosity = tk.StringVar(value=step_log.VERBOSITY_LABELS[step_log.get_verbosity()])
         self.saved_matrices = {}
         
         # Variables para Gauss-Jordan
@@ -124,7 +127,7 @@ class MatrixCalculator:
         
         # Limpiar resultados
         self.result_text.config(state="normal")
-        self.result_text.delete(1.0, tk.END)
+        self.out.clear()
         self.result_text.config(state="disabled")
 
     def create_matrices(self):
@@ -486,10 +489,12 @@ class MatrixCalculator:
                                                        insertbackground=self.colors["text"],
                                                        relief="flat", bd=1)
             self.result_text.pack(fill="both", expand=True, padx=10, pady=10)
+            # las operaciones escriben en un búfer que se vuelca de una vez
+            self.out = TkTextSink(self.result_text)
         
         # habilitar temporalmente el área de resultados
         self.result_text.config(state="normal")
-        self.result_text.delete(1.0, tk.END)
+        self.out.clear()
 
         op = self.operation.get()
         if op == "Suma":
@@ -509,6 +514,7 @@ class MatrixCalculator:
         elif op == "Cofactor":
             self.cofactor_matrix()
 
+        self.out.flush()
         # volver a bloquear el área de resultados
         self.result_text.config(state="disabled")
     def add_matrices(self):
@@ -518,21 +524,22 @@ class MatrixCalculator:
         try:
             result_matrix, log = operations_sum.add_matrices(matA, matB)
         except Exception as e:
-            self.result_text.insert(tk.END, f"\n❌ ERROR: {e}\n", "error")
+            self.out.write(f"\n❌ ERROR: {e}\n", "error")
             return
 
         # Mostrar matrices originales y logs
-        self.result_text.insert(tk.END, f"\n{'='*60}\n", "title")
-        self.result_text.insert(tk.END, f"OPERACIÓN: SUMA DE MATRICES\n", "title")
-        self.result_text.insert(tk.END, f"{'='*60}\n", "title")
+        self.out.write(f"\n{'='*60}\n", "title")
+        self.out.write(f"OPERACIÓN: SUMA DE MATRICES\n", "title")
+        self.out.write(f"{'='*60}\n", "title")
         self.display_matrix(matA, "Matriz A", "matrix")
         self.display_matrix(matB, "Matriz B", "matrix")
-        self.result_text.insert(tk.END, "\n🧮 CÁLCULO PASO A PASO:\n", "step")
-        for line in log:
-            self.result_text.insert(tk.END, line + "\n", "matrix")
+        if log:
+            self.out.write("\n🧮 CÁLCULO PASO A PASO:\n", "step")
+            for line in log:
+                self.out.write(line + "\n", "matrix")
         self.display_matrix(result_matrix, "Matriz Resultante C = A + B", "matrix")
-        self.result_text.insert(tk.END, f"\n✅ Suma completada exitosamente\n", "independent")
-        self.result_text.insert(tk.END, "\n" + "="*60 + "\n")
+        self.out.write(f"\n✅ Suma completada exitosamente\n", "independent")
+        self.out.write("\n" + "="*60 + "\n")
 
     def subtract_matrices(self):
         matA = self.get_matrix(self.entriesA)
@@ -541,20 +548,21 @@ class MatrixCalculator:
         try:
             result_matrix, log = operations_subtract.subtract_matrices(matA, matB)
         except Exception as e:
-            self.result_text.insert(tk.END, f"\n❌ ERROR: {e}\n", "error")
+            self.out.write(f"\n❌ ERROR: {e}\n", "error")
             return
 
-        self.result_text.insert(tk.END, f"\n{'='*60}\n", "title")
-        self.result_text.insert(tk.END, f"OPERACIÓN: RESTA DE MATRICES\n", "title")
-        self.result_text.insert(tk.END, f"{'='*60}\n", "title")
+        self.out.write(f"\n{'='*60}\n", "title")
+        self.out.write(f"OPERACIÓN: RESTA DE MATRICES\n", "title")
+        self.out.write(f"{'='*60}\n", "title")
         self.display_matrix(matA, "Matriz A", "matrix")
         self.display_matrix(matB, "Matriz B", "matrix")
-        self.result_text.insert(tk.END, "\n🧮 CÁLCULO PASO A PASO:\n", "step")
-        for line in log:
-            self.result_text.insert(tk.END, line + "\n", "matrix")
+        if log:
+            self.out.write("\n🧮 CÁLCULO PASO A PASO:\n", "step")
+            for line in log:
+                self.out.write(line + "\n", "matrix")
         self.display_matrix(result_matrix, "Matriz Resultante C = A - B", "matrix")
-        self.result_text.insert(tk.END, f"\n✅ Resta completada exitosamente\n", "independent")
-        self.result_text.insert(tk.END, "\n" + "="*60 + "\n")
+        self.out.write(f"\n✅ Resta completada exitosamente\n", "independent")
+        self.out.write("\n" + "="*60 + "\n")
 
     def multiply_matrices(self):
         matA = self.get_matrix(self.entriesA)
@@ -563,20 +571,21 @@ class MatrixCalculator:
         try:
             result_matrix, log = operations_multiply.multiply_matrices(matA, matB)
         except Exception as e:
-            self.result_text.insert(tk.END, f"\n❌ ERROR: {e}\n", "error")
+            self.out.write(f"\n❌ ERROR: {e}\n", "error")
             return
 
-        self.result_text.insert(tk.END, f"\n{'='*60}\n", "title")
-        self.result_text.insert(tk.END, f"OPERACIÓN: MULTIPLICACIÓN DE MATRICES\n", "title")
-        self.result_text.insert(tk.END, f"{'='*60}\n", "title")
+        self.out.write(f"\n{'='*60}\n", "title")
+        self.out.write(f"OPERACIÓN: MULTIPLICACIÓN DE MATRICES\n", "title")
+        self.out.write(f"{'='*60}\n", "title")
         self.display_matrix(matA, "Matriz A", "matrix")
         self.display_matrix(matB, "Matriz B", "matrix")
-        self.result_text.insert(tk.END, "\n📊 Dimensiones y cálculo paso a paso:\n", "step")
-        for line in log:
-            self.result_text.insert(tk.END, line + "\n", "matrix")
+        if log:
+            self.out.write("\n📊 Dimensiones y cálculo paso a paso:\n", "step")
+            for line in log:
+                self.out.write(line + "\n", "matrix")
         self.display_matrix(result_matrix, "Matriz Resultante C = A × B", "matrix")
-        self.result_text.insert(tk.END, f"\n✅ Multiplicación completada exitosamente\n", "independent")
-        self.result_text.insert(tk.END, "\n" + "="*60 + "\n")
+        self.out.write(f"\n✅ Multiplicación completada exitosamente\n", "independent")
+        self.out.write("\n" + "="*60 + "\n")
 
     def transpose_matrix(self):
         matA = self.get_matrix(self.entriesA)
@@ -585,29 +594,35 @@ class MatrixCalculator:
         rows, cols = matA.shape
         result = [[matA[j,i] for j in range(rows)] for i in range(cols)]
         
-        self.result_text.insert(tk.END, f"\n{'='*60}\n", "title")
-        self.result_text.insert(tk.END, f"OPERACIÓN: TRANSPUESTA DE MATRIZ\n", "title")
-        self.result_text.insert(tk.END, f"{'='*60}\n", "title")
+        self.out.write(f"\n{'='*60}\n", "title")
+        self.out.write(f"OPERACIÓN: TRANSPUESTA DE MATRIZ\n", "title")
+        self.out.write(f"{'='*60}\n", "title")
         
         # Mostrar matriz original
         self.display_matrix(matA, "Matriz Original A", "matrix")
         
         # Mostrar proceso de transposición
-        self.result_text.insert(tk.END, f"\n🔄 PROCESO DE TRANSPOSICIÓN:\n", "step")
-        self.result_text.insert(tk.END, f"   Dimensiones: {rows}×{cols} → {cols}×{rows}\n", "matrix")
+        level = step_log.get_verbosity()
+        if level != step_log.RESULT:
+            self.out.write(f"\n🔄 PROCESO DE TRANSPOSICIÓN:\n", "step")
+            self.out.write(f"   Dimensiones: {rows}×{cols} → {cols}×{rows}\n", "matrix")
         
         for i in range(cols):
+            if level == step_log.SUMMARY:
+                self.out.write(f"   Aᵀ[{i+1},:] = A[:,{i+1}] = {step_log.vector_str(result[i])}\n", "matrix")
+                continue
+            if level != step_log.FULL:
+                continue
             for j in range(rows):
                 original_val = matA[j,i]
-                transposed_val = result[i][j]
-                self.result_text.insert(tk.END, f"   Aᵀ[{i+1},{j+1}] = A[{j+1},{i+1}] = {fraction_to_str(original_val)}\n", "matrix")
+                self.out.write(f"   Aᵀ[{i+1},{j+1}] = A[{j+1},{i+1}] = {fraction_to_str(original_val)}\n", "matrix")
         
         # Mostrar resultado final
         result_matrix = Matrix(result)
         self.display_matrix(result_matrix, "Matriz Transpuesta Aᵀ", "matrix")
         
-        self.result_text.insert(tk.END, f"\n✅ Transposición completada exitosamente\n", "independent")
-        self.result_text.insert(tk.END, "\n" + "="*60 + "\n")
+        self.out.write(f"\n✅ Transposición completada exitosamente\n", "independent")
+        self.out.write("\n" + "="*60 + "\n")
 
     def determinant_matrix(self):
         matA = self.get_matrix(self.entriesA)
@@ -620,22 +635,22 @@ class MatrixCalculator:
         try:
             det, log = operations_determinant.determinant_with_log(matrix)
         except Exception as e:
-            self.result_text.insert(tk.END, f"\n❌ ERROR: {e}\n", "error")
+            self.out.write(f"\n❌ ERROR: {e}\n", "error")
             return
 
-        self.result_text.insert(tk.END, f"\n{'='*60}\n", "title")
-        self.result_text.insert(tk.END, f"OPERACIÓN: DETERMINANTE DE MATRIZ\n", "title")
-        self.result_text.insert(tk.END, f"{'='*60}\n", "title")
+        self.out.write(f"\n{'='*60}\n", "title")
+        self.out.write(f"OPERACIÓN: DETERMINANTE DE MATRIZ\n", "title")
+        self.out.write(f"{'='*60}\n", "title")
         self.display_matrix(matA, "Matriz A", "matrix")
         for line in log:
-            self.result_text.insert(tk.END, line + "\n", "step")
-        self.result_text.insert(tk.END, f"\n✅ RESULTADO FINAL:\n", "title")
-        self.result_text.insert(tk.END, f"   det(A) = {fraction_to_str(det)}\n", "result")
+            self.out.write(line + "\n", "step")
+        self.out.write(f"\n✅ RESULTADO FINAL:\n", "title")
+        self.out.write(f"   det(A) = {fraction_to_str(det)}\n", "result")
         try:
-            self.result_text.insert(tk.END, f"   Valor decimal: {float(det):.6f}\n", "matrix")
+            self.out.write(f"   Valor decimal: {float(det):.6f}\n", "matrix")
         except Exception:
             pass
-        self.result_text.insert(tk.END, "\n" + "="*60 + "\n")
+        self.out.write("\n" + "="*60 + "\n")
 
     def inverse_matrix(self):
         matA = self.get_matrix(self.entriesA)
@@ -646,25 +661,29 @@ class MatrixCalculator:
         
         n = matA.rows
         
-        self.result_text.insert(tk.END, f"\n{'='*60}\n", "title")
-        self.result_text.insert(tk.END, f"OPERACIÓN: MATRIZ INVERSA (Método Gauss-Jordan)\n", "title")
-        self.result_text.insert(tk.END, f"{'='*60}\n", "title")
+        self.out.write(f"\n{'='*60}\n", "title")
+        self.out.write(f"OPERACIÓN: MATRIZ INVERSA (Método Gauss-Jordan)\n", "title")
+        self.out.write(f"{'='*60}\n", "title")
         
         # Mostrar matriz original
         self.display_matrix(matA, "Matriz A", "matrix")
         
-        self.result_text.insert(tk.END, f"\n📊 Información:\n", "step")
-        self.result_text.insert(tk.END, f"   Tamaño: {n}×{n}\n", "matrix")
-        self.result_text.insert(tk.END, f"   Método: Gauss-Jordan [A | I] → [I | A⁻¹]\n", "matrix")
+        self.out.write(f"\n📊 Información:\n", "step")
+        self.out.write(f"   Tamaño: {n}×{n}\n", "matrix")
+        self.out.write(f"   Método: Gauss-Jordan [A | I] → [I | A⁻¹]\n", "matrix")
         
         # Crear matriz aumentada [A | I]
         aug = [[matA[i,j] for j in range(n)] + [Fraction(1 if i==j else 0) for j in range(n)] for i in range(n)]
-        
-        self.result_text.insert(tk.END, f"\n🔄 MATRIZ AUMENTADA INICIAL [A | I]:\n", "step")
-        aug_matrix = Matrix(aug)
-        self.display_matrix(aug_matrix, "[A | I]", "matrix")
-        
-        self.result_text.insert(tk.END, f"\n🧮 PROCESO DE GAUSS-JORDAN:\n", "step")
+        # RESULT: sin traza; SUMMARY: una línea y un estado por pivote; FULL: cada operación de fila
+        level = step_log.get_verbosity()
+        trace = level != step_log.RESULT
+        
+        if trace:
+            self.out.write(f"\n🔄 MATRIZ AUMENTADA INICIAL [A | I]:\n", "step")
+            aug_matrix = Matrix(aug)
+            self.display_matrix(aug_matrix, "[A | I]", "matrix")
+            
+            self.out.write(f"\n🧮 PROCESO DE GAUSS-JORDAN:\n", "step")
         
         for i in range(n):
             pivot = aug[i][i]
@@ -674,22 +693,25 @@ class MatrixCalculator:
                     if aug[k][i] != 0:
                         aug[i], aug[k] = aug[k], aug[i]
                         pivot = aug[i][i]
-                        self.result_text.insert(tk.END, f"\n🔁 PASO {i+1}: Intercambio R{i+1} <-> R{k+1} para pivote\n", "step")
+                        if trace:
+                            self.out.write(f"\n🔁 PASO {i+1}: Intercambio R{i+1} <-> R{k+1} para pivote\n", "step")
                         swap_found = True
                         break
                 if not swap_found or pivot == 0:
-                    self.result_text.insert(tk.END, f"\n❌ ERROR: La matriz no es invertible (fila de ceros)\n", "error")
+                    self.out.write(f"\n❌ ERROR: La matriz no es invertible (fila de ceros)\n", "error")
                     return
             
             # Normalizar fila del pivote
             pivot_inv = Fraction(1) / pivot
             for j in range(2*n):
                 aug[i][j] *= pivot_inv
-            self.result_text.insert(tk.END, f"\n📏 PASO {i+1}: Normalizar R{i+1} dividiendo por {fraction_to_str(pivot)}\n", "step")
+            if trace:
+                self.out.write(f"\n📏 PASO {i+1}: Normalizar R{i+1} dividiendo por {fraction_to_str(pivot)}\n", "step")
             
             # Mostrar estado actual
-            current_matrix = Matrix(aug)
-            self.display_matrix(current_matrix, f"Estado después de normalizar R{i+1}", "matrix")
+            if level == step_log.FULL:
+                current_matrix = Matrix(aug)
+                self.display_matrix(current_matrix, f"Estado después de normalizar R{i+1}", "matrix")
             
             # Hacer ceros en la columna del pivote
             for k in range(n):
@@ -697,21 +719,24 @@ class MatrixCalculator:
                     factor = aug[k][i]
                     for j in range(2*n):
                         aug[k][j] -= factor*aug[i][j]
-                    self.result_text.insert(tk.END, f"\n🔢 PASO {i+1}: R{k+1} = R{k+1} - {fraction_to_str(factor)}×R{i+1}\n", "step")
+                    if level == step_log.FULL:
+                        self.out.write(f"\n🔢 PASO {i+1}: R{k+1} = R{k+1} - {fraction_to_str(factor)}×R{i+1}\n", "step")
+            if level == step_log.SUMMARY:
+                self.display_matrix(Matrix(aug), f"Estado después de eliminar la columna {i+1}", "matrix")
         
         # Extraer la matriz inversa
         inv = [row[n:] for row in aug]
         
-        self.result_text.insert(tk.END, f"\n✅ RESULTADO FINAL:\n", "title")
+        self.out.write(f"\n✅ RESULTADO FINAL:\n", "title")
         inv_matrix = Matrix(inv)
         self.display_matrix(inv_matrix, "Matriz Inversa A⁻¹", "matrix")
         
         # Verificación
-        self.result_text.insert(tk.END, f"\n🔍 VERIFICACIÓN:\n", "step")
-        self.result_text.insert(tk.END, f"   A × A⁻¹ = I (matriz identidad)\n", "matrix")
-        self.result_text.insert(tk.END, f"   ✓ Inversa calculada correctamente\n", "independent")
+        self.out.write(f"\n🔍 VERIFICACIÓN:\n", "step")
+        self.out.write(f"   A × A⁻¹ = I (matriz identidad)\n", "matrix")
+        self.out.write(f"   ✓ Inversa calculada correctamente\n", "independent")
         
-        self.result_text.insert(tk.END, "\n" + "="*60 + "\n")
+        self.out.write("\n" + "="*60 + "\n")
 
     def cramer_rule(self):
         matA = self.get_matrix(self.entriesA)
@@ -723,96 +748,101 @@ class MatrixCalculator:
         
         n = matA.rows
         
-        self.result_text.insert(tk.END, f"\n{'='*60}\n", "title")
-        self.result_text.insert(tk.END, f"OPERACIÓN: REGLA DE CRAMER\n", "title")
-        self.result_text.insert(tk.END, f"{'='*60}\n", "title")
+        self.out.write(f"\n{'='*60}\n", "title")
+        self.out.write(f"OPERACIÓN: REGLA DE CRAMER\n", "title")
+        self.out.write(f"{'='*60}\n", "title")
         
         # Mostrar sistema original
         self.display_matrix(matA, "Matriz de coeficientes A", "matrix")
         self.display_matrix(matB, "Vector de términos independientes B", "matrix")
         
-        self.result_text.insert(tk.END, f"\n📊 Información del sistema:\n", "step")
-        self.result_text.insert(tk.END, f"   Número de ecuaciones: {n}\n", "matrix")
-        self.result_text.insert(tk.END, f"   Número de incógnitas: {n}\n", "matrix")
+        self.out.write(f"\n📊 Información del sistema:\n", "step")
+        self.out.write(f"   Número de ecuaciones: {n}\n", "matrix")
+        self.out.write(f"   Número de incógnitas: {n}\n", "matrix")
         
         # Calcular determinante de A
         matrix_list = [[matA[i,j] for j in range(matA.cols)] for i in range(matA.rows)]
-        detA, det_log = operations_determinant.determinant_with_log(matrix_list)
-        self.result_text.insert(tk.END, f"\n🔢 CÁLCULO DE DETERMINANTES:\n", "step")
-        self.result_text.insert(tk.END, f"\n📌 Determinante principal:\n", "step")
-        self.result_text.insert(tk.END, f"   det(A) = {fraction_to_str(detA)}\n", "result")
+        detA, _ = operations_determinant.determinant_with_log(matrix_list, log=False)
+        self.out.write(f"\n🔢 CÁLCULO DE DETERMINANTES:\n", "step")
+        self.out.write(f"\n📌 Determinante principal:\n", "step")
+        self.out.write(f"   det(A) = {fraction_to_str(detA)}\n", "result")
         
         if detA == 0:
-            self.result_text.insert(tk.END, f"\n❌ ERROR: El sistema no tiene solución única\n", "error")
-            self.result_text.insert(tk.END, f"   det(A) = 0 → Sistema indeterminado o incompatible\n", "error")
+            self.out.write(f"\n❌ ERROR: El sistema no tiene solución única\n", "error")
+            self.out.write(f"   det(A) = 0 → Sistema indeterminado o incompatible\n", "error")
             return
         
         # Calcular cada variable
         solutions = []
         
-        self.result_text.insert(tk.END, f"\n📌 Determinantes para cada variable:\n", "step")
+        level = step_log.get_verbosity()
+        if level != step_log.RESULT:
+            self.out.write(f"\n📌 Determinantes para cada variable:\n", "step")
         
         for var in range(n):
             # Crear matriz con columna reemplazada
             mat_temp = [[matB[i,0] if j==var else matA[i,j] for j in range(n)] for i in range(n)]
-            temp_matrix = Matrix(mat_temp)
-            
-            self.result_text.insert(tk.END, f"\nMatriz A{var+1} (columna {var+1} reemplazada):\n", "step")
-            self.display_matrix(temp_matrix, f"A{var+1}", "matrix")
             
-            det_temp = self._determinant_step(mat_temp, show_text=f"Determinante de A{var+1}:")
+            if level == step_log.FULL:
+                temp_matrix = Matrix(mat_temp)
+                self.out.write(f"\nMatriz A{var+1} (columna {var+1} reemplazada):\n", "step")
+                self.display_matrix(temp_matrix, f"A{var+1}", "matrix")
+                det_temp = self._determinant_step(mat_temp, show_text=f"Determinante de A{var+1}:")
+            else:
+                det_temp = self._determinant_step(mat_temp)
             x_val = det_temp/detA
             solutions.append(x_val)
             
-            self.result_text.insert(tk.END, f"det(A{var+1}) = {fraction_to_str(det_temp)}\n", "matrix")
-            self.result_text.insert(tk.END, f"x{var+1} = det(A{var+1}) / det(A) = {fraction_to_str(det_temp)} / {fraction_to_str(detA)} = {fraction_to_str(x_val)}\n", "result")
+            if level != step_log.RESULT:
+                self.out.write(f"det(A{var+1}) = {fraction_to_str(det_temp)}\n", "matrix")
+                self.out.write(f"x{var+1} = det(A{var+1}) / det(A) = {fraction_to_str(det_temp)} / {fraction_to_str(detA)} = {fraction_to_str(x_val)}\n", "result")
         
         # Mostrar solución final
-        self.result_text.insert(tk.END, f"\n✅ SOLUCIÓN FINAL DEL SISTEMA:\n", "title")
+        self.out.write(f"\n✅ SOLUCIÓN FINAL DEL SISTEMA:\n", "title")
         
         solution_matrix = Matrix([[sol] for sol in solutions])
         self.display_matrix(solution_matrix, "Vector solución X", "matrix")
         
-        self.result_text.insert(tk.END, f"\n📌 Valores de las variables:\n", "step")
+        self.out.write(f"\n📌 Valores de las variables:\n", "step")
         for i, sol in enumerate(solutions):
-            self.result_text.insert(tk.END, f"   x{i+1} = {fraction_to_str(sol)}\n", "result")
+            self.out.write(f"   x{i+1} = {fraction_to_str(sol)}\n", "result")
         
         # Verificación
-        self.result_text.insert(tk.END, f"\n🔍 VERIFICACIÓN:\n", "step")
-        self.result_text.insert(tk.END, f"   A × X = B (comprobando la solución)\n", "matrix")
-        self.result_text.insert(tk.END, f"   ✓ Solución verificada correctamente\n", "independent")
+        self.out.write(f"\n🔍 VERIFICACIÓN:\n", "step")
+        self.out.write(f"   A × X = B (comprobando la solución)\n", "matrix")
+        self.out.write(f"   ✓ Solución verificada correctamente\n", "independent")
         
-        self.result_text.insert(tk.END, "\n" + "="*60 + "\n")
+        self.out.write("\n" + "="*60 + "\n")
 
     def cofactor_matrix(self):
         matA = self.get_matrix(self.entriesA)
         if matA is None: return
         try:
-            cofactor_mat, log = operations_cofactor.cofactor_matrix(matA)
+            cofactor_mat, log = operations_cofactor.cofactor_matrix(matA, steps=True)
         except Exception as e:
-            self.result_text.insert(tk.END, f"\n❌ ERROR: {e}\n", "error")
+            self.out.write(f"\n❌ ERROR: {e}\n", "error")
             return
 
-        self.result_text.insert(tk.END, f"\n{'='*60}\n", "title")
-        self.result_text.insert(tk.END, f"OPERACIÓN: MATRIZ DE COFACTORES\n", "title")
-        self.result_text.insert(tk.END, f"{'='*60}\n", "title")
+        self.out.write(f"\n{'='*60}\n", "title")
+        self.out.write(f"OPERACIÓN: MATRIZ DE COFACTORES\n", "title")
+        self.out.write(f"{'='*60}\n", "title")
         self.display_matrix(matA, "Matriz A", "matrix")
         for line in log:
-            self.result_text.insert(tk.END, line + "\n", "step")
+            self.out.write(line + "\n", "step")
         self.display_matrix(cofactor_mat, "Matriz de Cofactores", "matrix")
-        self.result_text.insert(tk.END, f"\n✅ Cálculo de cofactores completado exitosamente\n", "independent")
-        adj = [[cofactor_mat.data[j][i] for j in range(cofactor_mat.rows)] for i in range(cofactor_mat.cols)]
-        self.display_matrix(Matrix(adj), "Matriz Adjunta", "matrix")
-        self.result_text.insert(tk.END, "\n" + "="*60 + "\n")
+        self.out.write(f"\n✅ Cálculo de cofactores completado exitosamente\n", "independent")
+        adj = cofactor_mat.transpose()
+        self.display_matrix(adj, "Matriz Adjunta", "matrix")
+        self.out.write("\n" + "="*60 + "\n")
 
     def _determinant_step(self, matrix, show_text=""):
         n = len(matrix)
         # Wrapper around core determinant implementation. Preserves optional UI text output.
         mat = [row[:] for row in matrix]
         if show_text:
-            self.result_text.insert(tk.END, f"{show_text}\n")
+            self.out.write(f"{show_text}\n")
             for row in matrix:
-                self.result_text.insert(tk.END, "  ".join(fraction_to_str(val) for val in row) + "\n")
+                self.out.write("  ".join(fraction_to_str(val) for val in row) + "\n")
         return core_det_step(matrix)
 
     def _determinant_sarrus(self, matrix):
@@ -825,61 +855,58 @@ class MatrixCalculator:
         except Exception:
             return core_det_sarrus(matrix)
 
-        self.result_text.insert(tk.END, "Cálculo del determinante por Sarrus (3x3):\n")
-        self.result_text.insert(tk.END, "Matriz:\n")
+        self.out.write("Cálculo del determinante por Sarrus (3x3):\n")
+        self.out.write("Matriz:\n")
         for row in matrix:
-            self.result_text.insert(tk.END, "  ".join(fraction_to_str(x) for x in row) + "\n")
+            self.out.write("  ".join(fraction_to_str(x) for x in row) + "\n")
         sum1 = a * e * i + b * f * g + c * d * h
         sum2 = c * e * g + b * d * i + a * f * h
-        self.result_text.insert(tk.END, f"Suma diagonales positivas: {fraction_to_str(a*e*i)} + {fraction_to_str(b*f*g)} + {fraction_to_str(c*d*h)} = {fraction_to_str(sum1)}\n")
-        self.result_text.insert(tk.END, f"Suma diagonales negativas: {fraction_to_str(c*e*g)} + {fraction_to_str(b*d*i)} + {fraction_to_str(a*f*h)} = {fraction_to_str(sum2)}\n")
+        self.out.write(f"Suma diagonales positivas: {fraction_to_str(a*e*i)} + {fraction_to_str(b*f*g)} + {fraction_to_str(c*d*h)} = {fraction_to_str(sum1)}\n")
+        self.out.write(f"Suma diagonales negativas: {fraction_to_str(c*e*g)} + {fraction_to_str(b*d*i)} + {fraction_to_str(a*f*h)} = {fraction_to_str(sum2)}\n")
         det = sum1 - sum2
-        self.result_text.insert(tk.END, f"Determinante final: {fraction_to_str(det)}\n\n")
+        self.out.write(f"Determinante final: {fraction_to_str(det)}\n\n")
         return core_det_sarrus(matrix)
     def display_matrix(self, matrix, title="Matriz", tag="matrix"):
         """Muestra una matriz en formato de tabla"""
-        if not matrix.data:
+        if not matrix.rows:
             return
         
         # Encontrar el ancho máximo de cada columna
         col_widths = []
-        for col in range(matrix.cols):
-            max_width = 0
-            for row in range(matrix.rows):
-                val_str = fraction_to_str(matrix.data[row][col])
-                max_width = max(max_width, len(val_str))
+        for column in matrix.iter_cols():
+            max_width = max(len(fraction_to_str(val)) for val in column)
             col_widths.append(max_width + 2)  # +2 para espaciado
         
         # Título
-        self.result_text.insert(tk.END, f"\n{title}:\n", "step")
+        self.out.write(f"\n{title}:\n", "step")
         
         # Línea superior
         line = "┌" + "".join("─" * width + "┬" for width in col_widths[:-1]) + "─" * col_widths[-1] + "┐\n"
-        self.result_text.insert(tk.END, line, tag)
+        self.out.write(line, tag)
         
         # Filas de datos
-        for i, row in enumerate(matrix.data):
+        for i, row in enumerate(matrix.iter_rows()):
             row_str = "│"
             for j, val in enumerate(row):
                 val_str = fraction_to_str(val)
                 padding = col_widths[j] - len(val_str)
                 row_str += " " * (padding // 2) + val_str + " " * (padding - padding // 2) + "│"
-            self.result_text.insert(tk.END, row_str + "\n", tag)
+            self.out.write(row_str + "\n", tag)
             
             # Línea separadora (excepto para la última fila)
             if i < matrix.rows - 1:
                 line = "├" + "".join("─" * width + "┼" for width in col_widths[:-1]) + "─" * col_widths[-1] + "┤\n"
-                self.result_text.insert(tk.END, line, tag)
+                self.out.write(line, tag)
         
         # Línea inferior
         line = "└" + "".join("─" * width + "┴" for width in col_widths[:-1]) + "─" * col_widths[-1] + "┘\n"
-        self.result_text.insert(tk.END, line, tag)
+        self.out.write(line, tag)
 
     def display_result(self, matA, matB, result, op):
         """Muestra el resultado paso a paso con formato matricial"""
-        self.result_text.insert(tk.END, f"\n{'='*60}\n", "title")
-        self.result_text.insert(tk.END, f"OPERACIÓN: {op.upper()}\n", "title")
-        self.result_text.insert(tk.END, f"{'='*60}\n", "title")
+        self.out.write(f"\n{'='*60}\n", "title")
+        self.out.write(f"OPERACIÓN: {op.upper()}\n", "title")
+        self.out.write(f"{'='*60}\n", "title")
         
         # Mostrar matrices con formato
         self.display_matrix(matA, "Matriz A", "matrix")
@@ -887,17 +914,17 @@ class MatrixCalculator:
         self.display_matrix(result, f"Resultado A {op} B", "matrix")
         
         # Información adicional
-        self.result_text.insert(tk.END, f"\n📊 Dimensiones:\n", "step")
-        self.result_text.insert(tk.END, f"   Matriz A: {matA.rows} × {matA.cols}\n", "matrix")
-        self.result_text.insert(tk.END, f"   Matriz B: {matB.rows} × {matB.cols}\n", "matrix")
-        self.result_text.insert(tk.END, f"   Resultado: {result.rows} × {result.cols}\n", "matrix")
+        self.out.write(f"\n📊 Dimensiones:\n", "step")
+        self.out.write(f"   Matriz A: {matA.rows} × {matA.cols}\n", "matrix")
+        self.out.write(f"   Matriz B: {matB.rows} × {matB.cols}\n", "matrix")
+        self.out.write(f"   Resultado: {result.rows} × {result.cols}\n", "matrix")
         
-        self.result_text.insert(tk.END, f"\n✅ Operación completada exitosamente\n", "independent")
-        self.result_text.insert(tk.END, "\n" + "="*60 + "\n")
+        self.out.write(f"\n✅ Operación completada exitosamente\n", "independent")
+        self.out.write("\n" + "="*60 + "\n")
 
     def clear(self):
         self.result_text.config(state="normal")
-        self.result_text.delete(1.0, tk.END)
+        self.out.clear()
         for widget in self.matrix_frame.winfo_children():
             widget.destroy()
         self.entriesA, self.entriesB = [], []
@@ -1267,6 +1294,15 @@ class MatrixCalculator:
                                           values=operations, state="readonly", width=15)
         self.operation_combo.pack(side="left", padx=(0, 20))
         self.operation_combo.bind("<<ComboboxSelected>>", lambda e: self.create_matrices())
+
+        # Nivel de detalle del procedimiento (compartido con step_log)
+        tk.Label(top_frame, text="Detalle:", font=("Segoe UI", 12, "bold"),
+                bg=self.colors["background"], fg=self.colors["text"]).pack(side="left", padx=(0, 10))
+        self.verbosity_combo = ttk.Combobox(top_frame, textvariable=self.verbosity,
+                                          values=step_log.VERBOSITY_LABELS, state="readonly", width=22)
+        self.verbosity_combo.pack(side="left", padx=(0, 20))
+        self.verbosity_combo.bind("<<ComboboxSelected>>",
+                                  lambda e: step_log.set_verbosity(step_log.VERBOSITY_LABELS.index(self.verbosity.get())))
         
         # Botones de control
         button_style = {
@@ -0,0 +1,25 @@
+from root_scan import find_all_roots
+
+# Raíces con cambio de signo, exactas en la malla y de multiplicidad par
+cases = [
+    ("sin(x)", -10, 10),
+    ("(x-1)^2*(x+2.5)", -5, 5),
+    ("cos(x)^2", -7, 7),
+    ("x^2 + 0.001", -3, 3),
+    ("sin(10*x)", -20, 20),
+    # polos: cambian de signo pero no son raíces
+    ("tan(x)", 0, 10),
+    ("1/(x-1)", -2, 3),
+]
+
+for func, a, b in cases:
+    print("\n--- Testing:", func, f" on [{a}, {b}]")
+    try:
+        roots = find_all_roots(func, a, b, tol=1e-10)
+        print(f"{len(roots)} raíces")
+        for x, fx, kind, iterations in roots[:6]:
+            print(f"   x={x: .10f}  f(x)={fx: .2e}  {kind} ({iterations} iter)")
+    except Exception as e:
+        print("Error:", repr(e))
+
+print("\nDone tests.")
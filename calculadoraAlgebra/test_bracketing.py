@@ -0,0 +1,30 @@
+from math_utils import EvalMemo, evaluate_function
+from root_bracketing import METHODS, solve
+from root_falsepos import false_position_method
+
+# Funciones convexas en el intervalo: la falsa posición clásica deja fijo un extremo.
+cases = [
+    ("x^3 + 4*x^2 - 10", 1, 2),
+    ("e^x - 2", 0, 5),
+    ("x^10 - 1", 0, 1.3),
+    ("sin(x) - 0.5", 0, 1),
+    ("x*e**(-x) - 0.1", 0, 1),
+]
+
+for func, a, b in cases:
+    print("\n--- Testing:", func, f" on [{a}, {b}]")
+    try:
+        root, logs, iters = false_position_method(func, a, b, tol=1e-10, max_iter=1000)
+        print(f"{'Falsa Posición':16s} root={root:.12f} iters={iters}")
+    except Exception as e:
+        print("Falsa Posición error:", repr(e))
+    for method in METHODS:
+        f = EvalMemo(lambda x: evaluate_function(x, func))
+        try:
+            root, lo, hi, rows = solve(method, f, a, b, tol=1e-10, max_it=1000)
+            ok = lo <= root <= hi and abs(f(root)) < 1e-8
+            print(f"{method:16s} root={root:.12f} iters={len(rows)} evals={f.evaluations} ok={ok}")
+        except Exception as e:
+            print(method, "error:", repr(e))
+
+print("\nDone tests.")
@@ -0,0 +1,28 @@
+from math_utils import evaluate_derivatives, evaluate_function
+
+# f' y f'' por derivación automática frente a diferencias centrales
+cases = [
+    ("x^3 - 2x + 1", 1.5),
+    ("sin(x)*e^x", 0.7),
+    ("ln(x)/x", 2.0),
+    ("sqrt(x^2 + 1)", 1.0),
+    ("2^x", 1.0),
+    ("x^x", 2.0),
+    ("tan(x) - x", 1.0),
+    ("cos(x)^2 - x/3", -0.4),
+]
+
+h = 1e-4
+for func, x in cases:
+    print("\n--- Testing:", func, f" at x={x}")
+    try:
+        f0, d1, d2 = evaluate_derivatives(x, func)
+        fp, fm = evaluate_function(x + h, func), evaluate_function(x - h, func)
+        c1 = (fp - fm) / (2 * h)
+        c2 = (fp - 2 * f0 + fm) / (h * h)
+        print(f"f={f0:.12f}  f'={d1:.12f} (dif. centrales {c1:.12f})  f''={d2:.12f} (dif. centrales {c2:.8f})")
+        print("coincide:", abs(d1 - c1) < 1e-6 * max(1.0, abs(d1)) and abs(d2 - c2) < 1e-4 * max(1.0, abs(d2)))
+    except Exception as e:
+        print("Error:", repr(e))
+
+print("\nDone tests.")
@@ -0,0 +1,25 @@
+import random
+from fractions import Fraction
+from matrix_core import _determinant_bareiss
+from matrix_modular import det_modular, rank_modular
+
+random.seed(0)
+cases = [
+    ("2x2 racional", [[Fraction(1, 2), Fraction(3)], [Fraction(-2, 3), Fraction(4, 5)]]),
+    ("3x3 singular", [[1, 2, 3], [4, 5, 6], [7, 8, 9]]),
+    ("15x15 entera", [[random.randint(-9, 9) for _ in range(15)] for _ in range(15)]),
+    ("20x20 entera grande", [[random.randint(-10**12, 10**12) for _ in range(20)] for _ in range(20)]),
+]
+
+for name, mat in cases:
+    print("\n--- Testing:", name)
+    try:
+        det_b = _determinant_bareiss(mat)
+        print(f"Bareiss: {det_b}")
+        if all(Fraction(v).denominator == 1 for row in mat for v in row):
+            det_m = det_modular(mat)
+            print(f"Modular: {det_m} (coincide={det_m == det_b}), rango={rank_modular(mat)}")
+    except Exception as e:
+        print("Error:", repr(e))
+
+print("\nDone tests.")
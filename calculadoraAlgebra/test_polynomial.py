@@ -0,0 +1,43 @@
+import math
+import numpy as np
+import math_utils
+import polynomial
+from root_scan import find_all_roots
+
+# Reconocimiento de polinomios, Horner y raíces por la matriz compañera
+cases = [
+    "x^3 + 4*x^2 - 10",
+    "(x-1)^3*(x+2)^2*(x^2+1)",
+    "2x^2 - 3x + 1",
+    "x^4 + 1",
+    "x^5 - x",
+    "sin(x) - x^2",
+    # factorizados: se evalúan tal cual; raíces de multiplicidad alta
+    "(x-1)^4",
+    "(x-2)^7",
+    "(x-1)^4*(x-1.01)",
+]
+
+xs = np.linspace(-3, 3, 13)
+for func in cases:
+    print("\n--- Testing:", func)
+    try:
+        coeffs = math_utils.polynomial_coefficients(func)
+        if coeffs is None:
+            print("No es polinomio (se usa la evaluación general)")
+            continue
+        print("Coeficientes:", coeffs)
+        direct_f = eval("lambda x: " + math_utils._scalar_source(func), {"math": math})
+        direct = np.array([direct_f(x) for x in xs])
+        print("Horner:", math_utils.horner_coefficients(func) is not None,
+              "coincide:", np.allclose(math_utils.evaluate_function_vectorized(xs, func), direct))
+        roots = polynomial.roots(coeffs)
+        if roots is None:
+            print("Raíces múltiples no separables: se usa el barrido")
+        for z, m, steps in roots or []:
+            print(f"   x = {polynomial.format_root(z)}  mult={m}  |p(x)|={abs(polynomial.horner(coeffs, z)):.2e}")
+        print("Reales en [-5, 5]:", [round(x, 10) for x, _, _, _ in find_all_roots(func, -5, 5)])
+    except Exception as e:
+        print("Error:", repr(e))
+
+print("\nDone tests.")